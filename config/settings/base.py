@@ -1,6 +1,7 @@
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+import tempfile
 
 # Load environment variables
 load_dotenv()
@@ -93,10 +94,41 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'webmaster@localhost')
 CONTACT_EMAIL_RECIPIENT = 'your_contact_address@example.com'
+# Email outbox (utils.outbox): delivered by `manage.py send_outbox`
+OUTBOX_BATCH_SIZE = 100  # Messages sent per SMTP connection
+OUTBOX_MAX_ATTEMPTS = 6  # Then the message is dead-lettered
+OUTBOX_RETRY_BASE_SECONDS = 60  # Doubled after every failed attempt
+OUTBOX_RETRY_MAX_SECONDS = 6 * 60 * 60
 
 # File upload settings (matching Flask’s MAX_CONTENT_LENGTH)
 FILE_UPLOAD_MAX_MEMORY_SIZE = 16 * 1024 * 1024  # 16 MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 16 * 1024 * 1024  # 16 MB
+RESUME_MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10 MB
+IMAGE_MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5 MB (company logos, profile pictures)
+# Bulk job posting from CSV / JSON files
+JOB_IMPORT_MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5 MB
+JOB_IMPORT_MAX_ROWS = 2000
+
+# Signatures and size limits are checked while the upload streams in, before
+# the default handlers buffer it in memory or a temporary file
+FILE_UPLOAD_HANDLERS = [
+    'utils.upload_handlers.ValidatingUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Resumable (chunked) resume uploads. Chunks are appended to a part file in
+# CHUNKED_UPLOAD_DIR; on multi-instance deployments point it at shared storage.
+CHUNKED_UPLOAD_DIR = os.getenv('CHUNKED_UPLOAD_DIR', os.path.join(tempfile.gettempdir(), 'job_portal_uploads'))
+CHUNKED_UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+# Uploads idle for longer are refused and removed by the expire_uploads command
+CHUNKED_UPLOAD_EXPIRY_HOURS = int(os.getenv('CHUNKED_UPLOAD_EXPIRY_HOURS', '24'))
+
+# Local read-through cache of S3 resumes (utils.storage_cache); least recently
+# used files are evicted beyond the byte budget. 0 disables the cache. The
+# temporary directory default is for development; production requires its own.
+STORAGE_CACHE_DIR = os.getenv('STORAGE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'job_portal_cache'))
+STORAGE_CACHE_MAX_BYTES = int(os.getenv('STORAGE_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))  # 512 MB
 
 # Authentication URLs
 LOGIN_URL = 'portal_auth:login'
@@ -124,4 +156,18 @@ LOGGING = {
 
 # S3 settings (optional, enabled via environment variables)
 ENABLE_S3_UPLOAD = os.getenv('ENABLE_S3_UPLOAD', 'False').lower() == 'true'
-AWS_STORAGE_BUCKET_NAME = os.getenv('AWS_STORAGE_BUCKET_NAME')
\ No newline at end of file
+AWS_STORAGE_BUCKET_NAME = os.getenv('AWS_STORAGE_BUCKET_NAME')
+# How S3 resumes reach the browser once access is granted:
+# 'proxy' streams them through Django, 'redirect' answers with a 302 to a
+# short-lived presigned S3 URL so the transfer bypasses the app servers
+RESUME_DOWNLOAD_MODE = os.getenv('RESUME_DOWNLOAD_MODE', 'proxy')
+RESUME_PRESIGNED_URL_EXPIRY = int(os.getenv('RESUME_PRESIGNED_URL_EXPIRY', '300'))  # seconds
+
+# Let the web server send locally stored resumes once Django has checked access:
+# '' streams them from Django, 'nginx' returns X-Accel-Redirect to the internal
+# locations below, 'apache' returns X-Sendfile (requires mod_xsendfile)
+RESUME_SENDFILE_BACKEND = os.getenv('RESUME_SENDFILE_BACKEND', '')
+# Local directory -> nginx location marked 'internal' that aliases it
+RESUME_SENDFILE_LOCATIONS = {
+    str(MEDIA_ROOT / 'resumes'): '/internal/resumes/',
+}
@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
 # Production settings
@@ -24,6 +26,10 @@ SECURE_HSTS_SECONDS = 31536000  # 1 year
 SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 SECURE_HSTS_PRELOAD = True
 
+# The storage cache needs a directory of its own that survives temp cleanups
+if STORAGE_CACHE_MAX_BYTES and not os.getenv('STORAGE_CACHE_DIR'):
+    raise ImproperlyConfigured('Set STORAGE_CACHE_DIR to a persistent directory, or STORAGE_CACHE_MAX_BYTES=0 to disable the storage cache.')
+
 # Static and media files - use S3 for Lambda
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 STATICFILES_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
@@ -1,9 +1,13 @@
 # employer/forms.py
 from django import forms
 from django.core.validators import RegexValidator
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.template.defaultfilters import filesizeformat
 # Import Job and Application models (assuming they are in 'jobs' app)
 from jobs.models import Job, Application
+from utils.utils import ALLOWED_IMAGE_EXTENSIONS, has_allowed_signature
 
 class JobForm(forms.ModelForm):
     """
@@ -51,13 +55,18 @@ class JobForm(forms.ModelForm):
         fields = ['title', 'description', 'salary', 'location', 'category', 'company', 'company_logo']
 
     def clean_company_logo(self):
-        """Validate file type (redundant with ImageField but good practice)."""
+        """Validate file type, content signature and size (type is redundant with ImageField but good practice)."""
         logo = self.cleaned_data.get('company_logo', False)
         if logo:
             allowed_extensions = ['jpg', 'jpeg', 'png']
             extension = logo.name.split('.')[-1].lower()
             if extension not in allowed_extensions:
                 raise ValidationError("Invalid company logo file type. Allowed: jpg, png, jpeg", code='invalid_image_type')
+            # Only new uploads; on edit an unchanged field holds the stored file
+            if isinstance(logo, UploadedFile) and logo.size > settings.IMAGE_MAX_UPLOAD_SIZE:
+                raise ValidationError(f"File size cannot exceed {filesizeformat(settings.IMAGE_MAX_UPLOAD_SIZE)}.", code='file_too_large')
+            if isinstance(logo, UploadedFile) and not has_allowed_signature(logo, ALLOWED_IMAGE_EXTENSIONS):
+                raise ValidationError("Invalid company logo file content. Allowed: jpg, png, jpeg", code='invalid_image_content')
         return logo
 
 
@@ -73,3 +82,64 @@ class ApplicationStatusForm(forms.Form):
         widget=forms.Select(attrs={'class': 'form-select form-select-sm'}) # Add Bootstrap classes
     )
     # application_id = forms.IntegerField(widget=forms.HiddenInput()) # Usually not needed if ID is in URL
+
+
+# Largest number of applications one bulk status update may change
+MAX_BULK_STATUS_UPDATE = 500
+
+
+class ApplicationIdsField(forms.Field):
+    """A list of application ids submitted as repeated form values."""
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            # Deduplicated and sorted so the UPDATE locks rows in a stable order
+            return sorted({int(application_id) for application_id in value})
+        except (TypeError, ValueError):
+            raise ValidationError('Invalid application id.', code='invalid')
+
+
+class BulkApplicationStatusForm(ApplicationStatusForm):
+    """
+    Form for moving several applications to the same status at once.
+    """
+    application_ids = ApplicationIdsField(
+        error_messages={'required': 'Select at least one application.'}
+    )
+
+    def clean_application_ids(self):
+        application_ids = self.cleaned_data['application_ids']
+        if len(application_ids) > MAX_BULK_STATUS_UPDATE:
+            raise ValidationError(
+                f'You can update at most {MAX_BULK_STATUS_UPDATE} applications at once.',
+                code='too_many',
+            )
+        return application_ids
+
+
+class JobImportForm(forms.Form):
+    """
+    Form for posting many jobs at once from a CSV or JSON file.
+    """
+    jobs_file = forms.FileField(
+        label='Jobs File',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.json,.jsonl'}),
+        help_text="CSV with a header row, a JSON array or JSON Lines. Columns: title, description, salary, location, category, company"
+    )
+
+    def clean_jobs_file(self):
+        """Validate file type and size (the size was already enforced while streaming in)."""
+        jobs_file = self.cleaned_data.get('jobs_file')
+        if jobs_file:
+            # Already refused by ValidatingUploadHandler while streaming in
+            if getattr(jobs_file, 'rejection_reason', None):
+                raise ValidationError(jobs_file.rejection_reason, code='upload_rejected')
+            extension = jobs_file.name.split('.')[-1].lower()
+            if extension not in ('csv', 'json', 'jsonl'):
+                raise ValidationError("Invalid file type. Allowed: csv, json, jsonl", code='invalid_file_type')
+            if jobs_file.size > settings.JOB_IMPORT_MAX_UPLOAD_SIZE:
+                raise ValidationError(f"File size cannot exceed {filesizeformat(settings.JOB_IMPORT_MAX_UPLOAD_SIZE)}.", code='file_too_large')
+        return jobs_file
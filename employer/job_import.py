@@ -0,0 +1,269 @@
+# employer/job_import.py
+
+"""
+Bulk job posting from an uploaded CSV or JSON file.
+
+Rows are read from the upload one at a time (CSV, JSON Lines, and JSON arrays,
+which are decoded element by element) and validated with the same JobForm
+rules as the single-job form. Valid rows are collected
+into batches and inserted with one bulk_create per batch, each in its own
+transaction, so a very large file never holds a long transaction or a huge
+list of unsaved jobs.
+
+Jobs that already exist (uq_job_title_company_poster_location) are counted as
+duplicates and skipped; the batch pre-check catches almost all of them and
+ignore_conflicts covers a concurrent insert of the same job. Since
+ignore_conflicts does not report skipped rows, the jobs a batch actually
+inserted are read back before they are counted.
+"""
+
+import io
+import csv
+import json
+import logging
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.models import Job
+from utils import activity
+from utils.counters import JOBS, adjust_counters
+from .forms import JobForm
+
+logger = logging.getLogger(__name__)
+
+JOB_IMPORT_BATCH_SIZE = 200
+JOB_IMPORT_FIELDS = ('title', 'description', 'salary', 'location', 'category', 'company')
+# Rows with errors listed back to the user; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+# JSON arrays are read in chunks of this many characters and decoded one element at a time
+JSON_READ_SIZE = 64 * 1024
+# Largest single job object accepted in a JSON array
+MAX_JSON_ROW_CHARS = 1024 * 1024
+_WHITESPACE = re.compile(r'\s*')
+
+
+class JobImportError(Exception):
+    """The uploaded file cannot be read at all (as opposed to individual bad rows)."""
+
+
+class JobImportResult:
+    """
+    Outcome of a bulk job import.
+
+    Attributes:
+        created (int): Jobs inserted
+        duplicates (int): Rows skipped because the job already exists (or repeats an earlier row)
+        invalid (int): Rows rejected by validation
+        errors (list): (row number, {field: [messages]}) for the first MAX_REPORTED_ERRORS invalid rows
+        file_error (str): Why reading the file stopped early, or None if it was read to the end
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors = []
+        self.file_error = None
+
+    def add_error(self, row_number, errors):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((row_number, errors))
+
+
+def iter_job_rows(uploaded_file):
+    """
+    Read job rows from an uploaded file, one at a time.
+
+    CSV files need a header row naming the columns; JSON files hold either an
+    array of objects or one object per line (JSON Lines).
+
+    Yields:
+        tuple: (row number, dict of column -> value)
+
+    Raises:
+        JobImportError: If the file type is unsupported or the file is not valid CSV/JSON.
+    """
+    extension = uploaded_file.name.rsplit('.', 1)[-1].lower() if '.' in uploaded_file.name else ''
+    # utf-8-sig: spreadsheet exports often start with a byte order mark
+    text = io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline='')
+    try:
+        if extension == 'csv':
+            yield from _iter_csv(text)
+        elif extension in ('json', 'jsonl'):
+            yield from _iter_json(text)
+        else:
+            raise JobImportError('Unsupported file type. Upload a .csv, .json or .jsonl file.')
+    except UnicodeDecodeError:
+        raise JobImportError('The file is not UTF-8 encoded text.')
+    finally:
+        # Don't let the wrapper close the underlying upload
+        text.detach()
+
+
+def _iter_csv(text):
+    reader = csv.DictReader(text)
+    try:
+        if not reader.fieldnames or 'title' not in [name.strip().lower() for name in reader.fieldnames]:
+            raise JobImportError('The CSV file needs a header row with at least a "title" column.')
+        for row in reader:
+            # Short rows leave None values, extra cells are collected under the None key
+            yield reader.line_num, {key.strip().lower(): value.strip()
+                                    for key, value in row.items() if key is not None and isinstance(value, str)}
+    except csv.Error as e:
+        raise JobImportError(f'Invalid CSV near line {reader.line_num}: {e}')
+
+
+def _iter_json(text):
+    first = text.read(1)
+    while first and first.isspace():
+        first = text.read(1)
+    if first == '[':
+        yield from _iter_json_array(text)
+        return
+
+    # JSON Lines: one object per line, parsed as it is read
+    for line_number, line in enumerate(_prepend(first, text), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            raise JobImportError(f'Invalid JSON on line {line_number}: {e}')
+
+
+def _iter_json_array(text):
+    """
+    Elements of a JSON array whose opening '[' was already read, decoded one at a time.
+
+    Only the element being decoded (at most MAX_JSON_ROW_CHARS) and one read
+    chunk are held in memory, however long the array.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = '', 0, False
+    row_number = 0
+    expect_value = True
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        end = error = None
+        if position < len(buffer):
+            if buffer[position] == ']' and (not expect_value or not row_number):
+                return
+            if not expect_value:
+                if buffer[position] != ',':
+                    raise JobImportError(f'Invalid JSON: expected "," or "]" after job {row_number} of the array.')
+                position += 1
+                expect_value = True
+                continue
+            try:
+                row, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                error = e
+            # A value running up to the end of the buffer may continue in the next chunk
+            if end is not None and (end < len(buffer) or eof):
+                row_number += 1
+                yield row_number, row
+                position = end
+                expect_value = False
+                continue
+
+        if eof:
+            raise JobImportError(f'Invalid JSON: {error}' if error else 'Invalid JSON: the array is not closed.')
+        if len(buffer) - position > MAX_JSON_ROW_CHARS:
+            raise JobImportError(f'Job {row_number + 1} of the JSON array is too large.')
+        chunk = text.read(JSON_READ_SIZE)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def _prepend(first, text):
+    """Lines of the text stream, with the already consumed first character put back."""
+    lines = iter(text)
+    yield first + next(lines, '')
+    yield from lines
+
+
+def import_jobs(rows, poster, batch_size=None):
+    """
+    Validate job rows and insert the valid ones in batches.
+
+    Args:
+        rows (iterable): (row number, dict) pairs, e.g. from iter_job_rows()
+        poster (User): Employer or admin the jobs are posted by
+        batch_size (int): Jobs inserted per transaction (default JOB_IMPORT_BATCH_SIZE)
+
+    Returns:
+        JobImportResult: Counts of created, duplicate and invalid rows. If the
+            file turns out unreadable partway (or exceeds JOB_IMPORT_MAX_ROWS),
+            file_error says why; the rows before that point are still imported.
+    """
+    batch_size = batch_size or JOB_IMPORT_BATCH_SIZE
+    result = JobImportResult()
+    seen = set()
+    batch = []
+    try:
+        for position, (row_number, row) in enumerate(rows, start=1):
+            if position > settings.JOB_IMPORT_MAX_ROWS:
+                raise JobImportError(
+                    f'The file has more than {settings.JOB_IMPORT_MAX_ROWS} jobs; '
+                    f'only the first {settings.JOB_IMPORT_MAX_ROWS} were processed.')
+
+            if not isinstance(row, dict):
+                result.add_error(row_number, {'__all__': ['Each job must be an object with named fields.']})
+                continue
+            data = {field: '' if row.get(field) is None else str(row.get(field)).strip() for field in JOB_IMPORT_FIELDS}
+            form = JobForm(data)
+            if not form.is_valid():
+                result.add_error(row_number, {field: list(errors) for field, errors in form.errors.items()})
+                continue
+
+            job = form.save(commit=False)
+            # Same salary formatting as new_job_view
+            if job.salary and not job.salary.startswith('$'):
+                job.salary = '$' + job.salary
+            job.poster = poster
+            key = (job.title, job.company, job.location)
+            if key in seen:
+                result.duplicates += 1
+                continue
+            seen.add(key)
+            batch.append(job)
+            if len(batch) >= batch_size:
+                _insert_batch(batch, poster, result)
+                batch = []
+    except JobImportError as e:
+        result.file_error = str(e)
+
+    _insert_batch(batch, poster, result)
+    logger.info(f"Job import by user {poster.id}: {result.created} created, {result.duplicates} duplicates, {result.invalid} invalid")
+    return result
+
+
+def _insert_batch(batch, poster, result):
+    """Insert one batch of validated jobs, skipping those the poster already has."""
+    if not batch:
+        return
+    # One query finds the jobs of this batch that already exist
+    existing = set(Job.objects.filter(poster=poster, title__in={job.title for job in batch}).values_list(
+        'title', 'company', 'location'))
+    new_jobs = [job for job in batch if (job.title, job.company, job.location) not in existing]
+
+    # One timestamp for the batch identifies the rows it inserted: ignore_conflicts
+    # skips jobs inserted concurrently since the check above without reporting them
+    posted_at = timezone.now()
+    for job in new_jobs:
+        job.posted_date = posted_at
+    with transaction.atomic():
+        Job.objects.bulk_create(new_jobs, ignore_conflicts=True)
+        created = list(Job.objects.filter(
+            poster=poster, posted_date=posted_at, title__in={job.title for job in new_jobs}
+        ).values_list('category', flat=True)) if new_jobs else []
+        # bulk_create bypasses the signals that count new jobs
+        adjust_counters({JOBS: len(created)})
+        activity.record_activity(activity.JOBS, [(posted_at, category) for category in created])
+    result.created += len(created)
+    result.duplicates += len(batch) - len(created)
@@ -0,0 +1,109 @@
+from collections import defaultdict
+import time
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from employer.models import FUNNEL_WATERMARK, JobFunnelDaily
+from jobs.models import Application, ApplicationStatusEvent
+from utils.activity import APPLICATIONS, record_activity
+from utils.models import RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Fold new application status events into the daily job funnel table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Events folded per transaction')
+        parser.add_argument('--backfill', action='store_true',
+                            help='Record submission events for applications created before event tracking')
+        parser.add_argument('--rebuild', action='store_true', help='Drop the rollup and rebuild it from all events')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new events')
+        parser.add_argument('--interval', type=int, default=300, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            missing = Application.objects.filter(
+                ~Exists(ApplicationStatusEvent.objects.filter(application=OuterRef('pk')))
+            ).values_list('pk', 'job_id', 'application_date')
+            created = ApplicationStatusEvent.objects.bulk_create([
+                ApplicationStatusEvent(application_id=pk, job_id=job_id, to_status='applied', created_at=applied_at)
+                for pk, job_id, applied_at in missing.iterator()
+            ], batch_size=500)
+            # bulk_create bypasses the signal that adds events to the daily activity
+            record_activity(APPLICATIONS, [(event.created_at, event.to_status) for event in created])
+            self.stdout.write(f'Recorded {len(created)} submission event(s)')
+        if options['rebuild']:
+            with transaction.atomic():
+                JobFunnelDaily.objects.all().delete()
+                ApplicationStatusEvent.objects.filter(rolled_up=True).update(rolled_up=False)
+                RollupWatermark.objects.filter(name=FUNNEL_WATERMARK).update(position=0)
+            self.stdout.write('Cleared the funnel rollup')
+
+        total = 0
+        while True:
+            folded = self.rollup_batch(options['batch_size'])
+            total += folded
+            if folded < options['batch_size']:
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {total} event(s)'))
+
+    def rollup_batch(self, batch_size):
+        """
+        Add the next batch of events not rolled up yet to the daily totals.
+
+        Pending events are flagged rather than found above a watermark: an event
+        committed late with an id below already rolled-up ones (a long transaction,
+        a backfill) is still picked up by the next run.
+
+        Returns:
+            int: Number of events folded in.
+        """
+        with transaction.atomic():
+            # Row lock: concurrent runs take turns instead of counting events twice
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=FUNNEL_WATERMARK)
+            events = list(
+                ApplicationStatusEvent.objects.filter(rolled_up=False).order_by('pk')
+                .values_list('pk', 'job_id', 'to_status', 'created_at', 'application__application_date')[:batch_size]
+            )
+            if not events:
+                return 0
+
+            totals = defaultdict(lambda: [0, 0])
+            for _, job_id, status, created_at, applied_at in events:
+                key = (job_id, timezone.localdate(created_at), status)
+                totals[key][0] += 1
+                totals[key][1] += max(int((created_at - applied_at).total_seconds()), 0)
+
+            existing = {
+                (row.job_id, row.day, row.status): row
+                for row in JobFunnelDaily.objects.filter(
+                    job_id__in={key[0] for key in totals}, day__in={key[1] for key in totals})
+            }
+            to_update, to_create = [], []
+            for (job_id, day, status), (entered, seconds) in totals.items():
+                row = existing.get((job_id, day, status))
+                if row is None:
+                    to_create.append(JobFunnelDaily(
+                        job_id=job_id, day=day, status=status, entered=entered, total_seconds=seconds))
+                else:
+                    row.entered += entered
+                    row.total_seconds += seconds
+                    to_update.append(row)
+            JobFunnelDaily.objects.bulk_update(to_update, ['entered', 'total_seconds'], batch_size=500)
+            JobFunnelDaily.objects.bulk_create(to_create, batch_size=500)
+
+            ApplicationStatusEvent.objects.filter(pk__in=[event[0] for event in events]).update(rolled_up=True)
+            # Kept as the highest id rolled up, and its updated_at as the time of the last run
+            watermark.position = max(watermark.position, events[-1][0])
+            watermark.save()
+        logger.info(f"rollup_funnel: Folded {len(events)} events into {len(totals)} daily rows, watermark at {watermark.position}")
+        return len(events)
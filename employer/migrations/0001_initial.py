@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('jobs', '0007_applicationstatusevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobFunnelDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('applied', 'Applied'), ('pending', 'Pending Review'), ('reviewed', 'Reviewed'), ('rejected', 'Rejected'), ('shortlisted', 'Shortlisted'), ('hired', 'Hired')], max_length=20)),
+                ('entered', models.PositiveIntegerField(default=0)),
+                ('total_seconds', models.BigIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='funnel_days', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Job Funnel Day',
+                'verbose_name_plural': 'Job Funnel Days',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('job', 'day', 'status'), name='uq_job_funnel_daily')],
+            },
+        ),
+    ]
@@ -1,3 +1,41 @@
 from django.db import models
 
-# Create your models here.
+from jobs.models import Job, Application
+
+# RollupWatermark name of the rollup_funnel command
+FUNNEL_WATERMARK = 'employer.funnel'
+
+
+class JobFunnelDaily(models.Model):
+    """
+    Daily hiring-funnel totals of a job, built from ApplicationStatusEvent rows.
+
+    One row per job, day and status: how many applications entered the status
+    that day and how long (in total) they took to get there from submission.
+    Maintained incrementally by the rollup_funnel management command; the
+    analytics page only reads these rows.
+
+    Attributes:
+        job (ForeignKey): The job the totals belong to
+        day (DateField): Calendar day (in TIME_ZONE) of the transitions
+        status (CharField): Status entered; 'applied' counts new applications
+        entered (PositiveIntegerField): Number of transitions into the status
+        total_seconds (BigIntegerField): Sum of the times from submission to the transition
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='funnel_days')
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    entered = models.PositiveIntegerField(default=0)
+    total_seconds = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        """String representation of the JobFunnelDaily object."""
+        return f'Job {self.job_id} {self.day} {self.status}: {self.entered}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'day', 'status'], name='uq_job_funnel_daily')
+        ]
+        ordering = ['day']
+        verbose_name = "Job Funnel Day"
+        verbose_name_plural = "Job Funnel Days"
@@ -2,9 +2,28 @@ from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.messages import get_messages
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.core.management import call_command
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
 
 from portal_auth.models import User
-from jobs.models import Job, Application
+from jobs.models import Job, Application, ApplicationStatusEvent, ResumeToken
+from employer.job_import import import_jobs
+from employer.models import FUNNEL_WATERMARK, JobFunnelDaily
+from utils.counters import read_counters
+from utils.pagination import encode_cursor
+from utils.models import OutboxEmail, RollupWatermark
 
 class EmployerTestCase(TestCase):
     """Base test case for employer tests with common setup"""
@@ -193,6 +212,27 @@ class JobManagementTests(EmployerTestCase):
         self.assertEqual(len(response.context['jobs']), 1)
         self.assertEqual(response.context['jobs'][0], self.job)
     
+    def test_my_jobs_status_counts_from_counters(self):
+        """Test that per-status application counts are read from the job counters"""
+        for index, status in enumerate(['applied', 'applied', 'hired', 'applied']):
+            seeker = User.objects.create(username=f'seeker{index}', email=f'seeker{index}@example.com', role='job_seeker')
+            Application.objects.create(job=self.job, applicant=seeker, status=status)
+        # Applications of accounts awaiting purge_deleted are not counted
+        seeker.mark_deleted()
+        Job.objects.create(title='Second Job', description='d', location='l', company='c', poster=self.employer)
+        self.login_as_employer()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('employer:my_jobs'))
+        self.assertFalse([q for q in queries if 'jobs_application' in q['sql']])
+
+        jobs = {job.title: job for job in response.context['jobs']}
+        self.assertEqual(jobs['Test Job'].total_applications, 3)
+        self.assertEqual(jobs['Test Job'].status_breakdown, [('Applied', 2), ('Hired', 1)])
+        self.assertEqual(jobs['Second Job'].total_applications, 0)
+        self.assertContains(response, 'Applied: 2')
+        self.assertContains(response, 'View Applications (3)')
+
     def test_delete_job(self):
         """Test deleting a job"""
         self.login_as_employer()
@@ -234,6 +274,117 @@ class JobManagementTests(EmployerTestCase):
         self.assertTrue(any('permission' in str(message).lower() for message in messages))
 
 
+class JobImportTests(EmployerTestCase):
+    """Tests for posting jobs in bulk from CSV / JSON files"""
+
+    def setUp(self):
+        super().setUp()
+        self.login_as_employer()
+
+    def _job(self, title, **fields):
+        row = {'title': title, 'description': 'A sufficiently long job description.', 'salary': '50,000',
+               'location': 'Remote', 'category': 'IT', 'company': 'Acme Corp'}
+        row.update(fields)
+        return row
+
+    def _upload(self, name, content):
+        return self.client.post(reverse('employer:import_jobs'),
+                                {'jobs_file': SimpleUploadedFile(name, content.encode('utf-8'))}, follow=True)
+
+    def test_import_csv(self):
+        """Test a CSV with valid, duplicate and invalid rows"""
+        Job.objects.create(poster=self.employer, **self._job('Existing Role'))
+        rows = [self._job('Backend Developer'), self._job('Existing Role'), self._job('Backend Developer'),
+                self._job('Bad', salary='lots')]
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+        response = self._upload('jobs.csv', '\ufeff' + output.getvalue())
+
+        self.assertEqual(response.status_code, 200)
+        result = response.context['result']
+        self.assertEqual((result.created, result.duplicates, result.invalid), (1, 2, 1))
+        # Row 5 of the file (after the header): too short a title and a bad salary
+        self.assertEqual(result.errors[0][0], 5)
+        self.assertEqual(set(result.errors[0][1]), {'title', 'salary'})
+        job = Job.objects.get(title='Backend Developer')
+        self.assertEqual(job.poster, self.employer)
+        self.assertEqual(job.salary, '$50,000')
+
+    def test_import_json_array_and_lines(self):
+        """Test both JSON layouts; a clean import redirects to My Jobs"""
+        response = self._upload('jobs.json', json.dumps([self._job('Data Engineer'), self._job('QA Engineer')]))
+        self.assertRedirects(response, reverse('employer:my_jobs'))
+
+        lines = '\n'.join(json.dumps(self._job(title)) for title in ('Designer Role', 'Support Role')) + '\n'
+        self._upload('jobs.jsonl', lines)
+        self.assertEqual(Job.objects.filter(poster=self.employer).count(), 4)
+
+    @patch('employer.job_import.JOB_IMPORT_BATCH_SIZE', 2)
+    @patch('employer.job_import.JSON_READ_SIZE', 7)
+    def test_import_json_array_read_in_chunks(self):
+        """Test that a JSON array is decoded element by element across read chunks"""
+        jobs = [self._job(f'Engineer Level {i}', description='Brackets ] and [ commas, in "quotes" here.')
+                for i in range(3)]
+        response = self._upload('jobs.json', ' ' + json.dumps(jobs, indent=2))
+        self.assertRedirects(response, reverse('employer:my_jobs'))
+        self.assertEqual(Job.objects.filter(poster=self.employer).count(), 3)
+
+        response = self._upload('jobs.json', json.dumps(jobs)[:-1] + ', 12')
+        self.assertIn('Invalid JSON', response.context['result'].file_error)
+
+    def test_import_counts_jobs_inserted_concurrently_as_duplicates(self):
+        """Test that rows skipped by ignore_conflicts are not counted as created"""
+        bulk_create = Job.objects.bulk_create
+
+        def insert_first_concurrently(jobs, **kwargs):
+            Job.objects.create(poster=self.employer, **self._job('Data Engineer'))
+            return bulk_create(jobs, **kwargs)
+
+        before = read_counters()['jobs']
+        with patch.object(Job.objects, 'bulk_create', side_effect=insert_first_concurrently):
+            result = import_jobs(enumerate([self._job('Data Engineer'), self._job('QA Engineer')], 1), self.employer)
+        self.assertEqual((result.created, result.duplicates), (1, 1))
+        # The concurrent create counted itself through the signal
+        self.assertEqual(read_counters()['jobs'], before + 2)
+        self.assertEqual(Job.objects.filter(poster=self.employer).count(), 2)
+
+    @patch('employer.job_import.JOB_IMPORT_BATCH_SIZE', 2)
+    def test_import_inserts_in_batches(self):
+        """Test that valid rows are inserted with one INSERT per batch"""
+        jobs = [self._job(f'Engineer Level {i}') for i in range(5)]
+        with CaptureQueriesContext(connection) as queries:
+            self._upload('jobs.json', json.dumps(jobs))
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT') and '"jobs_job"' in q['sql']]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(Job.objects.filter(poster=self.employer).count(), 5)
+
+    @override_settings(JOB_IMPORT_MAX_ROWS=2)
+    def test_import_row_limit(self):
+        """Test that rows past JOB_IMPORT_MAX_ROWS are not imported"""
+        response = self._upload('jobs.json', json.dumps([self._job(f'Engineer Level {i}') for i in range(3)]))
+        self.assertEqual(response.context['result'].created, 2)
+        self.assertIn('more than 2 jobs', response.context['result'].file_error)
+
+    def test_import_rejects_bad_files(self):
+        """Test unsupported types and malformed JSON"""
+        response = self._upload('jobs.txt', 'title\nSomething')
+        self.assertTrue(response.context['form'].errors)
+
+        response = self._upload('jobs.json', '[{"title": ')
+        self.assertIn('Invalid JSON', response.context['result'].file_error)
+        self.assertFalse(Job.objects.filter(poster=self.employer).exists())
+
+    def test_import_job_seeker_denied(self):
+        """Test that job seekers cannot import jobs"""
+        self.client.logout()
+        self.login_as_job_seeker()
+        self._upload('jobs.json', json.dumps([self._job('Data Engineer')]))
+        self.assertFalse(Job.objects.filter(title='Data Engineer').exists())
+
+
 class ApplicationManagementTests(EmployerTestCase):
     """Tests for application management functionality"""
     
@@ -381,6 +532,82 @@ class ApplicationManagementTests(EmployerTestCase):
         self.assertTrue(any('permission' in str(message).lower() for message in messages))
 
 
+    def _second_application(self):
+        """Create another application for the employer's job"""
+        applicant = User.objects.create(username='applicant2', email='applicant2@example.com', role='job_seeker')
+        return Application.objects.create(job=self.job, applicant=applicant, status='applied')
+
+    def test_bulk_update_application_status(self):
+        """Test moving several applications to one status with a single UPDATE"""
+        second = self._second_application()
+        self.login_as_employer()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse('employer:bulk_update_application_status'),
+                {'status': 'shortlisted', 'application_ids': [self.application.id, second.id]}
+            )
+
+        self.assertRedirects(response, reverse('employer:job_applications', kwargs={'job_id': self.job.id}),
+                             fetch_redirect_response=False)
+        self.application.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(self.application.status, 'shortlisted')
+        self.assertEqual(second.status, 'shortlisted')
+        # One ownership query and one UPDATE on top of the session/user lookups
+        application_queries = [q['sql'] for q in queries.captured_queries if '"jobs_application"' in q['sql']]
+        self.assertEqual(len(application_queries), 2)
+        self.assertTrue(application_queries[1].startswith('UPDATE'))
+        # Both transitions recorded for the funnel analytics
+        events = ApplicationStatusEvent.objects.filter(to_status='shortlisted', changed_by=self.employer)
+        self.assertEqual(sorted(events.values_list('application_id', flat=True)), [self.application.id, second.id])
+        # And both applicants notified
+        self.assertEqual(sorted(email.to[0] for email in OutboxEmail.objects.all()), ['applicant2@example.com', 'jobseeker@example.com'])
+
+    def test_bulk_update_application_status_unauthorized(self):
+        """Test that one foreign application in the selection blocks the whole update"""
+        self.login_as_employer()
+
+        response = self.client.post(
+            reverse('employer:bulk_update_application_status'),
+            {'status': 'rejected', 'application_ids': [self.application.id, self.other_application.id]},
+            follow=True
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.application.refresh_from_db()
+        self.other_application.refresh_from_db()
+        self.assertEqual(self.application.status, 'applied')
+        self.assertEqual(self.other_application.status, 'applied')
+        messages = list(get_messages(response.wsgi_request))
+        self.assertTrue(any('permission' in str(message).lower() for message in messages))
+
+    def test_bulk_update_application_status_requires_selection(self):
+        """Test submitting the bulk form without any application selected"""
+        self.login_as_employer()
+
+        response = self.client.post(
+            reverse('employer:bulk_update_application_status'),
+            {'status': 'reviewed'},
+            follow=True
+        )
+
+        messages = list(get_messages(response.wsgi_request))
+        self.assertTrue(any('select at least one' in str(message).lower() for message in messages))
+
+    def test_bulk_update_application_status_admin(self):
+        """Test that admins can bulk update applications of any employer"""
+        self.login_as_admin()
+
+        response = self.client.post(
+            reverse('employer:bulk_update_application_status'),
+            {'status': 'hired', 'application_ids': [self.application.id, self.other_application.id]}
+        )
+
+        self.assertRedirects(response, reverse('portal_admin:admin_applications'), fetch_redirect_response=False)
+        self.other_application.refresh_from_db()
+        self.assertEqual(self.other_application.status, 'hired')
+
 class AdminAccessTests(EmployerTestCase):
     """Tests for admin access to employer views"""
     
@@ -448,4 +675,291 @@ class AdminAccessTests(EmployerTestCase):
         
         # Check that application status was updated
         self.application.refresh_from_db()
-        self.assertEqual(self.application.status, 'reviewed')
\ No newline at end of file
+        self.assertEqual(self.application.status, 'reviewed')
+
+
+class ResumeKeywordFilterTests(EmployerTestCase):
+    """Tests for filtering applicants by resume keywords"""
+
+    def setUp(self):
+        """Index the resumes of two applicants"""
+        super().setUp()
+        self.job = Job.objects.create(
+            title='Test Job', description='Test description', location='Test Location',
+            category='IT', company='Test Company', poster=self.employer)
+        self.application = Application.objects.create(job=self.job, applicant=self.job_seeker, status='applied')
+        self.second_seeker = User.objects.create(
+            username='second_seeker', email='second@example.com', role='job_seeker')
+        self.second_application = Application.objects.create(
+            job=self.job, applicant=self.second_seeker, status='applied')
+        ResumeToken.objects.bulk_create([
+            ResumeToken(application=self.application, token='python'),
+            ResumeToken(application=self.application, token='django'),
+            ResumeToken(application=self.second_application, token='python'),
+        ])
+        self.login_as_employer()
+
+    def _filter(self, query):
+        response = self.client.get(
+            reverse('employer:job_applications', kwargs={'job_id': self.job.id}), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return list(response.context['applications'])
+
+    def test_all_keywords_must_match(self):
+        """Test that every keyword narrows the applicant list"""
+        self.assertEqual(len(self._filter('Python')), 2)
+        self.assertEqual(self._filter('python DJANGO'), [self.application])
+        self.assertEqual(self._filter('rust'), [])
+
+    def test_empty_query_lists_everyone(self):
+        """Test that a blank query does not filter"""
+        self.assertEqual(len(self._filter('')), 2)
+
+
+class ApplicantListPaginationTests(EmployerTestCase):
+    """Tests for paging, filtering and sorting the applicants of a job"""
+
+    def setUp(self):
+        """Create five applications, three of them sharing one timestamp"""
+        super().setUp()
+        self.job = Job.objects.create(
+            title='Test Job', description='Test description', location='Test Location',
+            category='IT', company='Test Company', poster=self.employer)
+        self.applications = []
+        for i in range(5):
+            applicant = User.objects.create(username=f'seeker{i}', email=f'seeker{i}@example.com', role='job_seeker')
+            self.applications.append(Application.objects.create(
+                job=self.job, applicant=applicant, status='reviewed' if i % 2 else 'applied'))
+        # Ties on application_date are broken by id
+        Application.objects.filter(pk__in=[a.pk for a in self.applications[1:4]]).update(
+            application_date=self.applications[1].application_date)
+        self.login_as_employer()
+
+    def _get(self, **params):
+        response = self.client.get(reverse('employer:job_applications', kwargs={'job_id': self.job.id}), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    @patch('employer.views.APPLICATIONS_PAGE_SIZE', 2)
+    def test_pages_cover_every_application_once(self):
+        """Test following next and previous cursors through all pages"""
+        seen, pages, cursor = [], [], None
+        while True:
+            page = self._get(**({'cursor': cursor} if cursor else {})).context['page']
+            pages.append(page)
+            seen.extend(application.id for application in page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        expected = Application.objects.filter(job=self.job).order_by('-application_date', '-id')
+        self.assertEqual(seen, [a.id for a in expected])
+        self.assertEqual(len(pages), 3)
+        self.assertFalse(pages[0].has_previous)
+
+        previous = self._get(cursor=pages[2].previous_cursor).context['page']
+        self.assertEqual([a.id for a in previous], [a.id for a in pages[1]])
+
+    def test_status_filter_and_counts(self):
+        """Test that the status tabs filter the list and show totals"""
+        response = self._get(status='reviewed')
+        self.assertEqual({a.status for a in response.context['applications']}, {'reviewed'})
+        self.assertEqual(len(response.context['applications']), 2)
+        self.assertEqual(response.context['total_applications'], 5)
+        counts = {f['value']: f['count'] for f in response.context['status_filters']}
+        self.assertEqual(counts['applied'], 3)
+        self.assertEqual(counts['reviewed'], 2)
+
+    def test_counts_read_from_job_counters(self):
+        """Test that the status tabs are counted without grouping the job's applications"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get()
+        counts = {f['value']: f['count'] for f in response.context['status_filters']}
+        self.assertEqual((counts['applied'], counts['reviewed']), (3, 2))
+        self.assertFalse([q for q in queries.captured_queries if 'GROUP BY' in q['sql'].upper()])
+
+    def test_sort_oldest_first(self):
+        """Test sorting by application date ascending"""
+        response = self._get(sort='oldest')
+        self.assertEqual(response.context['applications'][0], self.applications[0])
+
+    def test_tampered_cursor_shows_first_page(self):
+        """Test that a well-formed cursor with values of the wrong type is ignored"""
+        for values in (['garbage', 'x'], [{'a': 1}, [1]]):
+            with self.subTest(values=values):
+                response = self._get(cursor=encode_cursor('next', values))
+                self.assertEqual(len(response.context['applications']), 5)
+                self.assertIsNone(response.context['page'].previous_cursor)
+
+    def test_invalid_parameters_fall_back_to_defaults(self):
+        """Test that unknown status, sort and cursor values are ignored"""
+        response = self._get(status='bogus', sort='bogus', cursor='not-a-cursor')
+        self.assertEqual(response.context['status'], '')
+        self.assertEqual(response.context['sort'], 'newest')
+        self.assertEqual(len(response.context['applications']), 5)
+
+
+class ResumeArchiveTests(EmployerTestCase):
+    """Tests for downloading all resumes of a job as a ZIP archive"""
+
+    def setUp(self):
+        """Store two local resumes and reference a third that only exists in S3"""
+        super().setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.temp_dir)
+        self.settings_override.enable()
+        self.job = Job.objects.create(
+            title='Test Job', description='Test description', location='Test Location',
+            category='IT', company='Test Company', poster=self.employer)
+        self.applications = []
+        for index, content in enumerate([b'%PDF-1.4 first', b'%PDF-1.4 second']):
+            seeker = User.objects.create(username=f'seeker{index}', email=f'seeker{index}@example.com', role='job_seeker')
+            path = os.path.join(self.temp_dir, 'resumes', str(seeker.id), 'cv.pdf')
+            os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as f:
+                f.write(content)
+            self.applications.append(Application.objects.create(
+                job=self.job, applicant=seeker, resume_path=f'{seeker.id}/cv.pdf'))
+        self.remote = Application.objects.create(job=self.job, applicant=self.job_seeker, resume_path='remote/cv.docx')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.temp_dir)
+
+    def _download(self):
+        response = self.client.get(reverse('employer:download_resumes', kwargs={'job_id': self.job.id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_download_all_resumes(self):
+        """Test that local and S3 resumes are streamed into one stored ZIP"""
+        self.login_as_employer()
+        with patch('boto3.client') as mock_client:
+            mock_client.return_value.get_object.return_value = {'Body': io.BytesIO(b'PK\x03\x04 remote')}
+            with self.settings(ENABLE_S3_UPLOAD=True, AWS_STORAGE_BUCKET_NAME='test-bucket'):
+                archive = self._download()
+
+        first, second = self.applications
+        self.assertEqual(archive.namelist(), [
+            f'seeker0_{first.id}.pdf', f'seeker1_{second.id}.pdf', f'jobseeker_{self.remote.id}.docx'])
+        self.assertEqual(archive.read(f'seeker1_{second.id}.pdf'), b'%PDF-1.4 second')
+        self.assertEqual(archive.read(f'jobseeker_{self.remote.id}.docx'), b'PK\x03\x04 remote')
+        self.assertTrue(all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist()))
+        self.assertIsNone(archive.testzip())
+        mock_client.return_value.get_object.assert_called_once_with(
+            Bucket='test-bucket', Key='media/resumes/remote/cv.docx')
+
+    def test_missing_resumes_are_listed(self):
+        """Test that resumes that cannot be read are reported inside the archive"""
+        self.login_as_employer()
+        with self.settings(ENABLE_S3_UPLOAD=False):
+            archive = self._download()
+        self.assertIn('MISSING.txt', archive.namelist())
+        self.assertIn(f'jobseeker_{self.remote.id}.docx', archive.read('MISSING.txt').decode())
+
+    def test_download_resumes_unauthorized(self):
+        """Test that other employers cannot download the archive"""
+        User.objects.create_user(username='other', email='other@example.com', password='password123', role='employer')
+        self.client.login(username='other', password='password123')
+        response = self.client.get(reverse('employer:download_resumes', kwargs={'job_id': self.job.id}))
+        self.assertRedirects(response, reverse('employer:my_jobs'))
+
+
+class FunnelAnalyticsTests(EmployerTestCase):
+    """Tests for status events, the funnel rollup and the analytics page"""
+
+    def setUp(self):
+        """Create a job with two applications submitted two days ago"""
+        super().setUp()
+        self.job = Job.objects.create(
+            title='Test Job', description='Test description', location='Test Location',
+            category='IT', company='Test Company', poster=self.employer)
+        self.applied_at = timezone.now() - timedelta(days=2)
+        self.application = Application.objects.create(
+            job=self.job, applicant=self.job_seeker, application_date=self.applied_at)
+        second_seeker = User.objects.create(username='second_seeker', email='second@example.com', role='job_seeker')
+        self.second_application = Application.objects.create(
+            job=self.job, applicant=second_seeker, application_date=self.applied_at)
+
+    def _rollup(self):
+        call_command('rollup_funnel', stdout=io.StringIO())
+        return {row.status: row for row in JobFunnelDaily.objects.filter(job=self.job)}
+
+    def test_submission_and_status_change_record_events(self):
+        """Test that applying and changing status append events"""
+        self.login_as_employer()
+        self.client.post(
+            reverse('employer:update_application_status', kwargs={'application_id': self.application.id}),
+            {'status': 'shortlisted'}
+        )
+        events = list(self.application.status_events.values_list('from_status', 'to_status', 'changed_by'))
+        self.assertEqual(events, [('', 'applied', None), ('applied', 'shortlisted', self.employer.id)])
+
+    def test_rollup_is_incremental(self):
+        """Test that each event is counted once across rollup runs"""
+        rows = self._rollup()
+        self.assertEqual(rows['applied'].entered, 2)
+        self.assertEqual(rows['applied'].total_seconds, 0)
+
+        shortlisted_at = self.applied_at + timedelta(days=1)
+        ApplicationStatusEvent.objects.create(
+            application=self.application, job=self.job, from_status='applied', to_status='shortlisted',
+            created_at=shortlisted_at)
+        rows = self._rollup()
+        self.assertEqual(rows['applied'].entered, 2)
+        self.assertEqual(rows['shortlisted'].entered, 1)
+        self.assertEqual(rows['shortlisted'].total_seconds, 86400)
+        self.assertEqual(rows['shortlisted'].day, timezone.localdate(shortlisted_at))
+
+    def test_rollup_counts_late_commits(self):
+        """Test that events committed below already rolled-up ids, or backdated, are still counted"""
+        self.application.set_status('hired', changed_by=self.employer)
+        rows = self._rollup()
+        self.assertEqual(rows['hired'].entered, 1)
+
+        # A backdated event committed after higher ids were rolled up
+        RollupWatermark.objects.filter(name=FUNNEL_WATERMARK).update(position=10 ** 6)
+        ApplicationStatusEvent.objects.create(
+            application=self.second_application, job=self.job, from_status='applied', to_status='rejected',
+            created_at=self.applied_at)
+        rows = self._rollup()
+        self.assertEqual(rows['rejected'].entered, 1)
+        self.assertEqual(rows['applied'].entered, 2)
+        self.assertFalse(ApplicationStatusEvent.objects.filter(rolled_up=False).exists())
+
+    def test_backfill_records_missing_submissions(self):
+        """Test that --backfill covers applications created before event tracking"""
+        ApplicationStatusEvent.objects.all().delete()
+        call_command('rollup_funnel', '--backfill', stdout=io.StringIO())
+        self.assertEqual(ApplicationStatusEvent.objects.filter(job=self.job, to_status='applied').count(), 2)
+
+    def test_analytics_page_reads_rollup(self):
+        """Test the funnel figures shown on the analytics page"""
+        ApplicationStatusEvent.objects.create(
+            application=self.application, job=self.job, from_status='applied', to_status='shortlisted',
+            created_at=self.applied_at + timedelta(hours=12))
+        self._rollup()
+        self.login_as_employer()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('employer:job_analytics', kwargs={'job_id': self.job.id}), {'days': 7})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('"jobs_application"' in q['sql'] for q in queries.captured_queries))
+        funnel = {stage['label']: stage for stage in response.context['funnel']}
+        self.assertEqual(funnel['Applied']['count'], 2)
+        self.assertEqual(funnel['Shortlisted']['conversion'], 50.0)
+        self.assertEqual(len(response.context['daily']), 7)
+        self.assertAlmostEqual(response.context['time_to_status'][0]['average_days'], 0.5)
+
+    def test_analytics_unauthorized(self):
+        """Test that other employers cannot see a job's analytics"""
+        other_employer = User.objects.create(username='other_employer', email='other@example.com', role='employer')
+        other_employer.set_password('password123')
+        other_employer.save()
+        self.client.login(username='other_employer', password='password123')
+
+        response = self.client.get(reverse('employer:job_analytics', kwargs={'job_id': self.job.id}))
+
+        self.assertRedirects(response, reverse('employer:my_jobs'), fetch_redirect_response=False)
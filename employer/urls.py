@@ -9,12 +9,20 @@ urlpatterns = [
     path('post-job-redirect/', views.post_job_redirect_view, name='post_job_redirect'),
     # Form to create a new job
     path('new/', views.new_job_view, name='new_job'),
+    # Post many jobs from a CSV / JSON file
+    path('import/', views.import_jobs_view, name='import_jobs'),
     # List of jobs posted by the current employer
     path('my-jobs/', views.my_jobs_view, name='my_jobs'),
     # View applications for a specific job
     path('job/<int:job_id>/applications/', views.job_applications_view, name='job_applications'),
+    # Hiring-funnel analytics for a job
+    path('job/<int:job_id>/analytics/', views.job_analytics_view, name='job_analytics'),
+    # Download all resumes for a job as a ZIP archive
+    path('job/<int:job_id>/resumes.zip', views.download_resumes_view, name='download_resumes'),
     # Delete a job posting (POST request)
     path('job/<int:job_id>/delete/', views.delete_job_view, name='delete_job'),
     # Update application status (POST request)
     path('application/<int:application_id>/update/', views.update_application_status_view, name='update_application_status'),
+    # Update the status of several applications at once (POST request)
+    path('applications/bulk-update/', views.bulk_update_application_status_view, name='bulk_update_application_status'),
 ]
\ No newline at end of file
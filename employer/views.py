@@ -2,18 +2,65 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.db import transaction # For atomic operations if needed
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from django.utils.text import get_valid_filename
+from collections import Counter, defaultdict
+from datetime import timedelta
+import os
 import logging # Import logging
 
 # Import models from the 'jobs' app
-from jobs.models import Job, Application
+from jobs.models import Job, Application, ApplicationStatusEvent, ResumeToken
+from jobs.notifications import queue_notifications, status_change_email
+from utils.text_extraction import tokenize
+from utils.activity import APPLICATIONS, record_activity
+from utils.counters import adjust_counters, adjust_job_counters, read_job_counters, read_job_counters_for, status_counter
+from utils.models import RollupWatermark
+from utils.pagination import paginate_keyset
+from utils.zipstream import iter_resume_archive
 # Import forms from the current app
-from .forms import JobForm, ApplicationStatusForm
+from .forms import JobForm, ApplicationStatusForm, BulkApplicationStatusForm, JobImportForm
+from .job_import import import_jobs, iter_job_rows
+from .models import FUNNEL_WATERMARK, JobFunnelDaily
 # Import decorators from auth app
 from portal_auth.views import login_required, role_required
 
 logger = logging.getLogger(__name__) # Get logger for this module
 
+APPLICATIONS_PAGE_SIZE = 50
+# Keyset orderings for the applicant list; each ends in 'id' so the sort key is unique
+APPLICATION_SORT_ORDERS = {
+    'newest': ['-application_date', '-id'],
+    'oldest': ['application_date', 'id'],
+}
+# Periods (in days) offered on the funnel analytics page
+ANALYTICS_PERIODS = (7, 30, 90)
+# Stages of the hiring funnel, in order
+FUNNEL_STAGES = ('applied', 'shortlisted', 'hired')
+
+# --- Helpers ---
+
+def _bulk_update_redirect(user, job_ids):
+    """Back to the job's applications when all ids belong to one job, else the overview list."""
+    if user.role != 'employer':
+        return redirect('portal_admin:admin_applications')
+    if len(job_ids) == 1:
+        return redirect('employer:job_applications', job_id=next(iter(job_ids)))
+    return redirect('employer:my_jobs')
+
+
+def _filter_by_resume_keywords(applications, search_query):
+    """Keep applications whose resume contains every keyword of the query."""
+    for keyword in sorted(tokenize(search_query)):
+        applications = applications.filter(
+            Exists(ResumeToken.objects.filter(application=OuterRef('pk'), token=keyword))
+        )
+    return applications
+
+
 # --- Views ---
 
 @login_required
@@ -94,6 +141,50 @@ def new_job_view(request):
     return render(request, 'employer/new_job.html', {'form': form})
 
 
+@login_required
+@role_required('employer', 'admin')
+def import_jobs_view(request):
+    """
+    Post many jobs at once from an uploaded CSV or JSON file.
+
+    Every row is validated with the JobForm rules; valid rows are inserted in
+    batches (see employer.job_import) and the page lists the rows that failed.
+    """
+    user = request.user
+    result = None
+    if request.method == 'POST':
+        form = JobImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            jobs_file = form.cleaned_data['jobs_file']
+            logger.info(f"Job import of '{jobs_file.name}' ({jobs_file.size} bytes) started by user {user.id}")
+            try:
+                result = import_jobs(iter_job_rows(jobs_file), user)
+            except Exception as e:
+                logger.error(f"Error importing jobs for user {user.id}: {str(e)}")
+                messages.error(request, 'An error occurred while importing the jobs.')
+            else:
+                if result.file_error:
+                    messages.error(request, result.file_error)
+                if result.created:
+                    messages.success(request, f'{result.created} job(s) posted successfully!')
+                if result.duplicates:
+                    messages.info(request, f'{result.duplicates} job(s) were already posted and have been skipped.')
+                if result.invalid:
+                    messages.warning(request, f'{result.invalid} row(s) could not be imported. See the errors below.')
+                elif not result.file_error:
+                    # Nothing to correct: go to the job list like new_job_view does
+                    if user.role == 'employer':
+                        return redirect('employer:my_jobs')
+                    return redirect('portal_admin:admin_jobs')
+        else:
+            logger.warning(f"Job import form validation failed for user {user.id}: {form.errors}")
+            messages.error(request, 'Please correct the errors below.')
+    else:
+        form = JobImportForm()
+
+    return render(request, 'employer/import_jobs.html', {'form': form, 'result': result})
+
+
 @login_required
 @role_required('employer', 'admin') # Only employers view this specific list
 def my_jobs_view(request):
@@ -103,10 +194,20 @@ def my_jobs_view(request):
     """
     user = request.user
     logger.info(f"Employer {user.id} accessing their posted jobs ('my_jobs')")
-    # Filter jobs by the current user and order by date
-    jobs = Job.objects.filter(poster=user).order_by('-posted_date')
-    logger.info(f"Found {jobs.count()} jobs posted by employer {user.id}")
-    # No need to manually add application_count, use job.applications.count() in template
+    # Filter jobs by the current user and order by date; total and per-status
+    # application counts are read from the jobs' status counters in one query
+    jobs = list(Job.objects.filter(poster=user).order_by('-posted_date'))
+    counters = read_job_counters_for([job.id for job in jobs])
+    for job in jobs:
+        status_counts = counters[job.id]
+        job.total_applications = sum(status_counts.values())
+        # (label, count) pairs for the non-empty statuses, shown as badges
+        job.status_breakdown = [
+            (label, status_counts[status])
+            for status, label in Application.STATUS_CHOICES
+            if status_counts.get(status)
+        ]
+    logger.info(f"Found {len(jobs)} jobs posted by employer {user.id}")
     return render(request, 'employer/my_jobs.html', {'jobs': jobs})
 
 
@@ -128,17 +229,167 @@ def job_applications_view(request, job_id):
         return redirect('employer:my_jobs')
     # Admins are allowed by role_required decorator
 
-    # Get applications related to this job
-    applications = job.applications.select_related('applicant').order_by('-application_date')
-    logger.info(f"Found {applications.count()} applications for job {job_id}")
+    # Get applications related to this job, except those of accounts awaiting purge_deleted
+    applications = job.applications.filter(applicant__deleted_at__isnull=True).select_related('applicant')
+
+    # Optional keyword filter, answered from the resume token index built by index_resumes
+    search_query = request.GET.get('q', '').strip()
+    applications = _filter_by_resume_keywords(applications, search_query)
+
+    # Per-status totals for the filter tabs: kept in the job's status counters, so only
+    # a keyword-filtered list groups its (already narrowed) matches
+    if search_query:
+        status_counts = dict(applications.order_by().values_list('status').annotate(total=Count('id')))
+    else:
+        status_counts = read_job_counters(job.id)
+    status_filters = [
+        {'value': value, 'label': label, 'count': status_counts.get(value, 0)}
+        for value, label in Application.STATUS_CHOICES
+    ]
+
+    status = request.GET.get('status', '')
+    if status in dict(Application.STATUS_CHOICES):
+        applications = applications.filter(status=status)
+    else:
+        status = ''
+
+    sort = request.GET.get('sort', 'newest')
+    if sort not in APPLICATION_SORT_ORDERS:
+        sort = 'newest'
+
+    # Keyset pagination: each page seeks past the previous page's last row
+    page = paginate_keyset(applications, APPLICATION_SORT_ORDERS[sort],
+                           cursor=request.GET.get('cursor'), page_size=APPLICATIONS_PAGE_SIZE)
+    total_applications = sum(status_counts.values())
+    logger.info(f"Showing {len(page)} of {total_applications} applications for job {job_id} (keywords: '{search_query}', status: '{status}', sort: '{sort}')")
 
     context = {
         'job': job,
-        'applications': applications,
+        'applications': page,
+        'page': page,
+        'search_query': search_query,
+        'status': status,
+        'status_filters': status_filters,
+        'total_applications': total_applications,
+        'sort': sort,
     }
     return render(request, 'employer/job_applications.html', context)
 
 
+@login_required
+@role_required('employer', 'admin') # Allow admin access too
+def job_analytics_view(request, job_id):
+    """
+    Hiring-funnel analytics for one job: applications per day, stage conversion
+    and average time to each status.
+
+    Reads only the pre-aggregated JobFunnelDaily rows (one per day and status)
+    maintained by the rollup_funnel command, never the applications themselves.
+    """
+    user = request.user
+    job = get_object_or_404(Job, pk=job_id)
+
+    # Security Check: Ensure user is admin or owns the job
+    if user.role == 'employer' and job.poster_id != user.id:
+        logger.warning(f"Unauthorized analytics access attempt: Employer {user.id} for job {job_id} posted by user {job.poster_id}")
+        messages.error(request, 'You do not have permission to view these analytics.')
+        return redirect('employer:my_jobs')
+
+    try:
+        days = int(request.GET.get('days', 30))
+    except ValueError:
+        days = 30
+    if days not in ANALYTICS_PERIODS:
+        days = 30
+    end = timezone.localdate()
+    start = end - timedelta(days=days - 1)
+
+    per_day = defaultdict(dict)
+    entered = defaultdict(int)
+    seconds = defaultdict(int)
+    for day, status, count, total_seconds in JobFunnelDaily.objects.filter(job=job, day__gte=start).values_list(
+            'day', 'status', 'entered', 'total_seconds'):
+        per_day[day][status] = count
+        entered[status] += count
+        seconds[status] += total_seconds
+
+    daily = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        daily.append({'day': day, **{stage: per_day[day].get(stage, 0) for stage in FUNNEL_STAGES}})
+    busiest_day = max(row['applied'] for row in daily) or 1
+    for row in daily:
+        row['bar_width'] = round(100 * row['applied'] / busiest_day)
+
+    labels = dict(Application.STATUS_CHOICES)
+    funnel = []
+    for index, stage in enumerate(FUNNEL_STAGES):
+        previous = entered[FUNNEL_STAGES[index - 1]] if index else None
+        funnel.append({
+            'label': labels[stage],
+            'count': entered[stage],
+            # Share of the previous stage that reached this one
+            'conversion': round(100 * entered[stage] / previous, 1) if previous else None,
+        })
+
+    time_to_status = [
+        {'label': labels[status], 'count': entered[status], 'average_days': seconds[status] / entered[status] / 86400}
+        for status, _ in Application.STATUS_CHOICES
+        if status != 'applied' and entered[status]
+    ]
+
+    context = {
+        'job': job,
+        'days': days,
+        'periods': ANALYTICS_PERIODS,
+        'daily': daily,
+        'funnel': funnel,
+        'time_to_status': time_to_status,
+        'updated_at': RollupWatermark.objects.filter(name=FUNNEL_WATERMARK).values_list('updated_at', flat=True).first(),
+    }
+    logger.info(f"User {user.id} viewed {days}-day funnel analytics for job {job_id}")
+    return render(request, 'employer/job_analytics.html', context)
+
+
+@login_required
+@role_required('employer', 'admin') # Allow admin access too
+def download_resumes_view(request, job_id):
+    """
+    Download the resumes of all applicants to a job as one ZIP archive.
+
+    The archive is built while it is sent (see utils.zipstream), so memory use
+    does not grow with the number of applicants. Honours the same ?q= keyword
+    filter as the applications list.
+    """
+    user = request.user
+    job = get_object_or_404(Job.objects.only('id', 'title', 'poster_id'), pk=job_id)
+
+    # Security Check: Ensure user is admin or owns the job
+    if user.role == 'employer' and job.poster_id != user.id:
+        logger.warning(f"Unauthorized resume download attempt: Employer {user.id} for job {job_id} posted by user {job.poster_id}")
+        messages.error(request, 'You do not have permission to download these resumes.')
+        return redirect('employer:my_jobs')
+
+    search_query = request.GET.get('q', '').strip()
+    applications = _filter_by_resume_keywords(
+        job.applications.filter(applicant__deleted_at__isnull=True).exclude(resume_path__isnull=True)
+        .exclude(resume_path=''), search_query)
+    rows = applications.order_by('application_date').values_list(
+        'id', 'applicant__username', 'resume_path', 'resume_blob__storage_key')
+
+    resumes = []
+    for application_id, username, resume_path, storage_key in rows:
+        extension = os.path.splitext(resume_path)[1].lower()
+        # Unique, readable entry names: '<username>_<application id>.pdf'
+        resumes.append((get_valid_filename(f'{username}_{application_id}{extension}'), storage_key or resume_path))
+    logger.info(f"User {user.id} downloading {len(resumes)} resumes for job {job_id} (keywords: '{search_query}')")
+
+    response = StreamingHttpResponse(iter_resume_archive(resumes), content_type='application/zip')
+    response['Content-Disposition'] = content_disposition_header(
+        True, get_valid_filename(f'{job.title}_resumes.zip') or 'resumes.zip')
+    return response
+
+
 @login_required
 @role_required('employer', 'admin') # Allow admin access too
 @transaction.atomic # Ensure deletion is all or nothing
@@ -166,10 +417,10 @@ def delete_job_view(request, job_id):
     try:
         job_title = job.title # Get info before deleting
         job_company = job.company
-        # Deletion cascades due to on_delete=models.CASCADE on Application.job
-        job.delete()
-        logger.info(f"Job {job_id} ('{job_title}' at '{job_company}') and associated applications deleted successfully by user {user.id}")
-        messages.success(request, f'Job "{job_title}" and its applications deleted successfully!')
+        # Hide now; purge_deleted removes the job and its applications in bounded chunks
+        job.mark_deleted()
+        logger.info(f"Job {job_id} ('{job_title}' at '{job_company}') marked for deletion by user {user.id}")
+        messages.success(request, f'Job "{job_title}" deleted successfully! Its applications will be removed shortly.')
     except Exception as e:
         logger.error(f"Error deleting job {job_id} by user {user.id}: {str(e)}")
         messages.error(request, f'An error occurred while deleting the job.')
@@ -194,7 +445,7 @@ def update_application_status_view(request, application_id):
         raise Http404("Method not allowed")
 
     logger.info(f"Attempting to update status for application {application_id} by user {user.id} (Role: {user.role})")
-    application = get_object_or_404(Application.objects.select_related('job'), pk=application_id)
+    application = get_object_or_404(Application.objects.live().select_related('job'), pk=application_id)
     job = application.job
 
     # Security Check
@@ -211,8 +462,7 @@ def update_application_status_view(request, application_id):
         previous_status = application.status
         logger.info(f"Updating application {application_id} status from '{previous_status}' to '{new_status}' by user {user.id}")
         try:
-            application.status = new_status
-            application.save()
+            application.set_status(new_status, changed_by=user)
             logger.info(f"Application {application_id} status updated successfully to '{new_status}'")
             messages.success(request, f'Application status updated to {application.get_status_display()}.')
         except Exception as e:
@@ -228,3 +478,82 @@ def update_application_status_view(request, application_id):
     else: # Admin
         return redirect('portal_admin:admin_applications')
 
+
+@login_required
+@role_required('employer', 'admin')
+def bulk_update_application_status_view(request):
+    """
+    Move a list of applications to the same status. Handles POST requests only.
+
+    Ownership of every id is checked with a single query that also locks the
+    rows, and the change is applied to exactly those rows with a single
+    UPDATE; if any id is unknown or belongs to another employer's job nothing
+    is changed.
+    """
+    user = request.user
+    if request.method != 'POST':
+        logger.warning(f"Invalid method {request.method} used for bulk_update_application_status_view")
+        raise Http404("Method not allowed")
+
+    form = BulkApplicationStatusForm(request.POST)
+    if not form.is_valid():
+        logger.warning(f"Invalid bulk status update by user {user.id}: {form.errors}")
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return _bulk_update_redirect(user, job_ids=set())
+
+    application_ids = form.cleaned_data['application_ids']
+    new_status = form.cleaned_data['status']
+    logger.info(f"User {user.id} (Role: {user.role}) updating {len(application_ids)} applications to '{new_status}'")
+
+    status_display = dict(Application.STATUS_CHOICES)[new_status]
+    job_ids = set()
+    try:
+        with transaction.atomic():
+            # Security Check: one query for all ids. The rows are locked (in pk order, so
+            # concurrent bulk updates cannot deadlock) until the events and counters below
+            # are written, so a concurrent set_status() cannot move them in between
+            rows = list(Application.objects.live().filter(pk__in=application_ids).select_for_update(of=('self',)).order_by(
+                'pk').values('id', 'job_id', 'job__poster_id', 'status', 'job__title', 'applicant__username',
+                             'applicant__email'))
+            job_ids = {row['job_id'] for row in rows}
+            found_ids = {row['id'] for row in rows}
+            if user.role == 'employer':
+                found_ids = {row['id'] for row in rows if row['job__poster_id'] == user.id}
+            # Admins allowed
+            if len(found_ids) != len(application_ids):
+                logger.warning(f"Unauthorized bulk status update attempt: User {user.id} submitted {len(application_ids) - len(found_ids)} applications they cannot update")
+                messages.error(request, 'You do not have permission to update some of the selected applications.')
+                return _bulk_update_redirect(user, job_ids)
+
+            changed = [row for row in rows if row['status'] != new_status]
+            updated = Application.objects.filter(pk__in=[row['id'] for row in changed]).update(status=new_status)
+            # The queryset update bypasses Application.set_status; move the status counters,
+            # record the transitions and queue the applicants' emails with one INSERT each
+            moved = Counter({status_counter(new_status): len(changed)})
+            moved.subtract(status_counter(row['status']) for row in changed)
+            adjust_counters(moved)
+            moved_per_job = Counter()
+            for row in changed:
+                moved_per_job[(row['job_id'], new_status)] += 1
+                moved_per_job[(row['job_id'], row['status'])] -= 1
+            adjust_job_counters(moved_per_job)
+            ApplicationStatusEvent.objects.bulk_create([
+                ApplicationStatusEvent(application_id=row['id'], job_id=row['job_id'], from_status=row['status'],
+                                       to_status=new_status, changed_by=user)
+                for row in changed
+            ])
+            record_activity(APPLICATIONS, [(timezone.now(), new_status)] * len(changed))
+            queue_notifications([
+                status_change_email(row['job__title'], row['applicant__email'], row['applicant__username'], status_display)
+                for row in changed
+            ])
+        logger.info(f"Bulk status update by user {user.id}: {updated} of {len(application_ids)} applications moved to '{new_status}'")
+        messages.success(request, f'{updated} application(s) updated to {status_display}.')
+    except Exception as e:
+        logger.error(f"Failed bulk status update by user {user.id}: {str(e)}")
+        messages.error(request, 'Failed to update application status.')
+
+    return _bulk_update_redirect(user, job_ids)
+
@@ -165,7 +165,7 @@ class JobApplicationTests(JobSeekerTestCase):
         # Create a simple resume file for testing
         resume = SimpleUploadedFile(
             "resume.pdf", 
-            b"file content", 
+            b"%PDF-1.4 file content", 
             content_type="application/pdf"
         )
         
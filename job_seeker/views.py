@@ -21,8 +21,9 @@ def my_applications_view(request):
     user = request.user
     logger.info(f"Job seeker {user.id} accessing their job applications ('my_applications')")
     # Filter applications by the current user, prefetch related job details
+    # Jobs awaiting purge_deleted are hidden
     applications = Application.objects.filter(
-        applicant=user
+        applicant=user, job__deleted_at__isnull=True
     ).select_related('job').order_by('-application_date')
 
     logger.info(f"Found {applications.count()} applications for job seeker {user.id}")
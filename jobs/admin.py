@@ -1,3 +1,65 @@
 from django.contrib import admin
 
-# Register your models here.
+from utils.admin import LargeTableAdminMixin, SoftDeleteAdminMixin
+from .models import Job, Application
+
+
+@admin.register(Job)
+class JobAdmin(SoftDeleteAdminMixin, LargeTableAdminMixin, admin.ModelAdmin):
+    """Django admin for jobs, including those awaiting purge_deleted."""
+    list_display = ('id', 'title', 'company', 'location', 'category', 'poster', 'posted_date', 'deleted_at')
+    list_select_related = ('poster',)
+    list_only = ('id', 'title', 'company', 'location', 'category', 'posted_date', 'deleted_at',
+                 'poster__id', 'poster__username', 'poster__role')
+    list_filter = (('deleted_at', admin.EmptyFieldListFilter),)
+    # Prefix searches on the lower_key() indexes (see LargeTableAdminMixin)
+    search_fields = ('title', 'company')
+    # Served by job_posted_idx
+    sortable_by = ('id', 'posted_date')
+    raw_id_fields = ('poster',)
+    # Set by mark_deleted(), which also adjusts the counters
+    readonly_fields = ('deleted_at',)
+
+    def get_queryset(self, request):
+        # all_objects: no implicit deleted_at filter, so the unfiltered list can use the row estimate
+        queryset = Job.all_objects.all()
+        ordering = self.get_ordering(request)
+        return queryset.order_by(*ordering) if ordering else queryset
+
+
+@admin.register(Application)
+class ApplicationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Django admin for applications, including those of jobs and users awaiting purge_deleted."""
+    list_display = ('id', 'applicant', 'job', 'status', 'application_date')
+    list_select_related = ('applicant', 'job')
+    list_only = ('id', 'status', 'application_date', 'applicant__id', 'applicant__username', 'applicant__role',
+                 'job__id', 'job__title', 'job__company')
+    list_filter = ('status',)
+    # Prefix searches (see LargeTableAdminMixin), through joins to the users and jobs
+    search_fields = ('applicant__username', 'job__title')
+    # Served by application_date_idx
+    sortable_by = ('id', 'application_date')
+    raw_id_fields = ('job', 'applicant', 'resume_blob')
+
+    def get_queryset(self, request):
+        # all_objects: every application, including those awaiting purge_deleted
+        queryset = Application.all_objects.all()
+        ordering = self.get_ordering(request)
+        return queryset.order_by(*ordering) if ordering else queryset
+
+    def get_readonly_fields(self, request, obj=None):
+        # Moving an application to another job or applicant would bypass the counters
+        # and the funnel events; status changes go through save_model below
+        if obj is not None:
+            return ('job', 'applicant') + tuple(self.readonly_fields)
+        return self.readonly_fields
+
+    def save_model(self, request, obj, form, change):
+        """Route status changes through set_status() so they are recorded and notified."""
+        if change and 'status' in form.changed_data:
+            new_status = obj.status
+            obj.status = form.initial['status']
+            super().save_model(request, obj, form, change)
+            obj.set_status(new_status, changed_by=request.user)
+        else:
+            super().save_model(request, obj, form, change)
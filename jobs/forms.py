@@ -1,6 +1,14 @@
 # jobs/forms.py
 from django import forms
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.template.defaultfilters import filesizeformat
+
+from .models import Job
+from utils.utils import ALLOWED_RESUME_EXTENSIONS, has_allowed_signature
+
+# Upper bound on jobs per bulk application, keeps the single transaction short
+MAX_BULK_APPLY_JOBS = 50
 
 class ApplicationForm(forms.Form):
     """
@@ -10,19 +18,51 @@ class ApplicationForm(forms.Form):
     resume = forms.FileField(
         label='Upload Resume',
         help_text="PDF, DOC, or DOCX only.",
+        required=False, # Large files may arrive through a chunked upload instead
         widget=forms.FileInput(attrs={'class': 'form-control'}) # Add Bootstrap class
     )
+    # Id of a completed ChunkedUpload (set by static/js/chunked-upload.js)
+    upload_id = forms.UUIDField(required=False, widget=forms.HiddenInput())
 
     def clean_resume(self):
-        """Validate resume file type."""
+        """Validate resume file type, content signature and size."""
         resume = self.cleaned_data.get('resume', False)
         if resume:
+            # Already refused by ValidatingUploadHandler while streaming in
+            if getattr(resume, 'rejection_reason', None):
+                raise ValidationError(resume.rejection_reason, code='upload_rejected')
             allowed_extensions = ['pdf', 'doc', 'docx']
             extension = resume.name.split('.')[-1].lower()
             if extension not in allowed_extensions:
                 raise ValidationError("Invalid file type. PDF, DOC, or DOCX only!", code='invalid_resume_type')
-            # Optional: Add file size validation
-            # if resume.size > MAX_RESUME_SIZE:
-            #     raise ValidationError(f"File size cannot exceed {MAX_RESUME_SIZE} bytes.")
+            if resume.size > settings.RESUME_MAX_UPLOAD_SIZE:
+                raise ValidationError(f"File size cannot exceed {filesizeformat(settings.RESUME_MAX_UPLOAD_SIZE)}.", code='file_too_large')
+            if not has_allowed_signature(resume, ALLOWED_RESUME_EXTENSIONS):
+                raise ValidationError("File content does not match a PDF, DOC, or DOCX document.", code='invalid_resume_content')
         return resume
 
+    def clean(self):
+        """Require either a directly uploaded resume or a completed chunked upload."""
+        cleaned_data = super().clean()
+        if not cleaned_data.get('resume') and not cleaned_data.get('upload_id') and not self.errors:
+            raise ValidationError("Please upload your resume.", code='resume_required')
+        return cleaned_data
+
+
+class BulkApplicationForm(ApplicationForm):
+    """
+    Form for applying to several jobs at once with one resume.
+    """
+    job_ids = forms.ModelMultipleChoiceField(
+        queryset=Job.objects.all(),
+        error_messages={'required': 'Please select at least one job.'},
+        widget=forms.MultipleHiddenInput()
+    )
+
+    def clean_job_ids(self):
+        """Limit the number of jobs per submission."""
+        jobs = self.cleaned_data['job_ids']
+        if len(jobs) > MAX_BULK_APPLY_JOBS:
+            raise ValidationError(f"You can apply to at most {MAX_BULK_APPLY_JOBS} jobs at once.", code='too_many_jobs')
+        return jobs
+
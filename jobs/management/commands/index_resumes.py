@@ -0,0 +1,101 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+import time
+import logging
+
+from jobs.models import Application, ResumeText, ResumeToken
+from utils.utils import get_resume_file, release_resume_file
+from utils.text_extraction import extract_text, normalize_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Extract text from newly uploaded resumes and build the keyword index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Resumes fetched per query')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after processing this many resumes')
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry resumes that failed before')
+        parser.add_argument('--backfill', action='store_true', help='Queue applications uploaded before indexing existed')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new resumes')
+        parser.add_argument('--interval', type=int, default=30, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            missing = Application.objects.exclude(resume_path__isnull=True).exclude(resume_path='').filter(
+                resume_text__isnull=True).values_list('pk', flat=True)
+            queued = ResumeText.objects.bulk_create(
+                [ResumeText(application_id=pk) for pk in missing.iterator()], batch_size=500, ignore_conflicts=True)
+            self.stdout.write(f'Queued {len(queued)} existing resume(s)')
+        if options['retry_failed']:
+            requeued = ResumeText.objects.filter(status='failed').update(status='pending')
+            self.stdout.write(f'Re-queued {requeued} failed resume(s)')
+
+        processed = 0
+        while True:
+            batch = list(
+                ResumeText.objects.filter(status='pending')
+                .select_related('application__resume_blob')
+                .order_by('application_id')[:options['batch_size']]
+            )
+            for entry in batch:
+                # Each entry leaves 'pending' (done or failed), so batches always advance
+                self.index_resume(entry)
+                processed += 1
+                if options['limit'] and processed >= options['limit']:
+                    break
+
+            if options['limit'] and processed >= options['limit']:
+                break
+            if len(batch) < options['batch_size']:
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {processed} resume(s)'))
+
+    def index_resume(self, entry):
+        """Extract (or reuse) the text of one resume and replace its tokens."""
+        application = entry.application
+        try:
+            text = tokens = None
+            if application.resume_blob_id:
+                # Identical content was already extracted for another application
+                source = ResumeText.objects.filter(
+                    application__resume_blob_id=application.resume_blob_id, status='done'
+                ).exclude(pk=entry.pk).first()
+                if source:
+                    text = source.text
+                    tokens = set(ResumeToken.objects.filter(application_id=source.pk).values_list('token', flat=True))
+
+            if text is None:
+                local_path, found = get_resume_file(application.resume_storage_suffix)
+                if not found:
+                    raise FileNotFoundError(f"Resume file for application {application.id} is not available")
+                try:
+                    text = normalize_text(extract_text(local_path))
+                finally:
+                    release_resume_file(local_path)
+                tokens = tokenize(text)
+
+            with transaction.atomic():
+                ResumeToken.objects.filter(application=application).delete()
+                ResumeToken.objects.bulk_create(
+                    [ResumeToken(application=application, token=token) for token in tokens],
+                    batch_size=500,
+                )
+                entry.text = text
+                entry.status = 'done'
+                entry.error = ''
+                entry.extracted_at = timezone.now()
+                entry.save()
+            logger.info(f"Indexed resume of application {application.id}: {len(tokens)} tokens")
+
+        except Exception as e:
+            logger.error(f"Failed to index resume of application {application.id}: {str(e)}")
+            entry.status = 'failed'
+            entry.error = str(e)[:255]
+            entry.extracted_at = timezone.now()
+            entry.save(update_fields=['status', 'error', 'extracted_at'])
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_initial'),
+        ('utils', '0002_resumeblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='resume_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='applications', to='utils.resumeblob'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_application_resume_blob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resume_text', serialize=False, to='jobs.application')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20)),
+                ('text', models.TextField(blank=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('extracted_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Resume Text',
+                'verbose_name_plural': 'Resume Texts',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumeToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=50)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_tokens', to='jobs.application')),
+            ],
+            options={
+                'verbose_name': 'Resume Token',
+                'verbose_name_plural': 'Resume Tokens',
+                'indexes': [models.Index(fields=['token', 'application'], name='resume_token_lookup_idx')],
+                'constraints': [models.UniqueConstraint(fields=('application', 'token'), name='uq_resume_token_application')],
+            },
+        ),
+    ]
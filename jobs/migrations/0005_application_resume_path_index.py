@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_resumetext_resumetoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='resume_path',
+            field=models.FileField(blank=True, db_index=True, null=True, upload_to='resumes/'),
+        ),
+    ]
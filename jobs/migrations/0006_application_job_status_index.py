@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_application_resume_path_index'),
+        ('utils', '0002_resumeblob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', 'application_date'], name='application_job_status_idx'),
+        ),
+    ]
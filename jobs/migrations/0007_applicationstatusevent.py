@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_application_job_status_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('applied', 'Applied'), ('pending', 'Pending Review'), ('reviewed', 'Reviewed'), ('rejected', 'Rejected'), ('shortlisted', 'Shortlisted'), ('hired', 'Hired')], max_length=20)),
+                ('to_status', models.CharField(choices=[('applied', 'Applied'), ('pending', 'Pending Review'), ('reviewed', 'Reviewed'), ('rejected', 'Rejected'), ('shortlisted', 'Shortlisted'), ('hired', 'Hired')], max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='jobs.application')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Application Status Event',
+                'verbose_name_plural': 'Application Status Events',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_applicationstatusevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='job',
+            name='uq_job_title_company_poster_location',
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('title', 'company', 'poster', 'location'), name='uq_job_title_company_poster_location'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_rolled_up(apps, schema_editor):
+    """Flag the events the funnel watermark has already passed, so they are not counted again."""
+    ApplicationStatusEvent = apps.get_model('jobs', 'ApplicationStatusEvent')
+    RollupWatermark = apps.get_model('utils', 'RollupWatermark')
+    position = RollupWatermark.objects.filter(name='employer.funnel').values_list('position', flat=True).first()
+    if position:
+        ApplicationStatusEvent.objects.filter(pk__lte=position).update(rolled_up=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_application_keyset_indexes'),
+        ('utils', '0007_jobstatuscounter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationstatusevent',
+            name='rolled_up',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_rolled_up, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='applicationstatusevent',
+            index=models.Index(condition=models.Q(('rolled_up', False)), fields=['id'], name='status_event_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:01
+
+import django.db.models.functions.text
+import utils.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_applicationstatusevent_rolled_up'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_title_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_company_lower_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(utils.search.CodePointOrder(django.db.models.functions.text.Lower('title')), models.F('id'), name='job_title_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(utils.search.CodePointOrder(django.db.models.functions.text.Lower('company')), models.F('id'), name='job_company_lower_idx'),
+        ),
+    ]
@@ -1,7 +1,32 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.conf import settings
 
+from utils.counters import (
+    JOBS, adjust_counters, adjust_job_counters, application_changes, read_job_counters, status_counter)
+from utils.search import lower_key
+
+
+class JobManager(models.Manager):
+    """Default manager for jobs: hides jobs marked for deletion."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class ApplicationQuerySet(models.QuerySet):
+
+    def live(self):
+        """
+        Applications of live jobs and users only.
+
+        Not applied by default: it joins both tables, and most lookups start from
+        a live job or user already. Use it where applications awaiting
+        purge_deleted would otherwise show (lists, exports, counts).
+        """
+        return self.filter(job__deleted_at__isnull=True, applicant__deleted_at__isnull=True)
+
+
 class Job(models.Model):
     """
     Job model representing job listings posted by employers (Django ORM version).
@@ -17,6 +42,8 @@ class Job(models.Model):
         company_logo (ImageField): Path to company logo
         posted_date (DateTimeField): When the job was posted
         poster (ForeignKey): Reference to the employer (User) who posted the job
+        deleted_at (DateTimeField): When the job was marked for deletion (None while live);
+            the purge_deleted command removes it and its applications later
         # applications: Reverse relation accessed via Application.job or job.applications (if related_name is set)
     """
     title = models.CharField(max_length=100)
@@ -35,13 +62,33 @@ class Job(models.Model):
     # related_name allows accessing jobs from user object like user.jobs_posted
     poster = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='jobs_posted', db_index=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    # Live jobs only; all_objects includes those awaiting purge_deleted
+    objects = JobManager()
+    all_objects = models.Manager()
+
+    def mark_deleted(self):
+        """
+        Hide the job right away and leave removing it (and its applications)
+        to the purge_deleted command, which deletes in bounded chunks.
+        """
+        with transaction.atomic():
+            # Counted before hiding: the default managers stop returning these rows
+            statuses = dict(self.applications.filter(applicant__deleted_at__isnull=True).order_by()
+                            .values_list('status').annotate(total=models.Count('pk')))
+            self.deleted_at = timezone.now()
+            if Job.all_objects.filter(pk=self.pk, deleted_at__isnull=True).update(deleted_at=self.deleted_at):
+                changes = application_changes(statuses, sign=-1)
+                changes[JOBS] -= 1
+                adjust_counters(changes)
 
     # Property to easily get application count
     @property
     def application_count(self):
-        # Access related applications via the related_name set in Application model
-        # Use Django's efficient count() method
-        return self.applications.count()
+        # Applications of live applicants, read from the job's status counters
+        # rather than counted from the applications table
+        return sum(read_job_counters(self.pk).values())
 
     def __str__(self):
         """String representation of the Job object."""
@@ -50,9 +97,17 @@ class Job(models.Model):
     class Meta:
         # Equivalent to SQLAlchemy's UniqueConstraint
         constraints = [
+            # Live jobs only, so a deleted job can be posted again before it is purged
             models.UniqueConstraint(fields=['title', 'company', 'poster', 'location'],
+                                    condition=models.Q(deleted_at__isnull=True),
                                     name='uq_job_title_company_poster_location')
         ]
+        indexes = [
+            # Serve the admin job list: prefix search and sorting by title or company, newest first
+            models.Index(lower_key('title'), 'id', name='job_title_lower_idx'),
+            models.Index(lower_key('company'), 'id', name='job_company_lower_idx'),
+            models.Index(fields=['posted_date', 'id'], name='job_posted_idx'),
+        ]
         # Order jobs by posted date descending by default in queries (optional)
         ordering = ['-posted_date']
         verbose_name = "Job"
@@ -69,7 +124,10 @@ class Application(models.Model):
         applicant (ForeignKey): Reference to the user applying for the job
         application_date (DateTimeField): When the application was submitted
         status (CharField): Current status of the application
-        resume_path (FileField): Path to the uploaded resume file
+        resume_path (FileField): Path to the uploaded resume file. For content-addressed
+            uploads this is the per-applicant name 'user_id/<digest prefix>/filename'
+            and the stored object is resume_blob.storage_key.
+        resume_blob (ForeignKey): Deduplicated stored resume (None for legacy uploads)
     """
     STATUS_CHOICES = [
         ('applied', 'Applied'),
@@ -90,7 +148,51 @@ class Application(models.Model):
     status = models.CharField(
         max_length=20, choices=STATUS_CHOICES, default='applied', db_index=True)
     # Use FileField for general file uploads like resumes
-    resume_path = models.FileField(upload_to='resumes/', null=True, blank=True)
+    # Indexed: resume downloads are authorized by looking up this path
+    resume_path = models.FileField(upload_to='resumes/', null=True, blank=True, db_index=True)
+    # Shared content-addressed copy of the resume; ref_count is kept in step by jobs.signals
+    resume_blob = models.ForeignKey(
+        'utils.ResumeBlob', on_delete=models.PROTECT, null=True, blank=True, related_name='applications')
+
+    # Includes applications awaiting purge_deleted; see ApplicationQuerySet.live()
+    objects = ApplicationQuerySet.as_manager()
+    all_objects = models.Manager()
+
+    @property
+    def resume_storage_suffix(self):
+        """Path of the stored resume below 'resumes/' (local) or 'media/resumes/' (S3)."""
+        if self.resume_blob_id:
+            return self.resume_blob.storage_key
+        return str(self.resume_path) if self.resume_path else None
+
+    def set_status(self, new_status, changed_by=None):
+        """
+        Change the status, record the transition for the hiring-funnel analytics
+        and notify the applicant by email.
+
+        Args:
+            new_status (str): One of STATUS_CHOICES
+            changed_by (User): The employer or admin making the change
+
+        Returns:
+            bool: False if the application already had this status (nothing is written).
+        """
+        previous_status = self.status
+        if previous_status == new_status:
+            return False
+        with transaction.atomic():
+            self.status = new_status
+            self.save(update_fields=['status'])
+            adjust_counters({status_counter(previous_status): -1, status_counter(new_status): 1})
+            adjust_job_counters({(self.job_id, previous_status): -1, (self.job_id, new_status): 1})
+            ApplicationStatusEvent.objects.create(
+                application=self, job_id=self.job_id, from_status=previous_status,
+                to_status=new_status, changed_by=changed_by)
+            # Imported lazily: the notifications module imports utils models
+            from .notifications import queue_notifications, status_change_email
+            queue_notifications([status_change_email(
+                self.job.title, self.applicant.email, self.applicant.username, self.get_status_display())])
+        return True
 
     def __str__(self):
         """String representation of the Application object."""
@@ -102,8 +204,124 @@ class Application(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['job', 'applicant'], name='_job_applicant_uc')
         ]
+        indexes = [
+            # Serve the employer's applicant list: filter by job (and status), page by date with the id tie-break
+            models.Index(fields=['job', 'status', 'application_date', 'id'], name='application_job_status_idx'),
+            models.Index(fields=['job', 'application_date', 'id'], name='application_job_date_idx'),
+            # Serve the admin application list across all jobs, optionally filtered by status
+            models.Index(fields=['application_date', 'id'], name='application_date_idx'),
+            models.Index(fields=['status', 'application_date', 'id'], name='application_status_date_idx'),
+        ]
         # Order applications by date descending by default (optional)
         ordering = ['-application_date']
         verbose_name = "Application"
         verbose_name_plural = "Applications"
 
+
+class ApplicationStatusEvent(models.Model):
+    """
+    One status transition of an application, appended on every change.
+
+    Submitting an application records an event with an empty from_status.
+    The rows are the input of the employer funnel rollup (see the
+    rollup_funnel command); job is copied from the application so the
+    rollup can group without joining.
+
+    Attributes:
+        application (ForeignKey): The application whose status changed
+        job (ForeignKey): The job applied for
+        from_status (CharField): Status before the change ('' on submission)
+        to_status (CharField): Status after the change
+        changed_by (ForeignKey): User who made the change (None for submissions and deleted users)
+        created_at (DateTimeField): When the change happened
+        rolled_up (BooleanField): Whether rollup_funnel has counted the event
+    """
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_events')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='status_events')
+    from_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now)
+    # Set per event rather than implied by a watermark: ids are assigned at insert, so
+    # a long transaction can commit an event below ids that were already rolled up
+    rolled_up = models.BooleanField(default=False)
+
+    def __str__(self):
+        """String representation of the ApplicationStatusEvent object."""
+        return f'Application {self.application_id}: {self.from_status or "-"} -> {self.to_status}'
+
+    class Meta:
+        indexes = [
+            # Serves rollup_funnel's scan for events it has not counted yet
+            models.Index(fields=['id'], condition=models.Q(rolled_up=False), name='status_event_pending_idx'),
+        ]
+        ordering = ['id']
+        verbose_name = "Application Status Event"
+        verbose_name_plural = "Application Status Events"
+
+
+
+class ResumeText(models.Model):
+    """
+    Extracted and normalized text of an application's resume.
+
+    Rows are queued as 'pending' when an application with a resume is created
+    and filled in by the index_resumes management command, so employers can
+    filter applicants by keyword without touching file storage.
+
+    Attributes:
+        application (OneToOneField): The application whose resume was processed
+        status (CharField): pending, done or failed
+        text (TextField): Normalized plain text of the resume
+        error (CharField): Reason for a failed extraction
+        extracted_at (DateTimeField): When extraction finished
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    application = models.OneToOneField(
+        Application, on_delete=models.CASCADE, primary_key=True, related_name='resume_text')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    text = models.TextField(blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        """String representation of the ResumeText object."""
+        return f'Resume text for application {self.application_id} ({self.status})'
+
+    class Meta:
+        verbose_name = "Resume Text"
+        verbose_name_plural = "Resume Texts"
+
+
+class ResumeToken(models.Model):
+    """
+    One distinct keyword found in an application's resume (inverted index entry).
+
+    Attributes:
+        application (ForeignKey): The application whose resume contains the token
+        token (CharField): Normalized keyword
+    """
+    application = models.ForeignKey(
+        Application, on_delete=models.CASCADE, related_name='resume_tokens')
+    token = models.CharField(max_length=50)
+
+    def __str__(self):
+        """String representation of the ResumeToken object."""
+        return f'{self.token} (application {self.application_id})'
+
+    class Meta:
+        constraints = [
+            # Also serves the per-application EXISTS probes of the keyword filter
+            models.UniqueConstraint(fields=['application', 'token'], name='uq_resume_token_application')
+        ]
+        indexes = [
+            models.Index(fields=['token', 'application'], name='resume_token_lookup_idx'),
+        ]
+        verbose_name = "Resume Token"
+        verbose_name_plural = "Resume Tokens"
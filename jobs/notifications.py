@@ -0,0 +1,49 @@
+# jobs/notifications.py
+
+"""
+Application notification emails, queued in the outbox (see utils.outbox).
+
+The builders return unsaved OutboxEmail rows (or None when the recipient has
+no address) so that bulk code paths can insert all of them at once;
+queue_notifications() saves them. Call it inside the transaction that makes
+the change, so the email is only sent if the change is committed.
+"""
+
+from utils.models import OutboxEmail
+
+
+def new_application_email(job_title, poster_email, applicant_username):
+    """Tell the employer that someone applied to their job."""
+    if not poster_email:
+        return None
+    return OutboxEmail(
+        subject=f"New application for {job_title}"[:255],
+        body=(
+            f"{applicant_username} has applied to your job posting \"{job_title}\".\n\n"
+            f"Sign in to the Job Portal to review the application."
+        ),
+        to=[poster_email],
+    )
+
+
+def status_change_email(job_title, applicant_email, applicant_username, status_display):
+    """Tell the job seeker that the status of their application changed."""
+    if not applicant_email:
+        return None
+    return OutboxEmail(
+        subject=f"Your application for {job_title}: {status_display}"[:255],
+        body=(
+            f"Hello {applicant_username},\n\n"
+            f"The status of your application for \"{job_title}\" is now: {status_display}.\n\n"
+            f"Sign in to the Job Portal to see all your applications."
+        ),
+        to=[applicant_email],
+    )
+
+
+def queue_notifications(emails):
+    """Save the given notification emails (None entries are skipped) with one INSERT."""
+    emails = [email for email in emails if email is not None]
+    if emails:
+        OutboxEmail.objects.bulk_create(emails)
+    return len(emails)
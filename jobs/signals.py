@@ -0,0 +1,41 @@
+# jobs/signals.py
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+import logging
+
+from .models import Application, ApplicationStatusEvent, ResumeText
+from utils.models import ResumeBlob
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Application)
+def increment_resume_blob_refs(sender, instance, created, **kwargs):
+    """Count a new application against the resume blob it references."""
+    if created and instance.resume_blob_id:
+        ResumeBlob.objects.filter(pk=instance.resume_blob_id).update(ref_count=F('ref_count') + 1)
+
+
+@receiver(post_save, sender=Application)
+def queue_resume_text_extraction(sender, instance, created, **kwargs):
+    """Queue a new application's resume for the index_resumes worker."""
+    if created and instance.resume_path:
+        ResumeText.objects.get_or_create(application=instance)
+
+
+@receiver(post_save, sender=Application)
+def record_submission_event(sender, instance, created, **kwargs):
+    """Start a new application's status history for the funnel analytics."""
+    if created:
+        ApplicationStatusEvent.objects.create(
+            application=instance, job_id=instance.job_id, to_status=instance.status,
+            created_at=instance.application_date)
+
+
+@receiver(post_delete, sender=Application)
+def decrement_resume_blob_refs(sender, instance, **kwargs):
+    """Release the resume blob reference of a deleted application."""
+    if instance.resume_blob_id:
+        ResumeBlob.objects.filter(pk=instance.resume_blob_id, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+        logger.debug(f"Released resume blob {instance.resume_blob_id} reference of application {instance.id}")
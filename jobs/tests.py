@@ -4,8 +4,17 @@ from django.contrib.messages import get_messages
 from django.core.files.uploadedfile import SimpleUploadedFile
 from unittest.mock import patch, MagicMock
 
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import io
+import os
+import tempfile
+
 from portal_auth.models import User
-from jobs.models import Job, Application
+from jobs.models import Job, Application, ApplicationStatusEvent, ResumeText, ResumeToken
+from utils.counters import read_counters
+from utils.models import OutboxEmail, ResumeBlob
 
 class JobsTestCase(TestCase):
     """Base test case for jobs tests with common setup"""
@@ -115,6 +124,15 @@ class JobDetailTests(JobsTestCase):
         self.assertTemplateUsed(response, 'jobs/job_detail.html')
         self.assertContains(response, 'TestJob')
     
+    def test_job_detail_count_from_counters(self):
+        """Test that the employer's application count is read without counting applications"""
+        Application.objects.create(job=self.job, applicant=self.job_seeker)
+        self.client.login(username='employer', password='password123')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('jobs:job_detail', kwargs={'job_id': self.job.id}))
+        self.assertContains(response, 'View Applications (1)')
+        self.assertFalse([q for q in queries.captured_queries if 'jobs_application' in q['sql']])
+
     def test_job_detail_page_not_found(self):
         """Test job detail page with non-existent job ID"""
         response = self.client.get(
@@ -143,7 +161,7 @@ class JobApplicationTests(JobsTestCase):
         # Create a simple resume file for testing
         resume = SimpleUploadedFile(
             "resume.pdf", 
-            b"my resume", 
+            b"%PDF-1.4 my resume", 
             content_type="application/pdf"
         )
         
@@ -165,6 +183,9 @@ class JobApplicationTests(JobsTestCase):
             ).exists()
         )
         
+        # Check that the employer notification was queued
+        self.assertEqual(OutboxEmail.objects.get().to, [self.job.poster.email])
+        
         # Check for success message
         messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('submitted' in str(message).lower() for message in messages))
@@ -231,7 +252,7 @@ class JobApplicationTests(JobsTestCase):
         # Create a simple resume file for testing
         resume = SimpleUploadedFile(
             "resume.pdf", 
-            b"my resume", 
+            b"%PDF-1.4 my resume", 
             content_type="application/pdf"
         )
         
@@ -257,6 +278,73 @@ class JobApplicationTests(JobsTestCase):
             ).exists()
         )
 
+    def test_apply_job_post_duplicate_is_rejected_by_constraint(self):
+        """Test that a duplicate POST is caught by the unique constraint"""
+        self.login_as_job_seeker()
+        Application.objects.create(job=self.job, applicant=self.job_seeker, status='applied')
+
+        resume = SimpleUploadedFile("resume.pdf", b"%PDF-1.4 my resume", content_type="application/pdf")
+        response = self.client.post(
+            reverse('jobs:apply_job', kwargs={'job_id': self.job.id}),
+            {'resume': resume},
+            follow=True
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Application.objects.filter(job=self.job, applicant=self.job_seeker).count(), 1)
+        messages = list(get_messages(response.wsgi_request))
+        self.assertTrue(any('already applied' in str(message).lower() for message in messages))
+
+
+class BulkApplicationTests(JobsTestCase):
+    """Tests for applying to several jobs at once"""
+
+    def setUp(self):
+        super().setUp()
+        self.other_job = Job.objects.create(
+            title='Other Job',
+            description='Other Description',
+            location='Other Location',
+            company='Other Company',
+            category='IT',
+            poster=self.employer
+        )
+
+    def test_bulk_apply(self):
+        """Test applying to several jobs, skipping ones already applied to"""
+        self.login_as_job_seeker()
+        Application.objects.create(job=self.job, applicant=self.job_seeker, status='applied')
+
+        resume = SimpleUploadedFile("resume.pdf", b"%PDF-1.4 my resume", content_type="application/pdf")
+        response = self.client.post(
+            reverse('jobs:bulk_apply'),
+            {'resume': resume, 'job_ids': [self.job.id, self.other_job.id]},
+            follow=True
+        )
+
+        self.assertRedirects(response, reverse('job_seeker:my_applications'))
+        self.assertEqual(Application.objects.filter(applicant=self.job_seeker).count(), 2)
+        # One submission event per application, including the bulk-created one
+        self.assertEqual(ApplicationStatusEvent.objects.filter(application__applicant=self.job_seeker).count(), 2)
+        messages = [str(message).lower() for message in get_messages(response.wsgi_request)]
+        self.assertTrue(any('1 job(s)' in message for message in messages))
+        self.assertTrue(any('already applied' in message for message in messages))
+
+    def test_bulk_apply_requires_jobs(self):
+        """Test that a bulk application without selected jobs is rejected"""
+        self.login_as_job_seeker()
+        resume = SimpleUploadedFile("resume.pdf", b"%PDF-1.4 my resume", content_type="application/pdf")
+        response = self.client.post(reverse('jobs:bulk_apply'), {'resume': resume}, follow=True)
+
+        self.assertRedirects(response, reverse('jobs:jobs_list'))
+        self.assertFalse(Application.objects.filter(applicant=self.job_seeker).exists())
+
+    def test_bulk_apply_get_not_allowed(self):
+        """Test that GET requests are rejected"""
+        self.login_as_job_seeker()
+        response = self.client.get(reverse('jobs:bulk_apply'))
+        self.assertEqual(response.status_code, 404)
+
 
 class ModelTests(TestCase):
     """Tests for Django models"""
@@ -321,3 +409,147 @@ class ModelTests(TestCase):
         # Check that application was created
         retrieved_application = Application.objects.get(job=job, applicant=job_seeker)
         self.assertEqual(retrieved_application.status, 'applied')
+
+    def test_live_applications(self):
+        """Test that only live() joins jobs and users to hide those awaiting purge_deleted"""
+        employer = User.objects.create(username='employer3', email='emp3@example.com', role='employer')
+        job = Job.objects.create(title='Ops', description='Ops desc', location='Remote', company='Acme', poster=employer)
+        seeker = User.objects.create(username='seeker3', email='seek3@example.com', role='job_seeker')
+        application = Application.objects.create(job=job, applicant=seeker)
+        job.mark_deleted()
+
+        self.assertNotIn('JOIN', str(Application.objects.filter(pk=application.pk).query))
+        self.assertTrue(Application.objects.filter(pk=application.pk).exists())
+        self.assertFalse(Application.objects.live().filter(pk=application.pk).exists())
+
+
+class ResumeIndexingTests(JobsTestCase):
+    """Tests for the index_resumes worker"""
+
+    def setUp(self):
+        """Create a resume on disk and an application queued for indexing"""
+        super().setUp()
+        handle, self.resume_file = tempfile.mkstemp(suffix='.doc')
+        os.write(handle, 'Python Django developer'.encode('utf-16-le'))
+        os.close(handle)
+        self.blob = ResumeBlob.objects.create(sha256='d' * 64, storage_key='blobs/dd/resume.doc', size=10)
+        self.application = Application.objects.create(
+            job=self.job, applicant=self.job_seeker, resume_path='2/dddddddddddd/resume.doc', resume_blob=self.blob)
+
+    def tearDown(self):
+        """Remove the resume file"""
+        os.remove(self.resume_file)
+
+    def test_application_with_resume_is_queued(self):
+        """Test that creating an application queues its resume"""
+        self.assertEqual(ResumeText.objects.get(application=self.application).status, 'pending')
+
+    def test_index_resumes(self):
+        """Test that pending resumes are extracted and tokenized"""
+        with patch('jobs.management.commands.index_resumes.get_resume_file',
+                   return_value=(self.resume_file, True)) as mock_get:
+            call_command('index_resumes', stdout=io.StringIO())
+
+        mock_get.assert_called_once_with('blobs/dd/resume.doc')
+        entry = ResumeText.objects.get(application=self.application)
+        self.assertEqual(entry.status, 'done')
+        self.assertIn('python django developer', entry.text)
+        tokens = set(ResumeToken.objects.filter(application=self.application).values_list('token', flat=True))
+        self.assertTrue({'python', 'django', 'developer'} <= tokens)
+
+    def test_identical_resume_is_not_extracted_twice(self):
+        """Test that a second application with the same blob reuses the extracted text"""
+        other_job = Job.objects.create(
+            title='OtherJob', description='desc', location='Remote', category='IT',
+            company='TestCo', poster=self.employer)
+        with patch('jobs.management.commands.index_resumes.get_resume_file',
+                   return_value=(self.resume_file, True)) as mock_get:
+            call_command('index_resumes', stdout=io.StringIO())
+            second = Application.objects.create(
+                job=other_job, applicant=self.job_seeker, resume_path='2/dddddddddddd/resume.doc', resume_blob=self.blob)
+            call_command('index_resumes', stdout=io.StringIO())
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(ResumeToken.objects.filter(application=second, token='django').exists())
+
+    def test_missing_file_marks_failed(self):
+        """Test that an unavailable resume is marked failed instead of retried forever"""
+        with patch('jobs.management.commands.index_resumes.get_resume_file', return_value=(None, False)):
+            call_command('index_resumes', stdout=io.StringIO())
+        self.assertEqual(ResumeText.objects.get(application=self.application).status, 'failed')
+
+
+
+class DjangoAdminTests(JobsTestCase):
+    """Tests for the Django admin registrations of users, jobs and applications"""
+
+    def setUp(self):
+        super().setUp()
+        self.superuser = User.objects.create_superuser(
+            username='root', email='root@example.com', password='password123', role='admin')
+        self.application = Application.objects.create(job=self.job, applicant=self.job_seeker)
+        self.client.login(username='root', password='password123')
+
+    def test_changelists_skip_full_counts(self):
+        """Test that the changelists load without an uncapped COUNT(*) of the table"""
+        for name in ('portal_auth_user', 'jobs_job', 'jobs_application'):
+            with self.subTest(name=name), CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse(f'admin:{name}_changelist'))
+                self.assertEqual(response.status_code, 200)
+            counts = [q['sql'] for q in queries.captured_queries if 'COUNT(' in q['sql'].upper()]
+            self.assertTrue(counts)
+            self.assertTrue(all('LIMIT' in sql.upper() for sql in counts), counts)
+
+    def test_application_changelist_lists_deleted_job(self):
+        """Test that applications of jobs awaiting purge are listed, without a query per row"""
+        other_seeker = User.objects.create_user(username='other', email='other@example.com', role='job_seeker')
+        other_application = Application.objects.create(job=self.job, applicant=other_seeker)
+        self.job.mark_deleted()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:jobs_application_changelist'))
+        # Session, user, count and rows
+        self.assertEqual(len(queries.captured_queries), 4)
+        self.assertEqual(list(response.context['cl'].result_list), [other_application, self.application])
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def test_delete_marks_instead_of_collecting(self):
+        """Test that the admin delete view and action mark jobs and users for purge_deleted"""
+        response = self.client.get(reverse('admin:jobs_job_delete', args=[self.job.pk]))
+        self.assertContains(response, str(self.job))
+        response = self.client.post(reverse('admin:jobs_job_delete', args=[self.job.pk]), {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Job.all_objects.filter(pk=self.job.pk, deleted_at__isnull=False).exists())
+        self.assertTrue(Application.objects.filter(pk=self.application.pk).exists())
+
+        response = self.client.post(reverse('admin:portal_auth_user_changelist'), {
+            'action': 'delete_selected', 'post': 'yes', '_selected_action': [self.job_seeker.pk]})
+        self.assertEqual(response.status_code, 302)
+        self.job_seeker.refresh_from_db()
+        self.assertIsNotNone(self.job_seeker.deleted_at)
+        self.assertEqual(read_counters()['applications'], 0)
+
+    def test_admin_search_and_fixed_owners(self):
+        """Test prefix search on the lower-case keys and that an application cannot change jobs"""
+        response = self.client.get(reverse('admin:jobs_job_changelist'), {'q': self.job.title[:4].upper()})
+        self.assertEqual(list(response.context['cl'].result_list), [self.job])
+        response = self.client.get(reverse('admin:jobs_job_changelist'), {'q': self.job.title[1:5]})
+        self.assertEqual(list(response.context['cl'].result_list), [])
+
+        other_job = Job.objects.create(title='Other Job', description='d', location='l', company='c', poster=self.employer)
+        self.client.post(reverse('admin:jobs_application_change', args=[self.application.pk]), {
+            'job': other_job.pk, 'applicant': self.employer.pk, 'application_date_0': '2026-01-05',
+            'application_date_1': '10:00:00', 'status': 'applied'})
+        self.application.refresh_from_db()
+        self.assertEqual((self.application.job_id, self.application.applicant_id), (self.job.pk, self.job_seeker.pk))
+
+    def test_status_change_goes_through_set_status(self):
+        """Test that editing the status in the admin records a status event"""
+        response = self.client.post(reverse('admin:jobs_application_change', args=[self.application.pk]), {
+            'job': self.job.pk, 'applicant': self.job_seeker.pk, 'application_date_0': '2026-01-05',
+            'application_date_1': '10:00:00', 'status': 'shortlisted'})
+        self.assertEqual(response.status_code, 302)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, 'shortlisted')
+        self.assertTrue(ApplicationStatusEvent.objects.filter(
+            application=self.application, from_status='applied', to_status='shortlisted',
+            changed_by=self.superuser).exists())
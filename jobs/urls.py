@@ -10,4 +10,6 @@ urlpatterns = [
     path('search-api/', views.search_jobs_api_view, name='search_jobs_api'),
     path('<int:job_id>/', views.job_detail_view, name='job_detail'),
     path('apply/<int:job_id>/', views.apply_job_view, name='apply_job'),
+    # Apply to several selected jobs with one resume (POST request)
+    path('apply/bulk/', views.bulk_apply_view, name='bulk_apply'),
 ]
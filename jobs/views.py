@@ -1,19 +1,27 @@
 # jobs/views.py
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404
 from django.contrib import messages
 from django.conf import settings # Import Django settings
+from django.db import transaction, IntegrityError
+from django.utils import timezone
 from django.core.files.storage import FileSystemStorage # Keep for potential fallback/alternative
 import os
 import logging # Import logging
 
 # Import models (Job, Application) from the current app
-from .models import Job, Application
+from .models import Job, Application, ApplicationStatusEvent, ResumeText
 # Import forms from the current app
-from .forms import ApplicationForm
+from .forms import ApplicationForm, BulkApplicationForm
+from .notifications import new_application_email, queue_notifications
 # Import decorators from auth app
 from portal_auth.views import login_required, role_required
-from utils.utils import upload_to_s3 # Import S3 upload utility function
+from utils.utils import ( # Import resume storage utility functions
+    store_resume_blob, build_resume_path, open_completed_upload, discard_upload
+)
+from utils.activity import APPLICATIONS, record_activity
+from utils.counters import adjust_counters, adjust_job_counters, application_changes, read_job_counters
+from utils.models import ChunkedUpload, ResumeBlob
 logger = logging.getLogger(__name__) # Setup logger for this module
 # --- Views ---
 
@@ -97,96 +105,138 @@ def job_detail_view(request, job_id):
     logger.info(f"Job detail page accessed for job_id: {job_id}")
     job = get_object_or_404(Job, pk=job_id)
     has_applied = False
-    application_count = None # For admin view
+    application_count = None # For admin and employer views
 
     if request.user.is_authenticated:
         if request.user.role == 'job_seeker':
             # Check if the current user has already applied
             has_applied = Application.objects.filter(job=job, applicant=request.user).exists()
             logger.info(f"User {request.user.id} has {'already applied' if has_applied else 'not applied'} to job {job_id}")
-        elif request.user.role == 'admin':
-            # Use the efficient count() method on the related manager
-            application_count = job.applications.count()
-            logger.info(f"Admin {request.user.id} viewing job {job_id} with {application_count} applications")
+        else:
+            # Kept in the job's status counters (applications of live applicants)
+            application_count = sum(read_job_counters(job.id).values())
+            logger.info(f"User {request.user.id} ({request.user.role}) viewing job {job_id} with {application_count} applications")
 
     context = {
         'job': job,
         'has_applied': has_applied,
-        'application_count': application_count, # Will be None if not admin
+        'application_count': application_count, # Will be None for job seekers and visitors
     }
     return render(request, 'jobs/job_detail.html', context)
 
 
+def _resolve_resume_file(form, user):
+    """
+    Return the resume to store for a valid ApplicationForm.
+
+    Returns:
+        tuple: (resume_file, upload) where upload is the completed ChunkedUpload the
+               file was assembled from (or None for a direct upload). resume_file is
+               None if the form referenced a chunked upload that is missing or incomplete.
+    """
+    resume_file = form.cleaned_data.get('resume')
+    upload_id = form.cleaned_data.get('upload_id')
+    if resume_file or not upload_id:
+        return resume_file, None
+    # Large resumes arrive beforehand through the chunked upload endpoints
+    upload = ChunkedUpload.objects.fresh().filter(pk=upload_id, user=user, status='complete').first()
+    if upload is None:
+        logger.warning(f"User {user.id} referenced missing, incomplete or expired chunked upload {upload_id}")
+        return None, None
+    logger.info(f"Using chunked upload {upload.id} as resume for user {user.id}")
+    return open_completed_upload(upload), upload
+
+
+def _store_resume(request, resume_file, user):
+    """
+    Store a resume (deduplicated, in S3) for one or more applications.
+
+    Returns:
+        tuple: (success, resume_path, resume_blob). On failure an error message
+               has already been added to the request.
+    """
+    # Check config if S3 should be used
+    # Use getattr for safer access to settings
+    enable_s3 = getattr(settings, 'ENABLE_S3_UPLOAD', False)
+    s3_bucket_name = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', None)
+
+    if not enable_s3 or not s3_bucket_name:
+        # S3 not enabled, handle locally (or disallow?)
+        logger.warning(f"Resume provided by user {user.id}, but S3 upload is disabled or bucket not configured. Resume not saved.")
+        return True, None, None
+
+    logger.info(f"Attempting S3 upload of resume for user {user.id}")
+    # Resumes are stored once per distinct content; re-applying
+    # with the same file reuses the existing blob without uploading
+    resume_blob = store_resume_blob(
+        uploaded_file=resume_file,
+        s3_bucket_name=s3_bucket_name
+    )
+    if not resume_blob:
+        logger.error(f"S3 upload failed for user {user.id}")
+        messages.error(request, 'There was an error uploading your resume to cloud storage. Please try again.')
+        return False, None, None
+
+    # Per-applicant name; the stored object is resume_blob.storage_key
+    resume_path = build_resume_path(user.id, resume_blob.sha256, resume_file.name)
+    logger.info(f"S3 upload successful for user {user.id}. DB Path: {resume_path}, blob {resume_blob.id}")
+    return True, resume_path, resume_blob
+
+
 @login_required
 @role_required('job_seeker')
 def apply_job_view(request, job_id):
     """
     Handle job application submissions by job seekers, including S3 resume upload.
     Equivalent to Flask's apply_job route.
+
+    Duplicate submissions are caught by the (job, applicant) unique constraint
+    rather than a pre-check, so concurrent submits cannot both get through.
     """
     job = get_object_or_404(Job, pk=job_id)
     user = request.user
     logger.info(f"Apply job page accessed for job {job_id} by user {user.id}")
 
-    # Check if already applied
-    if Application.objects.filter(job=job, applicant=user).exists():
-        logger.warning(f"User {user.id} attempted to apply again to job {job_id}, redirecting.")
-        messages.warning(request, 'You have already applied to this job.')
-        return redirect('jobs:job_detail', job_id=job.id)
-
     if request.method == 'POST':
         logger.info(f"Application form submitted for job {job_id} by user {user.id}")
         # Pass request.FILES to handle the file upload
         form = ApplicationForm(request.POST, request.FILES)
         if form.is_valid():
-            resume_path_for_db = None # Path to store in DB (without 'resumes/' prefix)
-            s3_upload_successful = True # Assume success if no file or S3 disabled
+            resume_file = upload = None
 
             try:
                 # --- Handle Resume Upload ---
-                resume_file = form.cleaned_data.get('resume')
-                if resume_file:
-                    # Check config if S3 should be used
-                    # Use getattr for safer access to settings
-                    enable_s3 = getattr(settings, 'ENABLE_S3_UPLOAD', False)
-                    s3_bucket_name = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', None)
-
-                    if enable_s3 and s3_bucket_name:
-                        logger.info(f"Attempting S3 upload for application to job {job_id} by user {user.id}")
-                        # Attempt direct upload to S3 using the utility function
-                        # Assumes upload_to_s3 takes Django's UploadedFile, user ID, bucket name
-                        # and returns the full object name like 'resumes/123/file.pdf' or None
-                        s3_object_name = upload_to_s3(
-                            uploaded_file=resume_file,
-                            user_id=user.id,
-                            s3_bucket_name=s3_bucket_name
-                        )
-
-                        if s3_object_name:
-                            # Store S3 path *without* the leading 'media/resumes/' prefix
-                            resume_path_for_db = s3_object_name.removeprefix('media/resumes/')
-                            logger.info(f"S3 upload successful for job {job_id}, user {user.id}. DB Path: {resume_path_for_db}")
-                        else:
-                            # S3 upload failed
-                            s3_upload_successful = False
-                            logger.error(f"S3 upload failed for job {job_id}, user {user.id}")
-                            messages.error(request, 'There was an error uploading your resume to cloud storage. Please try again.')
-                            # Stay on the page if S3 upload fails
-                    else:
-                        # S3 not enabled, handle locally (or disallow?)
-                        logger.warning(f"Resume provided for job {job_id}, user {user.id}, but S3 upload is disabled or bucket not configured. Resume not saved.")
-                        resume_path_for_db = None
+                resume_file, upload = _resolve_resume_file(form, user)
+                if resume_file is None:
+                    messages.error(request, 'Your uploaded resume could not be found. Please upload it again.')
+                    return render(request, 'jobs/apply_job.html', {'form': form, 'job': job})
+
+                stored, resume_path_for_db, resume_blob = _store_resume(request, resume_file, user)
 
                 # --- Create Application Record (only if S3 upload was successful or no resume) ---
-                if s3_upload_successful:
-                    application = Application(
-                        job=job,
-                        applicant=user,
-                        resume_path=resume_path_for_db,
-                        status='applied'
-                    )
-                    application.save()
+                if stored:
+                    try:
+                        # Savepoint, so a duplicate does not poison an enclosing transaction
+                        with transaction.atomic():
+                            application = Application.objects.create(
+                                job=job,
+                                applicant=user,
+                                resume_path=resume_path_for_db,
+                                resume_blob=resume_blob,
+                                status='applied'
+                            )
+                            queue_notifications([new_application_email(job.title, job.poster.email, user.username)])
+                    except IntegrityError:
+                        if not Application.objects.filter(job=job, applicant=user).exists():
+                            raise
+                        logger.warning(f"User {user.id} attempted to apply again to job {job_id}, redirecting.")
+                        messages.warning(request, 'You have already applied to this job.')
+                        return redirect('jobs:job_detail', job_id=job.id)
+
                     logger.info(f"User {user.id} successfully applied to job {job_id}. Application ID: {application.id}. Resume DB path: {resume_path_for_db}")
+                    if upload:
+                        resume_file.close()
+                        discard_upload(upload)
                     messages.success(request, 'Your application has been submitted!')
                     return redirect('job_seeker:my_applications')
 
@@ -195,6 +245,9 @@ def apply_job_view(request, job_id):
                 logger.error(f"Error processing application for job {job_id}, user {user.id}: {str(e)}")
                 messages.error(request, 'An unexpected error occurred while submitting your application.')
                 # Stay on the page
+            finally:
+                if upload and resume_file:
+                    resume_file.close()
 
         else: # Form is not valid
             logger.warning(f"Application form validation failed for job {job_id}, user {user.id}: {form.errors}")
@@ -202,8 +255,105 @@ def apply_job_view(request, job_id):
             # Stay on the page
 
     else: # GET request
+        # Only a convenience redirect; the unique constraint guards the POST
+        if Application.objects.filter(job=job, applicant=user).exists():
+            logger.warning(f"User {user.id} opened the apply page for job {job_id} again, redirecting.")
+            messages.warning(request, 'You have already applied to this job.')
+            return redirect('jobs:job_detail', job_id=job.id)
         form = ApplicationForm()
 
     # Render the template if GET request or if POST request failed validation/upload
     return render(request, 'jobs/apply_job.html', {'form': form, 'job': job})
 
+
+@login_required
+@role_required('job_seeker')
+def bulk_apply_view(request):
+    """
+    Apply to several selected jobs with one resume in a single transaction.
+
+    The resume is stored once; jobs the user already applied to are skipped
+    by the (job, applicant) unique constraint. Handles POST requests only.
+    """
+    user = request.user
+    if request.method != 'POST':
+        logger.warning(f"Invalid method {request.method} used for bulk_apply_view by user {user.id}")
+        raise Http404("Method not allowed")
+
+    form = BulkApplicationForm(request.POST, request.FILES)
+    if not form.is_valid():
+        logger.warning(f"Bulk application form validation failed for user {user.id}: {form.errors}")
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return redirect('jobs:jobs_list')
+
+    jobs = list(form.cleaned_data['job_ids'])
+    logger.info(f"Bulk application submitted by user {user.id} for jobs {[job.id for job in jobs]}")
+    resume_file = upload = None
+    try:
+        resume_file, upload = _resolve_resume_file(form, user)
+        if resume_file is None:
+            messages.error(request, 'Your uploaded resume could not be found. Please upload it again.')
+            return redirect('jobs:jobs_list')
+
+        stored, resume_path_for_db, resume_blob = _store_resume(request, resume_file, user)
+        if not stored:
+            return redirect('jobs:jobs_list')
+
+        # One timestamp for the batch identifies the rows this request inserted,
+        # since ignore_conflicts does not report which rows were skipped
+        submitted_at = timezone.now()
+        with transaction.atomic():
+            Application.objects.bulk_create([
+                Application(
+                    job=job,
+                    applicant=user,
+                    resume_path=resume_path_for_db,
+                    resume_blob=resume_blob,
+                    status='applied',
+                    application_date=submitted_at,
+                ) for job in jobs
+            ], ignore_conflicts=True)
+            created = list(Application.objects.filter(
+                applicant=user, job__in=jobs, application_date=submitted_at
+            ).values_list('id', 'job_id', 'job__title', 'job__poster__email'))
+            created_ids = [row[0] for row in created]
+            # bulk_create bypasses the signals that count blob references, queue indexing
+            # and record the submission event
+            ApplicationStatusEvent.objects.bulk_create([
+                ApplicationStatusEvent(application_id=pk, job_id=job_id, to_status='applied', created_at=submitted_at)
+                for pk, job_id, _, _ in created
+            ])
+            queue_notifications([
+                new_application_email(job_title, poster_email, user.username)
+                for _, _, job_title, poster_email in created
+            ])
+            adjust_counters(application_changes({'applied': len(created_ids)}))
+            adjust_job_counters({(job_id, 'applied'): 1 for _, job_id, _, _ in created})
+            record_activity(APPLICATIONS, [(submitted_at, 'applied')] * len(created_ids))
+            if resume_blob:
+                ResumeBlob.refresh_ref_counts([resume_blob.pk])
+            if resume_path_for_db:
+                ResumeText.objects.bulk_create(
+                    [ResumeText(application_id=pk) for pk in created_ids], ignore_conflicts=True)
+
+        if upload:
+            resume_file.close()
+            discard_upload(upload)
+
+        skipped = len(jobs) - len(created_ids)
+        logger.info(f"User {user.id} bulk applied to {len(created_ids)} jobs ({skipped} already applied)")
+        if created_ids:
+            messages.success(request, f'Your application has been submitted to {len(created_ids)} job(s)!')
+        if skipped:
+            messages.warning(request, f'You had already applied to {skipped} of the selected job(s).')
+        return redirect('job_seeker:my_applications')
+
+    except Exception as e:
+        logger.error(f"Error processing bulk application for user {user.id}: {str(e)}")
+        messages.error(request, 'An unexpected error occurred while submitting your applications.')
+        return redirect('jobs:jobs_list')
+    finally:
+        if upload and resume_file:
+            resume_file.close()
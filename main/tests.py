@@ -1,11 +1,13 @@
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.messages import get_messages
+from django.conf import settings
 from unittest.mock import patch
 
 from jobs.models import Job
 from portal_auth.models import User
 from main.forms import ContactForm
+from utils.models import OutboxEmail
 
 class MainTestCase(TestCase):
     """Base test case for main app tests with common setup"""
@@ -94,12 +96,8 @@ class ContactFormTests(MainTestCase):
         self.assertTemplateUsed(response, 'main/contact.html')
         self.assertIsInstance(response.context['form'], ContactForm)
     
-    @patch('main.views.send_mail')
-    def test_contact_page_post_success(self, mock_send_mail):
+    def test_contact_page_post_success(self):
         """Test successful contact form submission"""
-        # Configure the mock to return True (success)
-        mock_send_mail.return_value = 1
-        
         # Submit the contact form
         data = {
             'name': 'Test User',
@@ -112,18 +110,21 @@ class ContactFormTests(MainTestCase):
         # Check response
         self.assertEqual(response.status_code, 200)
         
-        # Check that send_mail was called
-        mock_send_mail.assert_called_once()
+        # Check that the email was queued in the outbox
+        queued = OutboxEmail.objects.get()
+        self.assertEqual(queued.subject, 'Job Portal Contact: Test Subject')
+        self.assertEqual(queued.to, [settings.CONTACT_EMAIL_RECIPIENT])
+        self.assertEqual(queued.reply_to, ['test@example.com'])
         
         # Check for success message
         messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('sent' in str(message).lower() for message in messages))
     
-    @patch('main.views.send_mail')
-    def test_contact_page_post_failure(self, mock_send_mail):
-        """Test error handling when email sending fails"""
+    @patch('main.views.queue_email')
+    def test_contact_page_post_failure(self, mock_queue_email):
+        """Test error handling when the email cannot be queued"""
         # Configure the mock to raise an exception
-        mock_send_mail.side_effect = Exception('Email sending failed')
+        mock_queue_email.side_effect = Exception('Database error')
         
         # Submit the contact form
         data = {
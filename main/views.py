@@ -1,15 +1,14 @@
 # main/views.py
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.core.mail import send_mail
 from django.conf import settings
 from django.db.models import Count
 from datetime import date
 import logging # Import logging
-import time # For email retry delay
 
 # Import models from the 'jobs' app
 from jobs.models import Job
+from utils.outbox import queue_email
 # Import forms from the current app
 from .forms import ContactForm
 
@@ -81,39 +80,21 @@ def contact_view(request):
                 full_subject = f"Job Portal Contact: {subject}"
                 full_message = f"From: {name} <{email}>\n\n{message_body}"
 
-                # Send email using Django's send_mail function
-                # Add retry logic similar to Flask example
-                max_retries = 3
-                sent_successfully = False
-                for attempt in range(max_retries):
-                    try:
-                        send_mail(
-                            subject=full_subject,
-                            message=full_message,
-                            from_email=settings.DEFAULT_FROM_EMAIL,
-                            recipient_list=[settings.CONTACT_EMAIL_RECIPIENT],
-                            fail_silently=False, # Raise exception on failure
-                        )
-                        logger.info(f"Contact email sent successfully from {email} (attempt {attempt + 1})")
-                        messages.success(request, 'Your message has been sent! We will get back to you soon.')
-                        sent_successfully = True
-                        break # Exit retry loop on success
-                    except Exception as mail_error:
-                        if attempt == max_retries - 1: # Last attempt failed
-                            logger.error(f"Failed to send contact email from {email} after {max_retries} attempts: {str(mail_error)}")
-                            messages.error(request, 'An error occurred while sending your message. Please try again later.')
-                        else:
-                            logger.warning(f"Email send attempt {attempt + 1} for {email} failed, retrying... Error: {str(mail_error)}")
-                            time.sleep(1) # Wait before retrying
-                            continue
-
-                if sent_successfully:
-                    return redirect('main:contact') # Redirect back to contact page
+                # Queued in the outbox and delivered by the send_outbox worker,
+                # so a slow or failing mail server does not hold up the request
+                queue_email(
+                    subject=full_subject,
+                    body=full_message,
+                    to=[settings.CONTACT_EMAIL_RECIPIENT],
+                    reply_to=[email],
+                )
+                logger.info(f"Contact email from {email} queued for delivery")
+                messages.success(request, 'Your message has been sent! We will get back to you soon.')
+                return redirect('main:contact') # Redirect back to contact page
 
             except Exception as e:
-                # Catch potential errors outside the mail sending loop
-                logger.error(f"Unexpected error processing contact form from {email}: {str(e)}")
-                messages.error(request, f'An unexpected error occurred.')
+                logger.error(f"Failed to queue contact email from {email}: {str(e)}")
+                messages.error(request, 'An error occurred while sending your message. Please try again later.')
                 # Stay on the contact page with the form data
         else:
             logger.warning(f"Contact form validation failed: {form.errors}")
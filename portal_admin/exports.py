@@ -0,0 +1,134 @@
+# portal_admin/exports.py
+
+"""
+Streaming CSV / JSON Lines exports of users, jobs and applications.
+
+Rows are read with values_list().iterator(chunk_size=...), so the database
+driver hands them over a chunk at a time (a server-side cursor on
+PostgreSQL) and no model instances are built. Each chunk is encoded and,
+optionally, gzip-compressed before the next one is fetched: memory use stays
+constant however many rows are exported, and an HTTP response starts
+sending immediately instead of after the whole file is ready.
+"""
+
+import io
+import csv
+import json
+import zlib
+import logging
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from jobs.models import Job, Application
+from portal_auth.models import User
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('csv', 'jsonl')
+# Column name -> field path, per export
+EXPORT_COLUMNS = {
+    'users': [
+        ('id', 'id'), ('username', 'username'), ('email', 'email'), ('role', 'role'),
+        ('is_active', 'is_active'), ('date_joined', 'date_joined'), ('last_login', 'last_login'),
+    ],
+    'jobs': [
+        ('id', 'id'), ('title', 'title'), ('company', 'company'), ('location', 'location'),
+        ('category', 'category'), ('salary', 'salary'), ('poster_id', 'poster_id'),
+        ('poster', 'poster__username'), ('posted_date', 'posted_date'),
+    ],
+    'applications': [
+        ('id', 'id'), ('job_id', 'job_id'), ('job_title', 'job__title'), ('applicant_id', 'applicant_id'),
+        ('applicant', 'applicant__username'), ('applicant_email', 'applicant__email'),
+        ('status', 'status'), ('application_date', 'application_date'),
+    ],
+}
+# Spreadsheet programs run cells starting with these as formulas
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def export_queryset(kind):
+    """All live rows of an export, in primary key order (the cheapest order to stream)."""
+    querysets = {
+        'users': User.objects.filter(deleted_at__isnull=True),
+        'jobs': Job.objects.all(),
+        'applications': Application.objects.live(),
+    }
+    return querysets[kind].order_by('pk')
+
+
+def iter_export_rows(queryset, kind, chunk_size=None):
+    """Yield the export columns of each row as tuples, fetched chunk_size rows at a time."""
+    fields = [field for _, field in EXPORT_COLUMNS[kind]]
+    return queryset.values_list(*fields).iterator(chunk_size=chunk_size or EXPORT_CHUNK_SIZE)
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def encode_csv(rows, kind, chunk_size=None):
+    """Encode rows as CSV with a header line, yielding one str per chunk of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_COLUMNS[kind]])
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_csv_cell(value) for value in row])
+        if count % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def encode_jsonl(rows, kind, chunk_size=None):
+    """Encode rows as JSON Lines (one object per row), yielding one str per chunk of rows."""
+    names = [name for name, _ in EXPORT_COLUMNS[kind]]
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder, ensure_ascii=False))
+        if len(lines) >= chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def gzip_stream(chunks):
+    """
+    Gzip-compress a stream of str chunks on the fly.
+
+    Each chunk is flushed (Z_SYNC_FLUSH) so the client keeps receiving data
+    while a long export runs, instead of waiting for zlib's buffer to fill.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) # wbits=31: gzip header and trailer
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8')) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(queryset, kind, export_format, compress=True, chunk_size=None):
+    """
+    Stream an export of the given rows.
+
+    Args:
+        queryset (QuerySet): Rows to export, e.g. export_queryset(kind) with filters applied
+        kind (str): 'users', 'jobs' or 'applications'
+        export_format (str): 'csv' or 'jsonl'
+        compress (bool): Gzip the output
+        chunk_size (int): Rows fetched and encoded per step (default EXPORT_CHUNK_SIZE)
+
+    Returns:
+        iterator: bytes chunks of the (compressed) file.
+    """
+    encode = encode_csv if export_format == 'csv' else encode_jsonl
+    chunks = encode(iter_export_rows(queryset, kind, chunk_size), kind, chunk_size)
+    if compress:
+        return gzip_stream(chunks)
+    return (chunk.encode('utf-8') for chunk in chunks)
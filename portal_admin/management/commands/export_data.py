@@ -0,0 +1,37 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from portal_admin.exports import EXPORT_COLUMNS, EXPORT_FORMATS, export_queryset, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Export users, jobs or applications as CSV or JSON Lines, streaming the rows in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORT_COLUMNS), help='What to export')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv', help='Output format')
+        parser.add_argument('--output', '-o', default='-',
+                            help="File to write ('-' for standard output); a .gz name implies --gzip")
+        parser.add_argument('--gzip', action='store_true', help='Gzip-compress the output')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Rows fetched from the database at a time')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        compress = options['gzip'] or output.endswith('.gz')
+        chunks = stream_export(export_queryset(options['kind']), options['kind'], options['format'],
+                               compress=compress, chunk_size=options['chunk_size'])
+        written = 0
+        if output == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+                written += len(chunk)
+            sys.stdout.buffer.flush()
+            # The export itself is on standard output; keep the summary out of it
+            self.stderr.write(self.style.SUCCESS(f"Exported {options['kind']} to standard output ({written} bytes)"))
+            return
+        with open(output, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Exported {options['kind']} to {output} ({written} bytes)"))
@@ -0,0 +1,91 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+import time
+import logging
+
+from jobs.models import Job, Application, ApplicationStatusEvent
+from portal_auth.models import User
+from utils.counters import uncounted_deletes
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Remove jobs and users marked for deletion, deleting their dependents in bounded chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Rows deleted per transaction')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Seconds to wait between chunks, to leave room for other writers')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for newly deleted jobs and users')
+        parser.add_argument('--interval', type=int, default=60, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        self.chunk_size = options['chunk_size']
+        self.pause = options['pause']
+        while True:
+            jobs = self.purge_jobs(Job.all_objects.filter(deleted_at__isnull=False, poster__deleted_at__isnull=True))
+            users = 0
+            for user in User.objects.filter(deleted_at__isnull=False).order_by('pk'):
+                self.purge_user(user)
+                users += 1
+            self.stdout.write(self.style.SUCCESS(f'Purged {jobs} job(s) and {users} user(s)'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def purge_jobs(self, jobs):
+        """Purge the given jobs one after the other; returns how many were removed."""
+        purged = 0
+        for job in jobs.order_by('pk'):
+            # The job's applications left the platform counters when it was marked, and its
+            # status counters go with it
+            self.delete_in_chunks(Application.all_objects.filter(job=job), f'job {job.pk} applications')
+            # What is left (funnel rows) is small; the collector can take it in one go
+            job.delete()
+            logger.info(f"purge_deleted: Removed job {job.pk} ('{job.title}')")
+            purged += 1
+        return purged
+
+    def purge_user(self, user):
+        """Remove a user's jobs, applications and references, then the account."""
+        self.stdout.write(f'User {user.pk} ({user.username}):')
+        # Jobs posted after the account was marked are caught here as well
+        self.purge_jobs(Job.all_objects.filter(poster=user))
+        # Uncounted when the account was marked
+        self.delete_in_chunks(Application.all_objects.filter(applicant=user), f'user {user.pk} applications')
+        # SET_NULL references would be updated in one statement by the collector
+        events = ApplicationStatusEvent.objects.filter(changed_by=user)
+        while True:
+            ids = list(events.values_list('pk', flat=True)[:self.chunk_size])
+            if not ids:
+                break
+            ApplicationStatusEvent.objects.filter(pk__in=ids).update(changed_by=None)
+            self.wait()
+        user.delete()
+        logger.info(f"purge_deleted: Removed user {user.pk} ({user.username})")
+
+    def delete_in_chunks(self, queryset, label):
+        """
+        Delete the rows of a queryset chunk by chunk, each chunk in its own transaction.
+
+        The rows must already be off the counters: the counter signals are skipped.
+        """
+        total = queryset.count()
+        if not total:
+            return
+        deleted = 0
+        while True:
+            ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:self.chunk_size])
+            if not ids:
+                break
+            with transaction.atomic(), uncounted_deletes():
+                # Delete through the ORM so cascades and signals (blob reference counts) still run
+                queryset.model._base_manager.filter(pk__in=ids).delete()
+            deleted += len(ids)
+            self.stdout.write(f'  {label}: {deleted}/{total} deleted')
+            self.wait()
+
+    def wait(self):
+        if self.pause:
+            time.sleep(self.pause)
@@ -1,9 +1,21 @@
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.messages import get_messages
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import io
+import os
+import csv
+import gzip
+import json
+import shutil
+import tempfile
+from unittest.mock import patch
 
 from portal_auth.models import User
 from jobs.models import Job, Application
+from utils.counters import read_counters
 
 class AdminTestCase(TestCase):
     """Base test case for admin tests with common setup"""
@@ -257,12 +269,18 @@ class AdminUserManagementTests(AdminTestCase):
         # Check response
         self.assertEqual(response.status_code, 200)
         
-        # Check that user was deleted
-        self.assertFalse(User.objects.filter(id=self.job_seeker.id).exists())
+        # Check that user was deactivated and marked for deletion
+        self.job_seeker.refresh_from_db()
+        self.assertIsNotNone(self.job_seeker.deleted_at)
+        self.assertFalse(self.job_seeker.is_active)
         
         # Check for success message
         messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('deleted' in str(message).lower() for message in messages))
+        
+        # The purge command removes the account
+        call_command('purge_deleted', stdout=io.StringIO())
+        self.assertFalse(User.objects.filter(id=self.job_seeker.id).exists())
     
     def test_admin_delete_self(self):
         """Test admin attempting to delete their own account"""
@@ -491,4 +509,213 @@ class AdminApplicationManagementTests(AdminTestCase):
         
         # Check for error message
         messages = list(get_messages(response.wsgi_request))
-        self.assertTrue(any('invalid' in str(message).lower() for message in messages))
\ No newline at end of file
+        self.assertTrue(any('invalid' in str(message).lower() for message in messages))
+
+class AdminListingTests(AdminTestCase):
+    """Tests for pagination, search and sorting of the admin listings"""
+
+    def test_users_paginated(self):
+        """Test that the user list is served in keyset pages without counting the table"""
+        User.objects.bulk_create([User(username=f'bulk{n:03d}', email=f'bulk{n:03d}@example.com', role='job_seeker')
+                                  for n in range(60)])
+        self.login_as_admin()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('portal_admin:admin_users'))
+        self.assertEqual(len(response.context['users']), 50)
+        self.assertFalse([q for q in queries.captured_queries if 'COUNT(' in q['sql'].upper()])
+
+        page = response.context['page']
+        response = self.client.get(reverse('portal_admin:admin_users'), {'cursor': page.next_cursor})
+        self.assertEqual(len(response.context['users']), 13)
+        self.assertFalse(response.context['page'].has_next)
+
+    def test_users_search_and_sort(self):
+        """Test the username/email prefix search and sorting by column"""
+        User.objects.create(username='Zoe', email='zoe@example.com', role='employer')
+        User.objects.create(username='adam', email='Second@Example.com', role='job_seeker')
+        self.login_as_admin()
+
+        response = self.client.get(reverse('portal_admin:admin_users'), {'q': 'ZO'})
+        self.assertEqual([u.username for u in response.context['users']], ['Zoe'])
+        response = self.client.get(reverse('portal_admin:admin_users'), {'q': 'second@'})
+        self.assertEqual([u.username for u in response.context['users']], ['adam'])
+        response = self.client.get(reverse('portal_admin:admin_users'), {'q': 'e', 'role': 'employer'})
+        self.assertEqual([u.username for u in response.context['users']], ['employer'])
+
+        response = self.client.get(reverse('portal_admin:admin_users'), {'sort': '-username'})
+        self.assertEqual([u.username for u in response.context['users']], ['Zoe', 'seeker', 'employer', 'admin', 'adam'])
+        self.assertEqual(response.context['columns']['username'], {'sort': 'username', 'direction': 'desc'})
+        # Unknown columns fall back to the default order
+        response = self.client.get(reverse('portal_admin:admin_users'), {'sort': 'password'})
+        self.assertEqual(response.context['sort'], 'id')
+
+    def test_jobs_search_and_sort(self):
+        """Test the title/company prefix search and sorting of the job list"""
+        for title, company in [('Backend Developer', 'Acme'), ('Data Analyst', 'Globex'), ('Designer', 'Acme Labs')]:
+            Job.objects.create(title=title, description='Test description', location='Remote',
+                               category='IT', company=company, poster=self.employer)
+        self.login_as_admin()
+
+        response = self.client.get(reverse('portal_admin:admin_jobs'), {'q': 'acme'})
+        self.assertEqual({job.title for job in response.context['jobs']}, {'Backend Developer', 'Designer'})
+        response = self.client.get(reverse('portal_admin:admin_jobs'), {'q': 'd', 'sort': 'title'})
+        self.assertEqual([job.title for job in response.context['jobs']], ['Data Analyst', 'Designer'])
+        response = self.client.get(reverse('portal_admin:admin_jobs'), {'sort': '-company'})
+        self.assertEqual([job.company for job in response.context['jobs']], ['Globex', 'Acme Labs', 'Acme'])
+
+    def test_applications_filter_and_pages(self):
+        """Test the status filter and paging of the application list"""
+        job = Job.objects.create(title='Test Job', description='Test description', location='Remote',
+                                 category='IT', company='Test Company', poster=self.employer)
+        seekers = User.objects.bulk_create([
+            User(username=f'applicant{n}', email=f'applicant{n}@example.com', role='job_seeker') for n in range(55)])
+        Application.objects.bulk_create([
+            Application(job=job, applicant=seeker, status='hired' if n < 3 else 'applied')
+            for n, seeker in enumerate(seekers)])
+        self.login_as_admin()
+
+        response = self.client.get(reverse('portal_admin:admin_applications'), {'status': 'hired'})
+        self.assertEqual(len(response.context['applications']), 3)
+        response = self.client.get(reverse('portal_admin:admin_applications'), {'sort': 'status'})
+        self.assertEqual(response.context['applications'][0].status, 'applied')
+        response = self.client.get(reverse('portal_admin:admin_applications'),
+                                   {'sort': 'status', 'cursor': response.context['page'].next_cursor})
+        self.assertEqual([a.status for a in response.context['applications']], ['applied', 'applied', 'hired', 'hired', 'hired'])
+
+
+class AdminExportTests(AdminTestCase):
+    """Tests for the streaming CSV/JSONL exports"""
+
+    def setUp(self):
+        super().setUp()
+        self.job = Job.objects.create(title='=HYPERLINK("x")', description='Test description', location='Remote',
+                                      category='IT', company='Test Company', poster=self.employer)
+        Application.objects.create(job=self.job, applicant=self.job_seeker, status='shortlisted')
+
+    def _download(self, kind, **params):
+        response = self.client.get(reverse('portal_admin:admin_export', args=[kind]), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return gzip.decompress(b''.join(response.streaming_content)).decode('utf-8')
+
+    def test_export_users_csv(self):
+        """Test the gzip CSV export of users, honouring the list filters"""
+        self.login_as_admin()
+        rows = list(csv.reader(io.StringIO(self._download('users'))))
+        self.assertEqual(rows[0][:4], ['id', 'username', 'email', 'role'])
+        self.assertEqual([row[1] for row in rows[1:]], ['admin', 'seeker', 'employer'])
+
+        rows = list(csv.reader(io.StringIO(self._download('users', role='employer'))))
+        self.assertEqual([row[1] for row in rows[1:]], ['employer'])
+
+    def test_export_jobs_csv_neutralises_formulas(self):
+        """Test that cells a spreadsheet would run as formulas are exported as text"""
+        self.login_as_admin()
+        rows = list(csv.reader(io.StringIO(self._download('jobs'))))
+        self.assertEqual(rows[1][1], '\'=HYPERLINK("x")')
+
+    def test_export_applications_jsonl(self):
+        """Test the gzip JSON Lines export of applications"""
+        self.login_as_admin()
+        lines = self._download('applications', format='jsonl').splitlines()
+        record = json.loads(lines[0])
+        self.assertEqual(len(lines), 1)
+        self.assertEqual((record['applicant'], record['status']), ('seeker', 'shortlisted'))
+        self.assertEqual(self._download('applications', format='jsonl', status='hired'), '')
+
+    def test_export_requires_admin_and_known_kind(self):
+        """Test that exports are admin-only and unknown exports are not found"""
+        self.login_as_employer()
+        response = self.client.get(reverse('portal_admin:admin_export', args=['users']))
+        self.assertNotEqual(response.status_code, 200)
+        self.login_as_admin()
+        self.assertEqual(self.client.get(reverse('portal_admin:admin_export', args=['passwords'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('portal_admin:admin_export', args=['users']), {'format': 'xml'}).status_code, 404)
+
+    def test_export_command_streams_in_chunks(self):
+        """Test the export_data command writes gzip output fetched in chunks"""
+        Job.objects.bulk_create([Job(title=f'Job {n}', description='Test description', location='Remote',
+                                     category='IT', company='Test Company', poster=self.employer) for n in range(5)])
+        output = os.path.join(tempfile.mkdtemp(), 'jobs.jsonl.gz')
+        try:
+            with patch('django.db.models.query.QuerySet.iterator', autospec=True,
+                       side_effect=lambda qs, chunk_size=None: iter(list(qs))) as iterator:
+                call_command('export_data', 'jobs', '--format', 'jsonl', '-o', output, '--chunk-size', '2',
+                             stdout=io.StringIO())
+            self.assertEqual(iterator.call_args.kwargs['chunk_size'], 2)
+            with gzip.open(output, 'rt', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+        finally:
+            shutil.rmtree(os.path.dirname(output))
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[1]['title'], 'Job 0')
+
+    def test_export_command_to_stdout_reports_on_stderr(self):
+        """Test that exporting to standard output keeps the summary out of the data"""
+        data, stderr = io.BytesIO(), io.StringIO()
+        stdout = io.TextIOWrapper(data)
+        with patch('sys.stdout', stdout):
+            call_command('export_data', 'jobs', '--format', 'jsonl', stderr=stderr)
+        stdout.detach()
+        lines = data.getvalue().decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], list(Job.objects.values_list('pk', flat=True)))
+        self.assertIn(f'Exported jobs to standard output ({len(data.getvalue())} bytes)', stderr.getvalue())
+
+
+class PurgeDeletedTests(AdminTestCase):
+    """Tests for soft deletion and the purge_deleted command"""
+
+    def setUp(self):
+        """Create a job with three applications"""
+        super().setUp()
+        self.job = Job.objects.create(
+            title='Test Job', description='Test description', location='Test Location',
+            category='IT', company='Test Company', poster=self.employer)
+        for i in range(3):
+            applicant = User.objects.create(username=f'applicant{i}', email=f'applicant{i}@example.com', role='job_seeker')
+            Application.objects.create(job=self.job, applicant=applicant)
+
+    def test_deleted_job_is_hidden_then_purged_in_chunks(self):
+        """Test that a deleted job disappears at once and is removed chunk by chunk"""
+        self.job.mark_deleted()
+        self.assertFalse(Job.objects.filter(pk=self.job.pk).exists())
+        self.assertFalse(Application.objects.live().filter(job_id=self.job.pk).exists())
+        self.assertEqual(Application.all_objects.filter(job_id=self.job.pk).count(), 3)
+
+        output = io.StringIO()
+        call_command('purge_deleted', '--chunk-size', '2', stdout=output)
+
+        self.assertIn('2/3 deleted', output.getvalue())
+        self.assertIn('3/3 deleted', output.getvalue())
+        self.assertFalse(Job.all_objects.filter(pk=self.job.pk).exists())
+        self.assertFalse(Application.all_objects.filter(job_id=self.job.pk).exists())
+
+    def test_purge_skips_counter_checks(self):
+        """Test that purging already uncounted applications runs no per-row counter query"""
+        self.job.mark_deleted()
+        counters = read_counters()
+        with CaptureQueriesContext(connection) as queries:
+            call_command('purge_deleted', stdout=io.StringIO())
+        self.assertFalse([q for q in queries.captured_queries if 'EXISTS' in q['sql'].upper()])
+        self.assertEqual(read_counters(), counters)
+
+    def test_deleted_job_can_be_posted_again(self):
+        """Test that the uniqueness constraint only covers live jobs"""
+        self.job.mark_deleted()
+        Job.objects.create(
+            title='Test Job', description='Test description', location='Test Location',
+            category='IT', company='Test Company', poster=self.employer)
+        self.assertEqual(Job.all_objects.filter(title='Test Job').count(), 2)
+
+    def test_deleted_employer_is_purged_with_jobs(self):
+        """Test that deleting an employer hides and then removes their jobs"""
+        self.employer.mark_deleted()
+        self.assertFalse(Job.objects.filter(poster=self.employer).exists())
+
+        call_command('purge_deleted', stdout=io.StringIO())
+
+        self.assertFalse(User.objects.filter(pk=self.employer.pk).exists())
+        self.assertFalse(Job.all_objects.filter(pk=self.job.pk).exists())
+        self.assertEqual(Application.all_objects.count(), 0)
+        # Other accounts are untouched
+        self.assertTrue(User.objects.filter(pk=self.job_seeker.pk).exists())
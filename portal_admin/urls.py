@@ -18,4 +18,5 @@ urlpatterns = [
     path('jobs/<int:job_id>/delete/', views.admin_delete_job_view, name='admin_delete_job'),
     path('applications/', views.admin_applications_view, name='admin_applications'),
     path('applications/<int:application_id>/update/', views.admin_update_application_view, name='admin_update_application'),
+    path('export/<str:kind>/', views.admin_export_view, name='admin_export'),
 ]
@@ -2,7 +2,11 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.db import transaction
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from collections import Counter
+from datetime import timedelta
 import logging # Import logging
 
 # Import models from relevant apps
@@ -12,27 +16,159 @@ from jobs.models import Job, Application
 from portal_auth.forms import AdminRegistrationForm # Assuming UserEditForm is in auth
 # Need UserEditForm from auth/forms.py
 from portal_admin.forms import UserEditForm
+from portal_admin.exports import EXPORT_COLUMNS, EXPORT_FORMATS, export_queryset, stream_export
 from employer.forms import JobForm, ApplicationStatusForm # JobForm from employer
 # Import decorators from auth app
 from portal_auth.views import login_required, role_required
+from utils.pagination import paginate_keyset, resolve_sort, sort_links
+from utils.search import lower_key, prefix_match
+from utils.activity import read_activity
+from utils.counters import USERS, JOBS, APPLICATIONS, read_counters, role_counter, status_counter
 
 logger = logging.getLogger(__name__) # Get logger for this module
 
+ADMIN_PAGE_SIZE = 50
+# Sortable columns of the admin listings -> keyset ordering (ascending; '-' in ?sort= reverses it).
+# Each ends in 'id' so the sort key is unique, and each has a matching index.
+USER_SORT_ORDERS = {
+    'id': ['id'],
+    'username': ['username_lower', 'id'],
+    'email': ['email_lower', 'id'],
+    'role': ['role', 'id'],
+}
+JOB_SORT_ORDERS = {
+    'posted': ['posted_date', 'id'],
+    'title': ['title_lower', 'id'],
+    'company': ['company_lower', 'id'],
+}
+APPLICATION_SORT_ORDERS = {
+    'date': ['application_date', 'id'],
+    'status': ['status', 'application_date', 'id'],
+}
+# Periods (in days) offered for the dashboard activity charts
+ACTIVITY_PERIODS = (7, 30, 90)
+# Series charted separately per chart; smaller ones are summed into 'Other'
+ACTIVITY_CHART_SERIES = 5
+ACTIVITY_CHART_COLORS = ('bg-primary', 'bg-success', 'bg-warning', 'bg-danger', 'bg-info')
+
+
+# --- Helpers ---
+
+def _activity_chart(per_day, start, days, labels):
+    """
+    Stacked daily bars for one activity metric.
+
+    Args:
+        per_day (dict): day -> {dimension: count}, as returned by read_activity()
+        start (date): First charted day
+        days (int): Number of days charted
+        labels (dict): Display names of dimension values (values without one are shown as is)
+
+    Returns:
+        dict: 'legend' (label, color, total per series), 'days' (day, total and
+              segments with heights in % of the busiest day) and the overall 'total'.
+    """
+    totals = Counter()
+    for counts in per_day.values():
+        totals.update(counts)
+    series = [dimension for dimension, _ in totals.most_common(ACTIVITY_CHART_SERIES)]
+    legend = [{'label': labels.get(dimension, dimension), 'color': color, 'total': totals[dimension]}
+              for dimension, color in zip(series, ACTIVITY_CHART_COLORS)]
+    other = sum(totals.values()) - sum(totals[dimension] for dimension in series)
+    if other:
+        legend.append({'label': 'Other', 'color': 'bg-secondary', 'total': other})
+
+    busiest = max((sum(counts.values()) for counts in per_day.values()), default=0) or 1
+    rows = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        counts = per_day.get(day, {})
+        values = [counts.get(dimension, 0) for dimension in series]
+        if other:
+            values.append(sum(counts.values()) - sum(values))
+        rows.append({
+            'day': day,
+            'total': sum(counts.values()),
+            'segments': [{'label': item['label'], 'color': item['color'], 'count': value,
+                          'height': round(100 * value / busiest)}
+                         for item, value in zip(legend, values) if value],
+        })
+    return {'legend': legend, 'days': rows, 'total': sum(totals.values())}
+
+
+def _filter_users(users, params):
+    """Apply the user list's ?q= (username/email prefix) and ?role= filters; returns (users, q, role)."""
+    users = users.annotate(username_lower=lower_key('username'), email_lower=lower_key('email'))
+    search_query = params.get('q', '').strip()
+    if search_query:
+        users = users.filter(prefix_match(['username_lower', 'email_lower'], search_query))
+    role = params.get('role', '')
+    if role in dict(User.ROLE_CHOICES):
+        users = users.filter(role=role)
+    else:
+        role = ''
+    return users, search_query, role
+
+
+def _filter_jobs(jobs, params):
+    """Apply the job list's ?q= (title/company prefix) filter; returns (jobs, q)."""
+    jobs = jobs.annotate(title_lower=lower_key('title'), company_lower=lower_key('company'))
+    search_query = params.get('q', '').strip()
+    if search_query:
+        jobs = jobs.filter(prefix_match(['title_lower', 'company_lower'], search_query))
+    return jobs, search_query
+
+
+def _filter_applications(applications, params):
+    """Apply the application list's ?status= filter; returns (applications, status)."""
+    status = params.get('status', '')
+    if status in dict(Application.STATUS_CHOICES):
+        return applications.filter(status=status), status
+    return applications, ''
+
 # --- Views ---
 
 @login_required
 @role_required('admin')
 def admin_dashboard_view(request):
-    """Render the custom admin dashboard."""
+    """
+    Render the custom admin dashboard: platform totals and daily activity charts.
+
+    Totals come from the platform counters and the charts from the daily
+    activity buckets, so neither depends on the size of the raw tables.
+    """
     user = request.user
     logger.info(f"Admin {user.id} accessed the admin dashboard")
-    user_count = User.objects.count()
-    job_count = Job.objects.count()
-    app_count = Application.objects.count()
+    # One small read instead of counting the users, jobs and applications tables
+    counters = read_counters()
+
+    try:
+        days = int(request.GET.get('days', 30))
+    except ValueError:
+        days = 30
+    if days not in ACTIVITY_PERIODS:
+        days = 30
+    end = timezone.localdate()
+    start = end - timedelta(days=days - 1)
+    activity = read_activity(start, end)
+    charts = [
+        {'title': 'Signups by role', **_activity_chart(activity['signups'], start, days, dict(User.ROLE_CHOICES))},
+        {'title': 'Jobs posted by category', **_activity_chart(activity['jobs'], start, days, {})},
+        {'title': 'Applications by status',
+         **_activity_chart(activity['applications'], start, days, dict(Application.STATUS_CHOICES))},
+    ]
     context = {
-        'user_count': user_count,
-        'job_count': job_count,
-        'app_count': app_count,
+        'user_count': counters.get(USERS, 0),
+        'job_count': counters.get(JOBS, 0),
+        'app_count': counters.get(APPLICATIONS, 0),
+        'role_counts': [(label, counters.get(role_counter(role), 0)) for role, label in User.ROLE_CHOICES],
+        'status_counts': [
+            (label, counters.get(status_counter(status), 0)) for status, label in Application.STATUS_CHOICES],
+        'days': days,
+        'periods': ACTIVITY_PERIODS,
+        'start': start,
+        'end': end,
+        'charts': charts,
     }
     return render(request, 'portal_admin/dashboard.html', context)
 
@@ -45,9 +181,21 @@ def admin_users_view(request):
     """Display all users for admin management."""
     user = request.user
     logger.info(f"Admin {user.id} accessed the users management page")
-    users = User.objects.all().order_by('id')
-    logger.info(f"Retrieved {users.count()} users for admin view")
-    context = {'users': users}
+    # Accounts marked for deletion are hidden until purge_deleted removes them
+    users, search_query, role = _filter_users(User.objects.filter(deleted_at__isnull=True), request.GET)
+
+    sort, ordering = resolve_sort(request.GET.get('sort'), USER_SORT_ORDERS, 'id')
+    page = paginate_keyset(users, ordering, cursor=request.GET.get('cursor'), page_size=ADMIN_PAGE_SIZE)
+    logger.info(f"Showing {len(page)} users for admin view (search: '{search_query}', role: '{role}', sort: '{sort}')")
+    context = {
+        'users': page,
+        'page': page,
+        'search_query': search_query,
+        'role': role,
+        'role_choices': User.ROLE_CHOICES,
+        'sort': sort,
+        'columns': sort_links(sort, USER_SORT_ORDERS),
+    }
     return render(request, 'portal_admin/users.html', context)
 
 
@@ -152,10 +300,11 @@ def admin_delete_user_view(request, user_id):
     try:
         username = user_to_delete.username
         email = user_to_delete.email
-        # Deletion cascades due to model definitions (User -> Job -> Application)
-        user_to_delete.delete()
-        logger.info(f"Admin {admin_user.id} deleted user {user_id}: {username}, {email}")
-        messages.success(request, f'User "{username}" and associated data deleted successfully.')
+        # Deactivate and hide now; purge_deleted removes the account, its jobs and
+        # applications in bounded chunks instead of one long cascading transaction
+        user_to_delete.mark_deleted()
+        logger.info(f"Admin {admin_user.id} marked user {user_id} for deletion: {username}, {email}")
+        messages.success(request, f'User "{username}" deleted. Their jobs and applications will be removed shortly.')
     except Exception as e:
         logger.error(f"Admin {admin_user.id} failed to delete user {user_id}: {str(e)}")
         messages.error(request, f'Failed to delete user.')
@@ -171,9 +320,18 @@ def admin_jobs_view(request):
     """Display all job listings for admin management."""
     admin_user = request.user
     logger.info(f"Admin {admin_user.id} accessed the jobs management page")
-    jobs = Job.objects.select_related('poster').order_by('-posted_date')
-    logger.info(f"Retrieved {jobs.count()} jobs for admin view")
-    context = {'jobs': jobs}
+    jobs, search_query = _filter_jobs(Job.objects.select_related('poster'), request.GET)
+
+    sort, ordering = resolve_sort(request.GET.get('sort'), JOB_SORT_ORDERS, '-posted')
+    page = paginate_keyset(jobs, ordering, cursor=request.GET.get('cursor'), page_size=ADMIN_PAGE_SIZE)
+    logger.info(f"Showing {len(page)} jobs for admin view (search: '{search_query}', sort: '{sort}')")
+    context = {
+        'jobs': page,
+        'page': page,
+        'search_query': search_query,
+        'sort': sort,
+        'columns': sort_links(sort, JOB_SORT_ORDERS),
+    }
     return render(request, 'portal_admin/jobs.html', context)
 
 
@@ -266,10 +424,10 @@ def admin_delete_job_view(request, job_id):
     try:
         job_title = job_to_delete.title
         job_company = job_to_delete.company
-        # Cascade delete handles applications
-        job_to_delete.delete()
-        logger.info(f"Admin {admin_user.id} deleted job {job_id} ('{job_title}' at '{job_company}')")
-        messages.success(request, f'Job "{job_title}" and its applications deleted successfully.')
+        # Hide now; purge_deleted removes the job and its applications in bounded chunks
+        job_to_delete.mark_deleted()
+        logger.info(f"Admin {admin_user.id} marked job {job_id} ('{job_title}' at '{job_company}') for deletion")
+        messages.success(request, f'Job "{job_title}" deleted. Its applications will be removed shortly.')
     except Exception as e:
         logger.error(f"Admin {admin_user.id} failed to delete job {job_id}: {str(e)}")
         messages.error(request, f'Failed to delete job.')
@@ -285,9 +443,19 @@ def admin_applications_view(request):
     """Display all job applications for admin management."""
     admin_user = request.user
     logger.info(f"Admin {admin_user.id} accessed the applications management page")
-    applications = Application.objects.select_related('job', 'applicant').order_by('-application_date')
-    logger.info(f"Retrieved {applications.count()} applications for admin view")
-    context = {'applications': applications}
+    applications, status = _filter_applications(Application.objects.live().select_related('job', 'applicant'), request.GET)
+
+    sort, ordering = resolve_sort(request.GET.get('sort'), APPLICATION_SORT_ORDERS, '-date')
+    page = paginate_keyset(applications, ordering, cursor=request.GET.get('cursor'), page_size=ADMIN_PAGE_SIZE)
+    logger.info(f"Showing {len(page)} applications for admin view (status: '{status}', sort: '{sort}')")
+    context = {
+        'applications': page,
+        'page': page,
+        'status': status,
+        'status_choices': Application.STATUS_CHOICES,
+        'sort': sort,
+        'columns': sort_links(sort, APPLICATION_SORT_ORDERS),
+    }
     return render(request, 'portal_admin/applications.html', context)
 
 
@@ -310,8 +478,7 @@ def admin_update_application_view(request, application_id):
         previous_status = application.status
         logger.info(f"Admin {admin_user.id} updating application {application_id} status from '{previous_status}' to '{new_status}'")
         try:
-            application.status = new_status
-            application.save()
+            application.set_status(new_status, changed_by=admin_user)
             logger.info(f"Application {application_id} status updated successfully to '{new_status}' by admin {admin_user.id}")
             messages.success(request, f'Application status updated to {application.get_status_display()}.')
         except Exception as e:
@@ -323,3 +490,35 @@ def admin_update_application_view(request, application_id):
 
     return redirect('portal_admin:admin_applications')
 
+
+# --- Data Export ---
+
+@login_required
+@role_required('admin')
+def admin_export_view(request, kind):
+    """
+    Download users, jobs or applications as a gzip-compressed CSV or JSON Lines file.
+
+    Honours the filters of the corresponding admin list (?q=, ?role=, ?status=).
+    The file is produced while it is sent (see portal_admin.exports), so memory
+    use stays constant and the download starts right away however many rows
+    there are.
+    """
+    admin_user = request.user
+    export_format = request.GET.get('format', 'csv')
+    if kind not in EXPORT_COLUMNS or export_format not in EXPORT_FORMATS:
+        raise Http404("Unknown export")
+
+    queryset = export_queryset(kind)
+    if kind == 'users':
+        queryset, _, _ = _filter_users(queryset, request.GET)
+    elif kind == 'jobs':
+        queryset, _ = _filter_jobs(queryset, request.GET)
+    else:
+        queryset, _ = _filter_applications(queryset, request.GET)
+    logger.info(f"Admin {admin_user.id} exporting {kind} as {export_format} (filters: {request.GET.urlencode()})")
+
+    response = StreamingHttpResponse(stream_export(queryset, kind, export_format), content_type='application/gzip')
+    filename = f"{kind}-{timezone.now():%Y%m%d-%H%M%S}.{export_format}.gz"
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
@@ -1,3 +1,25 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-# Register your models here.
+from utils.admin import LargeTableAdminMixin, SoftDeleteAdminMixin
+from .models import User
+
+
+@admin.register(User)
+class UserAdmin(SoftDeleteAdminMixin, LargeTableAdminMixin, BaseUserAdmin):
+    """Django admin for accounts, including those awaiting purge_deleted."""
+    list_display = ('id', 'username', 'email', 'role', 'is_active', 'date_joined', 'deleted_at')
+    list_only = list_display
+    list_filter = ('role', 'is_active', 'is_staff', ('deleted_at', admin.EmptyFieldListFilter))
+    # Prefix searches on the lower_key() indexes (see LargeTableAdminMixin)
+    search_fields = ('username', 'email')
+    sortable_by = ('id', 'username')
+    ordering = ('-id',)
+    fieldsets = BaseUserAdmin.fieldsets + (
+        ('Portal', {'fields': ('role', 'profile_picture', 'deleted_at')}),
+    )
+    add_fieldsets = BaseUserAdmin.add_fieldsets + (
+        ('Portal', {'fields': ('email', 'role')}),
+    )
+    # Set by mark_deleted(), which also hides the user's jobs and adjusts the counters
+    readonly_fields = ('deleted_at',)
@@ -1,10 +1,14 @@
 # auth/forms.py
 import re
 from django import forms
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.template.defaultfilters import filesizeformat
 from django.core.validators import RegexValidator
 # Import your User model from where you placed it (assuming auth/models.py)
 from .models import User
+from utils.utils import ALLOWED_IMAGE_EXTENSIONS, has_allowed_signature
 
 # --- Custom Validators (can be kept similar) ---
 def validate_password_strength(password):
@@ -211,15 +215,17 @@ class ProfileForm(forms.ModelForm):
         return email
 
     def clean_profile_picture(self):
-        """Validate file type (redundant with ImageField but good practice)."""
+        """Validate file type, content signature and size (type is redundant with ImageField but good practice)."""
         picture = self.cleaned_data.get('profile_picture', False)
         if picture:
             allowed_extensions = ['jpg', 'jpeg', 'png']
             extension = picture.name.split('.')[-1].lower()
             if extension not in allowed_extensions:
                 raise ValidationError("Invalid profile picture file type. Allowed: jpg, png, jpeg", code='invalid_image_type')
-            # Optional: Add file size validation
-            # if picture.size > MAX_UPLOAD_SIZE:
-            #     raise ValidationError(f"File size cannot exceed {MAX_UPLOAD_SIZE} bytes.")
+            # Only new uploads; on edit an unchanged field holds the stored file
+            if isinstance(picture, UploadedFile) and picture.size > settings.IMAGE_MAX_UPLOAD_SIZE:
+                raise ValidationError(f"File size cannot exceed {filesizeformat(settings.IMAGE_MAX_UPLOAD_SIZE)}.", code='file_too_large')
+            if isinstance(picture, UploadedFile) and not has_allowed_signature(picture, ALLOWED_IMAGE_EXTENSIONS):
+                raise ValidationError("Invalid profile picture file content. Allowed: jpg, png, jpeg", code='invalid_image_content')
         return picture
 
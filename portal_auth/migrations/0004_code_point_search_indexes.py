@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:01
+
+import django.db.models.functions.text
+import utils.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('portal_auth', '0003_admin_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_username_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_email_lower_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(utils.search.CodePointOrder(django.db.models.functions.text.Lower('username')), models.F('id'), name='user_username_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(utils.search.CodePointOrder(django.db.models.functions.text.Lower('email')), models.F('id'), name='user_email_lower_idx'),
+        ),
+    ]
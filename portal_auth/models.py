@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.contrib.auth.hashers import make_password, check_password
 # Note: For a real Django project, consider using Django's built-in User model
 # or extending AbstractUser/AbstractBaseUser for more features and integration.
@@ -6,6 +7,8 @@ from django.contrib.auth.hashers import make_password, check_password
 # Import AbstractUser
 from django.contrib.auth.models import AbstractUser
 
+from utils.search import lower_key
+
 # Inherit from AbstractUser instead of models.Model
 class User(AbstractUser):
     """
@@ -22,6 +25,8 @@ class User(AbstractUser):
         Custom:
             role (CharField): User's role (job_seeker, employer, or admin)
         profile_picture (ImageField): Path to user's profile picture
+        deleted_at (DateTimeField): When the account was marked for deletion (None while live);
+            the purge_deleted command removes it and its data later
         # jobs_posted: Reverse relation accessed via Job.poster or user.jobs_posted (if related_name is set)
         # applications: Reverse relation accessed via Application.applicant or user.applications (if related_name is set)
     """
@@ -37,6 +42,7 @@ class User(AbstractUser):
     # 'upload_to' specifies the subdirectory within MEDIA_ROOT
     profile_picture = models.ImageField(
         upload_to='img/profiles/', null=True, blank=True, default='img/profiles/default.jpg')
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     # def set_password(self, raw_password):
     #     """
@@ -64,6 +70,35 @@ class User(AbstractUser):
     # REQUIRED_FIELDS defaults to ['email'], let's keep it explicit.
     REQUIRED_FIELDS = ['email']
     
+    def mark_deleted(self):
+        """
+        Deactivate the account and hide it and its jobs right away; removing
+        the data is left to the purge_deleted command, which deletes in bounded chunks.
+        """
+        # Imported lazily: jobs.models references this model
+        from jobs.models import Job, Application
+        from utils.counters import USERS, JOBS, adjust_counters, adjust_job_counters, application_changes, role_counter
+        now = timezone.now()
+        with transaction.atomic():
+            was_counted = User.objects.filter(pk=self.pk, deleted_at__isnull=True).exists()
+            # Counted before hiding: the default managers stop returning these rows
+            statuses = dict(Application.objects.live().filter(models.Q(applicant=self) | models.Q(job__poster=self))
+                            .order_by().values_list('status').annotate(total=models.Count('pk')))
+            # The per-job counters count applications of live applicants, whatever the job's state
+            applied = Application.all_objects.filter(applicant=self).order_by().values_list(
+                'job_id', 'status').annotate(total=models.Count('pk')) if was_counted else []
+            self.deleted_at = now
+            self.is_active = False
+            self.save(update_fields=['deleted_at', 'is_active'])
+            hidden_jobs = Job.objects.filter(poster=self).update(deleted_at=now)
+            changes = application_changes(statuses, sign=-1)
+            changes[JOBS] -= hidden_jobs
+            if was_counted:
+                changes[USERS] -= 1
+                changes[role_counter(self.role)] -= 1
+            adjust_counters(changes)
+            adjust_job_counters({(job_id, status): -total for job_id, status, total in applied})
+
     def __str__(self):
         """String representation of the User object."""
         return f'{self.username} ({self.get_role_display()})'
@@ -73,3 +108,9 @@ class User(AbstractUser):
     class Meta(AbstractUser.Meta):
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            # Serve the admin user list: prefix search and sorting by username, email or role
+            models.Index(lower_key('username'), 'id', name='user_username_lower_idx'),
+            models.Index(lower_key('email'), 'id', name='user_email_lower_idx'),
+            models.Index(fields=['role', 'id'], name='user_role_idx'),
+        ]
@@ -0,0 +1,93 @@
+// Resumable resume uploads: large files are sent in checksummed chunks so a
+// dropped connection only costs the current chunk, not the whole file.
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('applyForm');
+    if (!form || !window.crypto || !window.crypto.subtle || !window.fetch) {
+        return; // Fall back to a plain multipart submit
+    }
+    const initUrl = form.dataset.chunkedUploadUrl;
+    const fileInput = form.querySelector('input[type="file"][name="resume"]');
+    const uploadIdInput = form.querySelector('input[name="upload_id"]');
+    const progress = document.getElementById('uploadProgress');
+    const progressBar = progress ? progress.querySelector('.progress-bar') : null;
+    const csrfToken = form.querySelector('input[name="csrfmiddlewaretoken"]').value;
+    const maxRetries = 5;
+
+    const toHex = (buffer) => Array.from(new Uint8Array(buffer))
+        .map(b => b.toString(16).padStart(2, '0')).join('');
+
+    const post = (url, body) => fetch(url, {
+        method: 'POST',
+        body: body,
+        headers: {'X-CSRFToken': csrfToken},
+        credentials: 'same-origin'
+    });
+
+    const showProgress = (state) => {
+        if (!progressBar) return;
+        progress.classList.remove('d-none');
+        progressBar.style.width = Math.round(100 * state.received_bytes / state.total_size) + '%';
+    };
+
+    async function sendChunk(state, file) {
+        const start = state.next_chunk * state.chunk_size;
+        const blob = file.slice(start, Math.min(start + state.chunk_size, file.size));
+        const checksum = toHex(await crypto.subtle.digest('SHA-256', await blob.arrayBuffer()));
+        const body = new FormData();
+        body.append('index', state.next_chunk);
+        body.append('checksum', checksum);
+        body.append('chunk', blob, file.name);
+        const response = await post(`${initUrl}${state.upload_id}/chunk/`, body);
+        const data = await response.json();
+        if (!response.ok && response.status !== 409) {
+            throw new Error(data.error || 'Chunk upload failed');
+        }
+        return data; // On 409 the server tells us where to resume
+    }
+
+    async function upload(file) {
+        const init = new FormData();
+        init.append('filename', file.name);
+        init.append('size', file.size);
+        init.append('content_type', file.type);
+        let response = await post(initUrl, init);
+        let state = await response.json();
+        if (!response.ok) throw new Error(state.error || 'Could not start upload');
+
+        let failures = 0;
+        while (state.received_bytes < state.total_size) {
+            try {
+                state = await sendChunk(state, file);
+                failures = 0;
+                showProgress(state);
+            } catch (error) {
+                if (++failures > maxRetries) throw error;
+                await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** failures));
+                // Ask the server how far we got before retrying
+                response = await fetch(`${initUrl}${state.upload_id}/`, {credentials: 'same-origin'});
+                if (response.ok) state = await response.json();
+            }
+        }
+        response = await post(`${initUrl}${state.upload_id}/complete/`, new FormData());
+        state = await response.json();
+        if (!response.ok) throw new Error(state.error || 'Could not finish upload');
+        return state.upload_id;
+    }
+
+    form.addEventListener('submit', async function(event) {
+        const file = fileInput && fileInput.files[0];
+        if (!file || uploadIdInput.value) return; // Nothing to chunk, or already done
+        event.preventDefault();
+        const submitButton = form.querySelector('button[type="submit"]');
+        submitButton.disabled = true;
+        try {
+            uploadIdInput.value = await upload(file);
+            fileInput.value = ''; // The server already has the file
+            form.submit();
+        } catch (error) {
+            console.error('Chunked upload failed:', error);
+            submitButton.disabled = false;
+            alert('Uploading your resume failed. Please check your connection and try again.');
+        }
+    });
+});
@@ -0,0 +1,114 @@
+# utils/activity.py
+
+"""
+Daily activity buckets for the admin dashboard charts.
+
+record_activity() adds newly created records to their DailyActivity bucket
+(one row per day, metric and dimension value) with F() increments, in the
+transaction that creates them. The signal handlers in utils.signals cover
+single saves; code that bulk-creates users, jobs or status events calls it
+directly. rebuild_activity() recomputes the buckets of a date range from the
+raw tables, for the backfill_activity command.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailyActivity
+
+logger = logging.getLogger(__name__)
+
+SIGNUPS = 'signups'
+JOBS = 'jobs'
+APPLICATIONS = 'applications'
+
+
+def record_activity(metric, entries):
+    """
+    Count created records into their daily buckets.
+
+    Args:
+        metric (str): signups, jobs or applications
+        entries (iterable): (created datetime, dimension value) per record
+    """
+    buckets = Counter((timezone.localdate(created), dimension) for created, dimension in entries)
+    # A fixed order keeps concurrent transactions from locking the rows in opposite orders
+    for (day, dimension), count in sorted(buckets.items()):
+        bucket = DailyActivity.objects.filter(day=day, metric=metric, dimension=dimension)
+        if bucket.update(count=F('count') + count):
+            continue
+        try:
+            with transaction.atomic():
+                DailyActivity.objects.create(day=day, metric=metric, dimension=dimension, count=count)
+        except IntegrityError:
+            # Created concurrently since the UPDATE found nothing
+            bucket.update(count=F('count') + count)
+
+
+def read_activity(start, end):
+    """
+    The buckets from start to end (inclusive), read with one query.
+
+    Returns:
+        dict: metric -> {day: {dimension: count}}
+    """
+    activity = {metric: {} for metric, _ in DailyActivity.METRIC_CHOICES}
+    for day, metric, dimension, count in DailyActivity.objects.filter(day__gte=start, day__lte=end).values_list(
+            'day', 'metric', 'dimension', 'count'):
+        activity[metric].setdefault(day, {})[dimension] = count
+    return activity
+
+
+def _sources():
+    """(metric, queryset, timestamp field, dimension field) of each bucketed record type."""
+    # Imported lazily: jobs.models and portal_auth.models import this app's models
+    from jobs.models import Job, ApplicationStatusEvent
+    from portal_auth.models import User
+
+    # Marked-for-deletion rows still count: activity records what happened on the day
+    return [
+        (SIGNUPS, User.objects.all(), 'date_joined', 'role'),
+        (JOBS, Job.all_objects.all(), 'posted_date', 'category'),
+        (APPLICATIONS, ApplicationStatusEvent.objects.all(), 'created_at', 'to_status'),
+    ]
+
+
+def rebuild_activity(start, end):
+    """
+    Recompute the buckets of the days from start to end (inclusive) from the raw tables.
+
+    Returns:
+        int: Number of bucket rows written.
+    """
+    tz = timezone.get_current_timezone()
+    since = timezone.make_aware(datetime.combine(start, time.min), tz)
+    until = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+    rows = []
+    with transaction.atomic():
+        # Deleting first locks the range's buckets, holding back increments until the new rows are in
+        DailyActivity.objects.filter(day__gte=start, day__lte=end).delete()
+        for metric, queryset, timestamp, dimension in _sources():
+            totals = queryset.filter(**{f'{timestamp}__gte': since, f'{timestamp}__lt': until}).annotate(
+                day=TruncDate(timestamp, tzinfo=tz)).order_by().values_list('day', dimension).annotate(
+                total=Count('pk'))
+            rows.extend(DailyActivity(day=day, metric=metric, dimension=value, count=total)
+                        for day, value, total in totals)
+        DailyActivity.objects.bulk_create(rows, batch_size=500)
+    logger.info(f"rebuild_activity: Wrote {len(rows)} buckets for {start} to {end}")
+    return len(rows)
+
+
+def first_activity_day():
+    """Earliest day any bucketed record was created, or None if there are none."""
+    days = []
+    for _, queryset, timestamp, _ in _sources():
+        first = queryset.order_by(timestamp).values_list(timestamp, flat=True).first()
+        if first:
+            days.append(timezone.localdate(first))
+    return min(days) if days else None
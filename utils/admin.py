@@ -1,3 +1,69 @@
-from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 
-# Register your models here.
+from .pagination import EstimatedCountPaginator
+from .search import lower_key, prefix_match
+
+
+class LargeTableChangeList(ChangeList):
+    """Changelist loading only the model admin's list_only fields of each row."""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        if self.model_admin.list_only:
+            queryset = queryset.only(*self.model_admin.list_only)
+        return queryset
+
+
+class LargeTableAdminMixin:
+    """
+    ModelAdmin settings for tables with millions of rows.
+
+    Changelists never run a full COUNT(*) (show_full_result_count is off and
+    EstimatedCountPaginator estimates or caps the count), load only the listed
+    columns plus their select_related rows, and allow sorting only by indexed
+    columns (sortable_by). search_fields are matched by prefix on their
+    lower_key(), which the tables index (Django's '^field' compiles to
+    UPPER(field) LIKE ..., which no index serves). Foreign keys should be
+    listed in raw_id_fields so change forms do not render a <select> of every
+    related row.
+
+    Attributes:
+        list_only (tuple): Fields passed to .only() for changelist rows, including
+            'relation__field' paths for list_select_related; empty loads every field
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    list_only = ()
+
+    def get_changelist(self, request, **kwargs):
+        return LargeTableChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term or not self.search_fields:
+            return queryset, False
+        keys = {f"{field.replace('__', '_')}_key": lower_key(field) for field in self.search_fields}
+        return queryset.annotate(**keys).filter(prefix_match(keys, search_term)), False
+
+
+class SoftDeleteAdminMixin:
+    """
+    ModelAdmin deletes (the delete view and the bulk action) that go through
+    the model's mark_deleted(), like the portal's own delete views: rows are
+    hidden and uncounted at once and removed by purge_deleted in chunks,
+    instead of the collector deleting every dependent row in one transaction.
+    """
+
+    def delete_model(self, request, obj):
+        obj.mark_deleted()
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset.filter(deleted_at__isnull=True):
+            obj.mark_deleted()
+
+    def get_deleted_objects(self, objs, request):
+        # Lists the marked rows only: collecting their dependents would load them all
+        to_delete = [str(obj) for obj in objs]
+        perms_needed = set() if self.has_delete_permission(request) else {self.opts.verbose_name}
+        return to_delete, {self.opts.verbose_name_plural: len(to_delete)}, perms_needed, []
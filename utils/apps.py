@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UtilsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'utils'
+
+    def ready(self):
+        # Register signal handlers (platform counters)
+        from . import signals  # noqa: F401
@@ -0,0 +1,226 @@
+# utils/counters.py
+
+"""
+Platform-wide totals for the admin dashboard, maintained incrementally.
+
+Counters cover live rows only (accounts, jobs and applications not marked
+for deletion), broken down by user role and application status:
+
+    users, users.<role>, jobs, applications, applications.<status>
+
+Per job, JobStatusCounter rows count the applications of live applicants in
+each status (adjust_job_counters()); they back the per-status tabs of the
+employer's applicant list.
+
+Single rows are counted by the signal handlers in utils.signals; code that
+bypasses signals (bulk_create, queryset update(), soft deletes) calls
+adjust_counters() and adjust_job_counters() itself, inside the same
+transaction as the change.
+Each adjustment is an "UPDATE ... SET value = value + n", so concurrent
+writers never lose each other's increments. reconcile_counters() recounts
+everything to repair drift, e.g. after raw SQL or a crash between statements.
+"""
+
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import JobStatusCounter, PlatformCounter
+
+logger = logging.getLogger(__name__)
+
+USERS = 'users'
+JOBS = 'jobs'
+APPLICATIONS = 'applications'
+
+
+# Set while deleting rows whose counts were already removed (see uncounted_deletes())
+_deleting_uncounted = ContextVar('deleting_uncounted', default=False)
+
+
+@contextmanager
+def uncounted_deletes():
+    """
+    Skip the per-row counter signals for deletes made inside the block.
+
+    For purge_deleted: the applications it removes belong to jobs and accounts
+    whose mark_deleted() already took them off the counters, so checking each
+    deleted row again would only cost a query per row.
+    """
+    token = _deleting_uncounted.set(True)
+    try:
+        yield
+    finally:
+        _deleting_uncounted.reset(token)
+
+
+def deleting_uncounted():
+    """Whether the current deletes happen inside uncounted_deletes()."""
+    return _deleting_uncounted.get()
+
+
+def role_counter(role):
+    return f'{USERS}.{role}'
+
+
+def status_counter(status):
+    return f'{APPLICATIONS}.{status}'
+
+
+def application_changes(status_counts, sign=1):
+    """
+    Counter changes for applications entering (sign=1) or leaving (sign=-1) the live set.
+
+    Args:
+        status_counts (dict): status -> number of applications
+    """
+    changes = Counter()
+    for status, count in status_counts.items():
+        changes[APPLICATIONS] += sign * count
+        changes[status_counter(status)] += sign * count
+    return changes
+
+
+def adjust_counters(changes):
+    """
+    Add the given deltas to the counters, creating missing counters.
+
+    Args:
+        changes (dict): counter name -> delta; zero deltas are skipped
+    """
+    now = timezone.now()
+    # A fixed order keeps concurrent transactions from locking the rows in opposite orders
+    for name in sorted(changes):
+        delta = changes[name]
+        if not delta:
+            continue
+        if PlatformCounter.objects.filter(name=name).update(value=F('value') + delta, updated_at=now):
+            continue
+        try:
+            with transaction.atomic():
+                PlatformCounter.objects.create(name=name, value=delta, updated_at=now)
+        except IntegrityError:
+            # Created concurrently since the UPDATE found nothing
+            PlatformCounter.objects.filter(name=name).update(value=F('value') + delta, updated_at=now)
+
+
+def adjust_job_counters(changes):
+    """
+    Add the given deltas to the per-job status counters.
+
+    Args:
+        changes (dict): (job id, status) -> delta; zero deltas are skipped. Rows are
+                        only created for increments: a missing row counts nothing,
+                        and the job may be in the middle of being deleted.
+    """
+    for job_id, status in sorted(changes):
+        delta = changes[(job_id, status)]
+        if not delta:
+            continue
+        counter = JobStatusCounter.objects.filter(job_id=job_id, status=status)
+        if counter.update(value=F('value') + delta) or delta < 0:
+            continue
+        try:
+            with transaction.atomic():
+                JobStatusCounter.objects.create(job_id=job_id, status=status, value=delta)
+        except IntegrityError:
+            # Created concurrently since the UPDATE found nothing
+            counter.update(value=F('value') + delta)
+
+
+def read_job_counters(job_id):
+    """A job's status counters as a status -> value dict, read with one query."""
+    return dict(JobStatusCounter.objects.filter(job_id=job_id).values_list('status', 'value'))
+
+
+def read_job_counters_for(job_ids):
+    """The status counters of several jobs as job id -> {status: value}, read with one query."""
+    counters = {job_id: {} for job_id in job_ids}
+    for job_id, status, value in JobStatusCounter.objects.filter(job_id__in=counters).values_list(
+            'job_id', 'status', 'value'):
+        counters[job_id][status] = value
+    return counters
+
+
+def read_counters():
+    """All counters as a name -> value dict, read with one query."""
+    return dict(PlatformCounter.objects.values_list('name', 'value'))
+
+
+def count_platform():
+    """Count the live rows from scratch, in the same shape as read_counters()."""
+    # Imported lazily: jobs.models and portal_auth.models import this app's models
+    from jobs.models import Job, Application
+    from portal_auth.models import User
+
+    totals = Counter()
+    for row in User.objects.filter(deleted_at__isnull=True).order_by().values('role').annotate(total=Count('pk')):
+        totals[USERS] += row['total']
+        totals[role_counter(row['role'])] += row['total']
+    totals[JOBS] = Job.objects.count()
+    statuses = Application.objects.live().order_by().values('status').annotate(total=Count('pk'))
+    totals.update(application_changes({row['status']: row['total'] for row in statuses}))
+    return totals
+
+
+def count_job_statuses():
+    """Count the applications of live applicants per job and status from scratch."""
+    # Imported lazily: jobs.models imports this module
+    from jobs.models import Application
+
+    counted = Application.all_objects.filter(applicant__deleted_at__isnull=True).order_by()
+    return Counter({(job_id, status): total for job_id, status, total in counted.values_list(
+        'job_id', 'status').annotate(total=Count('pk'))})
+
+
+def reconcile_job_counters():
+    """
+    Recount the per-job status counters and correct drifted ones.
+
+    Returns:
+        dict: (job id, status) -> (stored value, actual value) for each corrected counter.
+    """
+    with transaction.atomic():
+        stored = {(counter.job_id, counter.status): counter for counter in JobStatusCounter.objects.select_for_update()}
+        actual = count_job_statuses()
+        drift = {}
+        for key in sorted(set(stored) | set(actual)):
+            counter = stored.get(key)
+            value = counter.value if counter else 0
+            if value != actual[key]:
+                drift[key] = (value, actual[key])
+        for (job_id, status), (_, value) in drift.items():
+            JobStatusCounter.objects.update_or_create(job_id=job_id, status=status, defaults={'value': value})
+    if drift:
+        logger.warning(f"reconcile_job_counters: Corrected {len(drift)} drifted job counter(s)")
+    return drift
+
+
+def reconcile_counters():
+    """
+    Recount everything and correct counters that have drifted.
+
+    Returns:
+        dict: counter name -> (stored value, actual value) for each corrected counter.
+    """
+    with transaction.atomic():
+        # Locking the counters holds back incremental updates while the totals are recounted
+        stored = {counter.name: counter for counter in PlatformCounter.objects.select_for_update()}
+        actual = count_platform()
+        drift = {}
+        for name in sorted(set(stored) | set(actual)):
+            counter = stored.get(name)
+            value = counter.value if counter else 0
+            if value != actual[name]:
+                drift[name] = (value, actual[name])
+        now = timezone.now()
+        for name, (_, value) in drift.items():
+            PlatformCounter.objects.update_or_create(name=name, defaults={'value': value, 'updated_at': now})
+    if drift:
+        logger.warning(f"reconcile_counters: Corrected {len(drift)} drifted counter(s): {drift}")
+    return drift
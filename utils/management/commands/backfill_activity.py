@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from utils.activity import first_activity_day, rebuild_activity
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily activity buckets of the admin dashboard from the users, jobs and status events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Only rebuild the last N days (default: everything since the first record)')
+        parser.add_argument('--window', type=int, default=31, help='Days rebuilt per transaction')
+
+    def handle(self, *args, **options):
+        end = timezone.localdate()
+        if options['days']:
+            start = end - timedelta(days=options['days'] - 1)
+        else:
+            start = first_activity_day()
+            if start is None:
+                self.stdout.write(self.style.SUCCESS('Nothing to backfill'))
+                return
+
+        written = 0
+        window_start = start
+        while window_start <= end:
+            window_end = min(window_start + timedelta(days=options['window'] - 1), end)
+            written += rebuild_activity(window_start, window_end)
+            self.stdout.write(f'  {window_start} to {window_end} done')
+            window_start = window_end + timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} daily bucket(s) from {start} to {end}'))
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utils.utils import expire_chunked_uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete chunked uploads idle for longer than CHUNKED_UPLOAD_EXPIRY_HOURS, and their part files'
+
+    def handle(self, *args, **options):
+        deleted, removed = expire_chunked_uploads()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} upload(s) idle for over {settings.CHUNKED_UPLOAD_EXPIRY_HOURS} hour(s), '
+            f'removed {removed} part file(s)'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from utils.counters import read_counters, reconcile_counters, reconcile_job_counters
+
+
+class Command(BaseCommand):
+    help = 'Recount users, jobs and applications and correct drifted dashboard and per-job counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--show', action='store_true', help='List the counters after reconciling')
+
+    def handle(self, *args, **options):
+        drift = reconcile_counters()
+        for name, (stored, actual) in drift.items():
+            self.stdout.write(f'  {name}: {stored} -> {actual}')
+        job_drift = reconcile_job_counters()
+        for (job_id, status), (stored, actual) in job_drift.items():
+            self.stdout.write(f'  job {job_id} {status}: {stored} -> {actual}')
+        if options['show']:
+            for name, value in sorted(read_counters().items()):
+                self.stdout.write(f'{name}: {value}')
+        self.stdout.write(self.style.SUCCESS(f'Corrected {len(drift) + len(job_drift)} counter(s)'))
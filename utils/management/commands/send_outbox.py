@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+import time
+
+from utils.models import OutboxEmail
+from utils.outbox import deliver_outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Messages sent per connection (default OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new messages')
+        parser.add_argument('--interval', type=int, default=10, help='Seconds between polls with --loop')
+        parser.add_argument('--requeue-dead', action='store_true', help='Give dead-lettered messages a fresh set of attempts')
+
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            requeued = OutboxEmail.objects.filter(status='dead').update(
+                status='pending', attempts=0, next_attempt_at=timezone.now())
+            self.stdout.write(f'Re-queued {requeued} dead-lettered message(s)')
+
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = deliver_outbox(options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+            if not sent and not failed:
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Sent {total_sent} message(s), {total_failed} failed'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from utils.storage_cache import get_storage_cache
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss metrics and usage of the local storage cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clear', action='store_true', help='Delete all cached files and reset the counters')
+
+    def handle(self, *args, **options):
+        cache = get_storage_cache()
+        if options['clear']:
+            cache.clear()
+            self.stdout.write(self.style.SUCCESS(f'Cleared storage cache at {cache.directory}'))
+            return
+
+        stats = cache.stats()
+        self.stdout.write(f'Directory: {cache.directory}')
+        self.stdout.write(f"Usage: {stats['entries']} file(s), {filesizeformat(stats['bytes'])} of {filesizeformat(stats['max_bytes'])}")
+        self.stdout.write(
+            f"Hits: {stats['hits']}  Misses: {stats['misses']}  Evictions: {stats['evictions']}  "
+            f"Hit ratio: {stats['hit_ratio']:.1%}"
+        )
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from utils.storage_gc import run_storage_gc
+
+
+class Command(BaseCommand):
+    help = 'Delete resumes, company logos and profile pictures no longer referenced in the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age', type=int, default=24,
+                            help='Hours a file must be unchanged before it may be removed (uploads in flight are younger)')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be removed')
+        parser.add_argument('--local-only', action='store_true', help='Skip the S3 bucket')
+        parser.add_argument('--s3-only', action='store_true', help='Skip local media storage')
+
+    def handle(self, *args, **options):
+        result = run_storage_gc(
+            min_age=timedelta(hours=options['min_age']),
+            dry_run=options['dry_run'],
+            local=not options['s3_only'],
+            s3=not options['local_only'],
+        )
+        self.stdout.write(f'Scanned {result.scanned} file(s), {result.orphaned} unreferenced')
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Dry run: {result.orphaned} file(s) would be removed'))
+            return
+        if result.failed:
+            self.stdout.write(self.style.WARNING(f'{result.failed} file(s) could not be removed; see the log'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {result.deleted} file(s) ({filesizeformat(result.freed_bytes)}) '
+            f'and {result.blobs_pruned} unused resume blob(s)'))
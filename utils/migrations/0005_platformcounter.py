@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:39
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def seed_counters(apps, schema_editor):
+    """Start the counters from the current totals of live rows."""
+    User = apps.get_model('portal_auth', 'User')
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('jobs', 'Application')
+    PlatformCounter = apps.get_model('utils', 'PlatformCounter')
+
+    totals = {'users': 0, 'jobs': Job.objects.filter(deleted_at__isnull=True).count(), 'applications': 0}
+    for role, total in User.objects.filter(deleted_at__isnull=True).values_list('role').annotate(Count('pk')).order_by():
+        totals['users'] += total
+        totals[f'users.{role}'] = total
+    live = Application.objects.filter(job__deleted_at__isnull=True, applicant__deleted_at__isnull=True)
+    for status, total in live.values_list('status').annotate(Count('pk')).order_by():
+        totals['applications'] += total
+        totals[f'applications.{status}'] = total
+    PlatformCounter.objects.bulk_create([PlatformCounter(name=name, value=value) for name, value in totals.items()])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0004_outboxemail'),
+        ('jobs', '0008_job_deleted_at'),
+        ('portal_auth', '0002_user_deleted_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Platform Counter',
+                'verbose_name_plural': 'Platform Counters',
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0005_platformcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('metric', models.CharField(choices=[('signups', 'Signups'), ('jobs', 'Jobs posted'), ('applications', 'Applications')], max_length=20)),
+                ('dimension', models.CharField(max_length=50)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Daily Activity',
+                'verbose_name_plural': 'Daily Activity',
+                'constraints': [models.UniqueConstraint(fields=('day', 'metric', 'dimension'), name='uq_daily_activity')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def seed_job_counters(apps, schema_editor):
+    """Start the per-job counters from the current applications of live applicants."""
+    Application = apps.get_model('jobs', 'Application')
+    JobStatusCounter = apps.get_model('utils', 'JobStatusCounter')
+
+    counted = Application.objects.filter(applicant__deleted_at__isnull=True)
+    JobStatusCounter.objects.bulk_create(
+        [JobStatusCounter(job_id=job_id, status=status, value=total)
+         for job_id, status, total in counted.values_list('job_id', 'status').annotate(Count('pk')).order_by()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_application_keyset_indexes'),
+        ('utils', '0006_dailyactivity'),
+        ('portal_auth', '0003_admin_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobStatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=20)),
+                ('value', models.BigIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_counters', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Job Status Counter',
+                'verbose_name_plural': 'Job Status Counters',
+                'constraints': [models.UniqueConstraint(fields=('job', 'status'), name='uq_job_status_counter')],
+            },
+        ),
+        migrations.RunPython(seed_job_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:27
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_created_at(apps, schema_editor):
+    """Start existing blobs from their creation time, as the garbage collector did so far."""
+    ResumeBlob = apps.get_model('utils', 'ResumeBlob')
+    ResumeBlob.objects.update(last_used_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0007_jobstatuscounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeblob',
+            name='last_used_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
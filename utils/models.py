@@ -1,3 +1,319 @@
+import os
+import uuid
+from datetime import timedelta
+
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.conf import settings
+from django.utils import timezone
+
+
+class ChunkedUploadQuerySet(models.QuerySet):
+    """Uploads split by whether they are still within CHUNKED_UPLOAD_EXPIRY_HOURS of their last activity."""
+
+    def fresh(self):
+        return self.filter(updated_at__gte=ChunkedUpload.expiry_cutoff())
+
+    def stale(self):
+        return self.filter(updated_at__lt=ChunkedUpload.expiry_cutoff())
+
+
+class ChunkedUpload(models.Model):
+    """
+    A resumable file upload assembled from sequential chunks.
+
+    Clients open an upload, append chunks in order (each verified against a
+    SHA-256 checksum) and finally mark it complete. Chunks are written straight
+    into a part file under CHUNKED_UPLOAD_DIR, so the file is never held in memory.
+    An upload left idle for CHUNKED_UPLOAD_EXPIRY_HOURS is stale: its id is no
+    longer accepted and the expire_uploads command deletes it and its part file.
+
+    Attributes:
+        id (UUIDField): Opaque upload id handed to the client
+        user (ForeignKey): The user who owns the upload
+        filename (CharField): Sanitized original filename
+        content_type (CharField): MIME type reported by the client
+        total_size (BigIntegerField): Expected size of the finished file in bytes
+        received_bytes (BigIntegerField): Number of bytes appended so far
+        next_chunk (PositiveIntegerField): Index of the next expected chunk
+        status (CharField): uploading, complete or consumed
+        created_at (DateTimeField): When the upload was opened
+        updated_at (DateTimeField): When the last chunk was received
+    """
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+        ('consumed', 'Consumed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='chunked_uploads')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    total_size = models.BigIntegerField()
+    received_bytes = models.BigIntegerField(default=0)
+    next_chunk = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading', db_index=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ChunkedUploadQuerySet.as_manager()
+
+    @staticmethod
+    def expiry_cutoff():
+        """Uploads last updated before this time are stale."""
+        return timezone.now() - timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRY_HOURS)
+
+    @property
+    def part_path(self):
+        """Absolute path of the part file the chunks are appended to."""
+        return os.path.join(settings.CHUNKED_UPLOAD_DIR, f'{self.id.hex}.part')
+
+    def to_dict(self):
+        """State returned to the client so it can resume an interrupted upload."""
+        return {
+            'upload_id': str(self.id),
+            'status': self.status,
+            'filename': self.filename,
+            'total_size': self.total_size,
+            'received_bytes': self.received_bytes,
+            'next_chunk': self.next_chunk,
+            'chunk_size': settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+        }
+
+    def __str__(self):
+        """String representation of the ChunkedUpload object."""
+        return f'Upload {self.id} ({self.filename}, {self.received_bytes}/{self.total_size} bytes)'
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Chunked Upload"
+        verbose_name_plural = "Chunked Uploads"
+
+
+class ResumeBlob(models.Model):
+    """
+    A resume file stored once under a content-addressed key.
+
+    Identical files uploaded by any number of applications share one stored
+    object; applications point at it through Application.resume_blob and
+    ref_count tracks how many do, so unreferenced blobs can be reclaimed.
+
+    Attributes:
+        sha256 (CharField): Hex SHA-256 digest of the file contents
+        storage_key (CharField): Object path below 'media/resumes/' (e.g. 'blobs/ab/<sha256>.pdf')
+        size (BigIntegerField): File size in bytes
+        content_type (CharField): MIME type of the first upload
+        ref_count (PositiveIntegerField): Number of applications referencing the blob
+        created_at (DateTimeField): When the blob was first stored
+        last_used_at (DateTimeField): When an upload last stored or reused the blob; the
+            garbage collector leaves unreferenced blobs alone for a while after this
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    storage_key = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField()
+    content_type = models.CharField(max_length=100, blank=True)
+    ref_count = models.PositiveIntegerField(default=0, db_index=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    @classmethod
+    def refresh_ref_counts(cls, blob_ids):
+        """
+        Recompute ref_count from the applications table for the given blobs.
+
+        Used after bulk operations (bulk_create, queryset updates) that bypass
+        the signals keeping ref_count in step.
+        """
+        # Imported lazily: jobs.models references this model
+        from jobs.models import Application
+        # all_objects: applications awaiting purge_deleted still hold their blob
+        references = Application.all_objects.filter(resume_blob=models.OuterRef('pk')).order_by().values(
+            'resume_blob').annotate(total=models.Count('pk')).values('total')
+        cls.objects.filter(pk__in=blob_ids).update(
+            ref_count=Coalesce(models.Subquery(references), 0))
+
+    def __str__(self):
+        """String representation of the ResumeBlob object."""
+        return f'{self.sha256[:12]} ({self.size} bytes, {self.ref_count} refs)'
+
+    class Meta:
+        verbose_name = "Resume Blob"
+        verbose_name_plural = "Resume Blobs"
+
+
+class RollupWatermark(models.Model):
+    """
+    Progress marker of an incremental rollup job.
+
+    Rollups read their source rows in primary key order and store the last key
+    they folded in, so the next run only reads newer rows.
+
+    Attributes:
+        name (CharField): Rollup identifier (e.g. 'employer.funnel')
+        position (BigIntegerField): Highest source primary key already rolled up
+        updated_at (DateTimeField): When the rollup last advanced
+    """
+    name = models.CharField(max_length=100, unique=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """String representation of the RollupWatermark object."""
+        return f'{self.name} @ {self.position}'
+
+    class Meta:
+        verbose_name = "Rollup Watermark"
+        verbose_name_plural = "Rollup Watermarks"
+
+
+class PlatformCounter(models.Model):
+    """
+    A running total shown on the admin dashboard (see utils.counters).
+
+    Counters are adjusted with F() increments as users, jobs and applications
+    are created, change role or status, or are deleted, so the dashboard
+    never counts the big tables. The reconcile_counters command recomputes
+    them to correct any drift.
+
+    Attributes:
+        name (CharField): Counter identifier (e.g. 'users', 'applications.hired')
+        value (BigIntegerField): Current total
+        updated_at (DateTimeField): When the counter last changed
+    """
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        """String representation of the PlatformCounter object."""
+        return f'{self.name} = {self.value}'
+
+    class Meta:
+        verbose_name = "Platform Counter"
+        verbose_name_plural = "Platform Counters"
+
+
+class JobStatusCounter(models.Model):
+    """
+    Number of a job's applications in one status (see utils.counters).
+
+    Counts the applications of live applicants, whatever the state of the job,
+    and is adjusted wherever the platform counters are, so the employer's
+    applicant list shows its per-status totals without grouping the job's
+    applications on every page.
+
+    Attributes:
+        job (ForeignKey): The job the count belongs to
+        status (CharField): Application status
+        value (BigIntegerField): Current number of applications in the status
+    """
+    job = models.ForeignKey('jobs.Job', on_delete=models.CASCADE, related_name='status_counters')
+    status = models.CharField(max_length=20)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        """String representation of the JobStatusCounter object."""
+        return f'Job {self.job_id} {self.status} = {self.value}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'status'], name='uq_job_status_counter')
+        ]
+        verbose_name = "Job Status Counter"
+        verbose_name_plural = "Job Status Counters"
+
+
+class DailyActivity(models.Model):
+    """
+    Number of records created per day, broken down by one attribute.
+
+    One row per day, metric and dimension value: signups by role, jobs posted
+    by category and applications entering each status (from the status events,
+    so 'applied' counts submissions). Rows are incremented as the records are
+    created (see utils.activity) and rebuilt by the backfill_activity command;
+    the admin dashboard charts only these rows. Deletions do not change them.
+
+    Attributes:
+        day (DateField): Calendar day (in TIME_ZONE) the records were created
+        metric (CharField): signups, jobs or applications
+        dimension (CharField): Role, category or status the count is for
+        count (BigIntegerField): Records created that day
+    """
+    METRIC_CHOICES = [
+        ('signups', 'Signups'),
+        ('jobs', 'Jobs posted'),
+        ('applications', 'Applications'),
+    ]
+
+    day = models.DateField()
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    dimension = models.CharField(max_length=50)
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        """String representation of the DailyActivity object."""
+        return f'{self.day} {self.metric}/{self.dimension}: {self.count}'
+
+    class Meta:
+        constraints = [
+            # Day first: the dashboard reads every metric for a range of days
+            models.UniqueConstraint(fields=['day', 'metric', 'dimension'], name='uq_daily_activity')
+        ]
+        verbose_name = "Daily Activity"
+        verbose_name_plural = "Daily Activity"
+
+
+class OutboxEmail(models.Model):
+    """
+    An email waiting to be delivered by the send_outbox worker.
+
+    Views queue messages in the same transaction as the change they report,
+    so an email is sent if and only if the change was committed, and a slow or
+    failing mail server never holds up a request. Failed deliveries are
+    retried with exponential backoff; after OUTBOX_MAX_ATTEMPTS the message
+    is dead-lettered (status 'dead') and kept for inspection.
+
+    Attributes:
+        subject (CharField): Subject line
+        body (TextField): Plain-text body
+        from_email (CharField): Sender address (DEFAULT_FROM_EMAIL if blank)
+        to (JSONField): List of recipient addresses
+        reply_to (JSONField): List of Reply-To addresses
+        status (CharField): pending, sent or dead
+        attempts (PositiveIntegerField): Delivery attempts made so far
+        next_attempt_at (DateTimeField): Earliest time of the next delivery attempt
+        last_error (TextField): Error of the last failed attempt
+        created_at (DateTimeField): When the email was queued
+        sent_at (DateTimeField): When the email was delivered
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    to = models.JSONField(default=list)
+    reply_to = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        """String representation of the OutboxEmail object."""
+        return f"'{self.subject}' to {', '.join(self.to)} ({self.status})"
 
-# Create your models here.
+    class Meta:
+        indexes = [
+            # The worker's "due messages" query
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+        verbose_name = "Outbox Email"
+        verbose_name_plural = "Outbox Emails"
@@ -0,0 +1,124 @@
+# utils/outbox.py
+
+"""
+Transactional email outbox.
+
+queue_email() stores a message as an OutboxEmail row. Called inside the
+transaction that makes the change the email reports, the message is
+committed (or rolled back) together with it.
+
+deliver_outbox() is run by the send_outbox management command. It claims a
+batch of due messages, sends them over a single SMTP connection and records
+the outcome: delivered messages are marked sent, failed ones are rescheduled
+with exponential backoff and dead-lettered after OUTBOX_MAX_ATTEMPTS.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed message is hidden from other workers while it is being sent
+CLAIM_LEASE_SECONDS = 300
+
+
+def queue_email(subject, body, to, reply_to=None, from_email=''):
+    """
+    Queue an email for delivery by the outbox worker.
+
+    Args:
+        subject (str): Subject line
+        body (str): Plain-text body
+        to (list): Recipient addresses
+        reply_to (list): Optional Reply-To addresses
+        from_email (str): Sender; DEFAULT_FROM_EMAIL when empty
+
+    Returns:
+        OutboxEmail: The queued message.
+    """
+    return OutboxEmail.objects.create(
+        subject=subject[:255], body=body, to=list(to), reply_to=list(reply_to or []), from_email=from_email)
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt after the given number of failed attempts."""
+    seconds = settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.OUTBOX_RETRY_MAX_SECONDS))
+
+
+def _claim_batch(batch_size):
+    """Lock the next due messages against other workers by pushing their next attempt out."""
+    now = timezone.now()
+    with transaction.atomic():
+        # skip_locked lets concurrent workers claim disjoint batches
+        due = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if due:
+            OutboxEmail.objects.filter(pk__in=[message.pk for message in due]).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS))
+    return due
+
+
+def deliver_outbox(batch_size=None):
+    """
+    Send one batch of due messages over a single mail server connection.
+
+    Returns:
+        tuple: (sent, failed) counts for the batch; (0, 0) if nothing was due.
+    """
+    batch = _claim_batch(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not batch:
+        return 0, 0
+
+    sent_ids, failures = [], []
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Server unreachable: the whole batch counts as one failed attempt
+        logger.error(f"deliver_outbox: Could not connect to the mail server: {str(e)}")
+        failures = [(message, str(e)) for message in batch]
+    else:
+        try:
+            for message in batch:
+                email = EmailMessage(
+                    subject=message.subject, body=message.body,
+                    from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+                    to=message.to, reply_to=message.reply_to or None, connection=connection)
+                try:
+                    # One message at a time so a rejected recipient only fails its own message
+                    connection.send_messages([email])
+                    sent_ids.append(message.pk)
+                except Exception as e:
+                    logger.warning(f"deliver_outbox: Sending email {message.pk} failed: {str(e)}")
+                    failures.append((message, str(e)))
+        finally:
+            connection.close()
+
+    now = timezone.now()
+    if sent_ids:
+        OutboxEmail.objects.filter(pk__in=sent_ids).update(status='sent', sent_at=now, last_error='')
+    for message, error in failures:
+        message.attempts += 1
+        message.last_error = error[:2000]
+        if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            message.status = 'dead'
+            logger.error(f"deliver_outbox: Email {message.pk} dead-lettered after {message.attempts} attempts: {error}")
+        else:
+            message.next_attempt_at = now + retry_delay(message.attempts)
+    if failures:
+        OutboxEmail.objects.bulk_update(
+            [message for message, _ in failures], ['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+    logger.info(f"deliver_outbox: {len(sent_ids)} sent, {len(failures)} failed")
+    return len(sent_ids), len(failures)
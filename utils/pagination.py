@@ -0,0 +1,256 @@
+# utils/pagination.py
+
+"""
+Keyset (seek) pagination for large querysets.
+
+Instead of OFFSET, each page is requested with an opaque cursor holding the
+sort key of the row it starts after (or before, when paging back). The query
+becomes "WHERE key > cursor ORDER BY key LIMIT n", which an index on the sort
+key answers without reading the skipped rows, so the last page costs the same
+as the first. The ordering must end in a unique field (usually 'id') so the
+key identifies exactly one row.
+
+EstimatedCountPaginator serves the page-numbered Django admin changelists,
+where a full COUNT(*) of a large table costs more than the page itself.
+"""
+
+import json
+import base64
+import binascii
+import logging
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+# Largest number of rows counted exactly for a page-numbered list
+COUNT_LIMIT = 10000
+
+
+class KeysetPage:
+    """
+    One page of a keyset-paginated queryset.
+
+    Attributes:
+        items (list): Rows on this page, in the requested order
+        next_cursor (str): Cursor of the following page, or None on the last page
+        previous_cursor (str): Cursor of the preceding page, or None on the first page
+    """
+
+    def __init__(self, items, next_cursor, previous_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+
+def encode_cursor(direction, values):
+    """Serialize a sort key into a URL-safe cursor string."""
+    values = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    payload = json.dumps({'d': direction, 'v': values}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, key_length):
+    """
+    Parse a cursor produced by encode_cursor().
+
+    Returns:
+        tuple: (direction, values), or None if the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        direction, values = payload['d'], payload['v']
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        return None
+    if direction not in ('next', 'prev') or not isinstance(values, list) or len(values) != key_length:
+        return None
+    return direction, values
+
+
+def _seek_filter(ordering, values):
+    """
+    Rows strictly after the given key in the given ordering.
+
+    Expands (a, b, c) > (x, y, z) into a OR of prefix matches so that
+    fields may be sorted in different directions.
+    """
+    condition = Q()
+    for position, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        term = Q(**{f'{name}__{lookup}': values[position]})
+        for previous_field, previous_value in zip(ordering[:position], values[:position]):
+            term &= Q(**{previous_field.lstrip('-'): previous_value})
+        condition |= term
+    return condition
+
+
+def _key_of(item, ordering):
+    """Sort key values of a model instance (related fields via '__')."""
+    values = []
+    for field in ordering:
+        value = item
+        for attribute in field.lstrip('-').split('__'):
+            value = getattr(value, attribute)
+        values.append(value)
+    return values
+
+
+def _reverse(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+def paginate_keyset(queryset, ordering, cursor=None, page_size=50):
+    """
+    Return one page of a queryset using keyset pagination.
+
+    Args:
+        queryset (QuerySet): Rows to paginate (any filters already applied).
+        ordering (list): Sort fields, '-' prefixed for descending; the last one must be unique.
+        cursor (str): Cursor from a previous page's next_cursor/previous_cursor,
+                      or None/'' for the first page. Malformed cursors are ignored.
+        page_size (int): Maximum number of rows per page.
+
+    Returns:
+        KeysetPage: The requested page.
+    """
+    ordering = list(ordering)
+    decoded = decode_cursor(cursor, len(ordering)) if cursor else None
+    if cursor and decoded is None:
+        logger.warning(f"paginate_keyset: Ignoring malformed cursor '{cursor[:100]}'")
+
+    direction = decoded[0] if decoded else 'next'
+    query_ordering = ordering if direction == 'next' else _reverse(ordering)
+    page_rows = queryset.order_by(*query_ordering)
+    if decoded:
+        try:
+            # Values of the wrong type for their field fail here, while the lookups are prepared
+            page_rows = page_rows.filter(_seek_filter(query_ordering, decoded[1]))
+        except (ValidationError, TypeError, ValueError) as e:
+            logger.warning(f"paginate_keyset: Ignoring cursor with invalid values '{cursor[:100]}': {e}")
+            decoded, direction = None, 'next'
+            page_rows = queryset.order_by(*ordering)
+
+    # One extra row tells whether there is a further page in this direction
+    rows = list(page_rows[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == 'prev':
+        rows.reverse()
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if direction == 'prev' or has_more:
+            next_cursor = encode_cursor('next', _key_of(rows[-1], ordering))
+        if (direction == 'next' and decoded) or (direction == 'prev' and has_more):
+            previous_cursor = encode_cursor('prev', _key_of(rows[0], ordering))
+    return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+def resolve_sort(sort, orderings, default):
+    """
+    Map a ?sort= value to a keyset ordering.
+
+    Args:
+        sort (str): Column name, '-' prefixed for descending (e.g. '-posted')
+        orderings (dict): Column name -> ascending ordering ending in a unique field
+        default (str): Sort used when the value is missing or unknown
+
+    Returns:
+        tuple: (sort, ordering) with the sort value actually applied.
+    """
+    column = (sort or '').lstrip('-')
+    if column not in orderings:
+        sort, column = default, default.lstrip('-')
+    ordering = list(orderings[column])
+    return sort, _reverse(ordering) if sort.startswith('-') else ordering
+
+
+def sort_links(sort, columns):
+    """
+    Sort state of each sortable column header, for building its link.
+
+    Returns:
+        dict: column -> {'sort': value to request when the header is clicked,
+              'direction': 'asc', 'desc' or None if the list is sorted by another column}
+    """
+    links = {}
+    for column in columns:
+        if sort == column:
+            links[column] = {'sort': f'-{column}', 'direction': 'asc'}
+        elif sort == f'-{column}':
+            links[column] = {'sort': column, 'direction': 'desc'}
+        else:
+            links[column] = {'sort': column, 'direction': None}
+    return links
+
+
+def estimated_row_count(model, using='default'):
+    """
+    The planner's estimate of a model's table size, or None where unavailable.
+
+    PostgreSQL keeps the estimate in pg_class.reltuples (updated by VACUUM and
+    ANALYZE), so reading it costs nothing however big the table is. Other
+    databases return None.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)',
+                       [connection.ops.quote_name(model._meta.db_table)])
+        row = cursor.fetchone()
+    # -1: the table has never been analyzed
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Page-number paginator that never counts more than COUNT_LIMIT rows.
+
+    An unfiltered list of a big table uses the planner's row estimate; any
+    other list counts at most COUNT_LIMIT rows ("SELECT COUNT(*) FROM
+    (... LIMIT n)"), so pages past the first COUNT_LIMIT rows are only
+    reachable by narrowing the filters. Meant for querysets; other sequences are counted
+    with len() as usual.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > COUNT_LIMIT:
+                return estimate
+        return queryset.order_by()[:COUNT_LIMIT].count()
@@ -0,0 +1,52 @@
+# utils/search.py
+
+"""
+Case-insensitive prefix search and sorting that an index can answer.
+
+Lists search and sort by lower_key(field), an expression indexed as is
+(e.g. models.Index(lower_key('title'), 'id')). The key is compared by code
+point (COLLATE "C" on PostgreSQL): under the database's default linguistic
+collation neither does every string starting with a prefix sort between the
+prefix and the prefix followed by the highest code point, nor would an index
+built with one collation serve comparisons made under another. Queries and
+indexes therefore have to use the same expression.
+"""
+
+from django.db.models import Func, Q
+from django.db.models.functions import Lower
+
+# Sorts after every character, so prefix + this bounds all strings starting with prefix
+HIGHEST_CODE_POINT = '\U0010ffff'
+
+
+class CodePointOrder(Func):
+    """
+    An expression compared and sorted by code point.
+
+    COLLATE "C" on PostgreSQL; SQLite already compares text that way (BINARY)
+    and gets the bare expression. Not a Collate subclass: index definitions only
+    accept Collate itself at the top level.
+    """
+    template = '%(expressions)s COLLATE "C"'
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return compiler.compile(self.get_source_expressions()[0])
+
+
+def lower_key(field):
+    """The lower-cased, code point ordered search and sort key of a text field."""
+    return CodePointOrder(Lower(field))
+
+
+def prefix_match(fields, prefix):
+    """
+    Rows where any of the given lower_key() annotations starts with prefix.
+
+    Written as a range (key >= prefix and key < prefix + highest code point)
+    rather than LIKE, so the index on the key expression answers it.
+    """
+    prefix = prefix.lower()
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + HIGHEST_CODE_POINT})
+    return condition
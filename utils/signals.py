@@ -0,0 +1,99 @@
+# utils/signals.py
+from django.db.models import Exists
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+import logging
+
+from jobs.models import Job, Application, ApplicationStatusEvent
+from portal_auth.models import User
+from . import activity
+from .counters import (
+    USERS, JOBS, adjust_counters, adjust_job_counters, application_changes, deleting_uncounted, role_counter)
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(pre_save, sender=User)
+def remember_counted_role(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Note the stored role of a live account being saved, so a role change can move the counters."""
+    if instance.pk and not raw and (update_fields is None or 'role' in update_fields):
+        instance._counted_role = User.objects.filter(
+            pk=instance.pk, deleted_at__isnull=True).values_list('role', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def count_user(sender, instance, created, raw=False, **kwargs):
+    """Count a new account, or move a changed one to its new role."""
+    previous_role = instance.__dict__.pop('_counted_role', None)
+    if raw or instance.deleted_at is not None:
+        return
+    if created:
+        adjust_counters({USERS: 1, role_counter(instance.role): 1})
+    elif previous_role and previous_role != instance.role:
+        adjust_counters({role_counter(previous_role): -1, role_counter(instance.role): 1})
+
+
+@receiver(post_delete, sender=User)
+def uncount_user(sender, instance, **kwargs):
+    """Drop a live account deleted outright (marked accounts were uncounted by mark_deleted)."""
+    if instance.deleted_at is None:
+        adjust_counters({USERS: -1, role_counter(instance.role): -1})
+
+
+@receiver(post_save, sender=Job)
+def count_job(sender, instance, created, raw=False, **kwargs):
+    """Count a newly posted job."""
+    if created and not raw and instance.deleted_at is None:
+        adjust_counters({JOBS: 1})
+
+
+@receiver(post_delete, sender=Job)
+def uncount_job(sender, instance, **kwargs):
+    """Drop a live job deleted outright (marked jobs were uncounted by mark_deleted)."""
+    if instance.deleted_at is None:
+        adjust_counters({JOBS: -1})
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, raw=False, **kwargs):
+    """Count a new application under its status (status changes go through Application.set_status)."""
+    if created and not raw:
+        adjust_counters(application_changes({instance.status: 1}))
+        adjust_job_counters({(instance.job_id, instance.status): 1})
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    """Drop a deleted application from the counters that still count it."""
+    if deleting_uncounted():
+        return
+    # Deleted outright, possibly along with a marked job or account: the job counters count
+    # applications of live applicants, the platform counters only those of live jobs too
+    job_live = User.objects.filter(pk=instance.applicant_id, deleted_at__isnull=True).annotate(
+        job_live=Exists(Job.objects.filter(pk=instance.job_id))).values_list('job_live', flat=True).first()
+    if job_live is None:
+        return
+    adjust_job_counters({(instance.job_id, instance.status): -1})
+    if job_live:
+        adjust_counters(application_changes({instance.status: 1}, sign=-1))
+
+
+@receiver(post_save, sender=User)
+def record_signup(sender, instance, created, raw=False, **kwargs):
+    """Add a new account to the day's signups."""
+    if created and not raw:
+        activity.record_activity(activity.SIGNUPS, [(instance.date_joined, instance.role)])
+
+
+@receiver(post_save, sender=Job)
+def record_job_posted(sender, instance, created, raw=False, **kwargs):
+    """Add a new job to the day's postings."""
+    if created and not raw:
+        activity.record_activity(activity.JOBS, [(instance.posted_date, instance.category)])
+
+
+@receiver(post_save, sender=ApplicationStatusEvent)
+def record_status_event(sender, instance, created, raw=False, **kwargs):
+    """Add a submission or status change to the day's application activity."""
+    if created and not raw:
+        activity.record_activity(activity.APPLICATIONS, [(instance.created_at, instance.to_status)])
@@ -0,0 +1,218 @@
+# utils/storage_cache.py
+
+"""
+Size-capped, read-through disk cache for objects kept in S3.
+
+Cached copies live under STORAGE_CACHE_DIR, named after a hash of the object
+key. A small SQLite index next to them records each entry's size and last
+access; once the cached bytes exceed STORAGE_CACHE_MAX_BYTES the least
+recently used entries are deleted. Files are filled through a temporary file
+and renamed into place, so readers never see a partial download. The index
+also keeps each object's ETag as reported by the fill, so responses served
+from a cached copy carry the same validator as the object itself. Hit, miss
+and eviction counters are kept in the index as well (see StorageCache.stats).
+
+The index is shared by all worker processes on the host; SQLite's locking
+serializes updates.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import tempfile
+from contextlib import closing
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = 'index.sqlite3'
+COUNTERS = ('hits', 'misses', 'evictions')
+
+
+class StorageCache:
+    """
+    Read-through LRU cache of storage objects on local disk.
+
+    Attributes:
+        directory (str): Directory holding the cached files and the index
+        max_bytes (int): Byte budget; 0 disables caching
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def fetch(self, key, fill=None):
+        """
+        Return the local path of a cached object, filling the cache on a miss.
+
+        Args:
+            key (str): Storage key of the object (e.g. the S3 object name)
+            fill (callable): fill(path) writes the object to the given path and
+                             may return its ETag; exceptions propagate to the
+                             caller. None only looks the object up.
+
+        Returns:
+            str: Absolute path of the cached copy, or None if caching is
+                 disabled, the object is larger than the whole budget, or it
+                 is not cached and no fill was given.
+        """
+        if not self.enabled:
+            return None
+        path = self._path_for(key)
+        with closing(self._connect()) as db:
+            row = db.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is not None and os.path.exists(path):
+                with db:
+                    db.execute('UPDATE entries SET last_access = ? WHERE key = ?', (time.time(), key))
+                    self._bump(db, 'hits')
+                logger.debug(f"StorageCache: hit for '{key}'")
+                return path
+
+            with db:
+                self._bump(db, 'misses')
+        if fill is None:
+            return None
+        logger.info(f"StorageCache: miss for '{key}', downloading")
+        return self._store(key, path, fill)
+
+    def open(self, key, fill=None):
+        """
+        Like fetch(), but return the cached copy opened for binary reading.
+
+        Opening right away means a concurrent eviction cannot remove the file
+        before it is read; if it was removed in between, the object is fetched again.
+        """
+        for _ in range(2):
+            path = self.fetch(key, fill)
+            if path is None:
+                return None
+            try:
+                return open(path, 'rb')
+            except FileNotFoundError:
+                logger.info(f"StorageCache: '{key}' evicted before it was opened, retrying")
+        return None
+
+    def etag(self, key):
+        """ETag returned by the fill that cached the object, or None."""
+        with closing(self._connect()) as db:
+            row = db.execute('SELECT etag FROM entries WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def stats(self):
+        """Hit/miss/eviction counters and current usage of the cache."""
+        with closing(self._connect()) as db:
+            counters = dict(db.execute('SELECT name, value FROM counters').fetchall())
+            entries, used = db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        stats = {name: counters.get(name, 0) for name in COUNTERS}
+        lookups = stats['hits'] + stats['misses']
+        stats.update({
+            'entries': entries,
+            'bytes': used,
+            'max_bytes': self.max_bytes,
+            'hit_ratio': stats['hits'] / lookups if lookups else 0.0,
+        })
+        return stats
+
+    def clear(self):
+        """Delete every cached file and reset the index and counters."""
+        with closing(self._connect()) as db:
+            with db:
+                for (key,) in db.execute('SELECT key FROM entries').fetchall():
+                    self._remove_file(self._path_for(key))
+                db.execute('DELETE FROM entries')
+                db.execute('DELETE FROM counters')
+
+    # --- Internals ---
+
+    def _store(self, key, path, fill):
+        """Download into a temp file, rename it into place and evict down to budget."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            etag = fill(temp_path)
+            size = os.path.getsize(temp_path)
+            if size > self.max_bytes:
+                logger.warning(f"StorageCache: '{key}' ({size} bytes) exceeds the cache budget, not caching")
+                self._remove_file(temp_path)
+                return None
+            # Atomic on the same filesystem: readers see the old file or the whole new one
+            os.replace(temp_path, path)
+        except Exception:
+            self._remove_file(temp_path)
+            raise
+
+        with closing(self._connect()) as db:
+            with db:
+                # IMMEDIATE: take the write lock before reading the totals
+                db.execute('BEGIN IMMEDIATE')
+                db.execute(
+                    'INSERT OR REPLACE INTO entries (key, size, last_access, etag) VALUES (?, ?, ?, ?)',
+                    (key, size, time.time(), etag if isinstance(etag, str) else None))
+                self._evict(db, keep=key)
+        return path
+
+    def _evict(self, db, keep):
+        """Drop least recently used entries until the cache fits its budget."""
+        used = db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if used <= self.max_bytes:
+            return
+        candidates = db.execute(
+            'SELECT key, size FROM entries WHERE key != ? ORDER BY last_access', (keep,)).fetchall()
+        evicted = 0
+        for key, size in candidates:
+            if used <= self.max_bytes:
+                break
+            self._remove_file(self._path_for(key))
+            db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            used -= size
+            evicted += 1
+        if evicted:
+            self._bump(db, 'evictions', evicted)
+            logger.info(f"StorageCache: evicted {evicted} entries, {used} bytes in use")
+
+    def _path_for(self, key):
+        """Cache file for a key; hashed to keep names flat and safe, extension kept for type detection."""
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        extension = os.path.splitext(key)[1].lower()
+        return os.path.join(self.directory, digest[:2], f'{digest}{extension}')
+
+    def _connect(self):
+        os.makedirs(self.directory, exist_ok=True)
+        db = sqlite3.connect(os.path.join(self.directory, INDEX_FILENAME), timeout=30, isolation_level=None)
+        db.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL, etag TEXT)')
+        # Indexes created before ETags were recorded
+        if 'etag' not in [column[1] for column in db.execute('PRAGMA table_info(entries)')]:
+            try:
+                db.execute('ALTER TABLE entries ADD COLUMN etag TEXT')
+            except sqlite3.OperationalError:
+                pass # Added by another process in the meantime
+        db.execute('CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)')
+        db.execute('CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        return db
+
+    @staticmethod
+    def _bump(db, name, amount=1):
+        db.execute(
+            'INSERT INTO counters (name, value) VALUES (?, ?) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value', (name, amount))
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def get_storage_cache():
+    """The storage cache configured in settings."""
+    return StorageCache(settings.STORAGE_CACHE_DIR, settings.STORAGE_CACHE_MAX_BYTES)
@@ -0,0 +1,259 @@
+# utils/storage_gc.py
+
+"""
+Garbage collection of stored files nothing refers to any more.
+
+Resumes, company logos and profile pictures stay in storage (MEDIA_ROOT, and
+under 'media/' in the S3 bucket) after the rows pointing at them are gone.
+collect_garbage() streams the storage listing one page at a time, asks the
+database which names of that page are still referenced and deletes the rest,
+so memory stays bounded by the page size however many files there are.
+
+Files younger than the minimum age are never touched: uploads are written
+before the row that references them is committed.
+"""
+
+import os
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.deletion import ProtectedError
+from django.utils import timezone
+
+from .models import ResumeBlob
+from .utils import RESUMES_S3_PREFIX, COMPANY_LOGOS_SUBDIR, PROFILE_UPLOAD_SUBDIR
+
+logger = logging.getLogger(__name__)
+
+# Storage areas collected, relative to MEDIA_ROOT (and below 'media/' in S3)
+GC_PREFIXES = (RESUMES_S3_PREFIX, f'{COMPANY_LOGOS_SUBDIR}/', f'{PROFILE_UPLOAD_SUBDIR}/')
+# Shared placeholders referenced through model field defaults
+DEFAULT_FILES = {f'{COMPANY_LOGOS_SUBDIR}/default.png', f'{PROFILE_UPLOAD_SUBDIR}/default.jpg'}
+# S3 DeleteObjects accepts at most 1000 keys per request
+GC_PAGE_SIZE = 1000
+S3_MEDIA_PREFIX = 'media/'
+
+
+class StorageGCResult:
+    """
+    Outcome of a storage garbage collection run.
+
+    Attributes:
+        scanned (int): Files listed
+        orphaned (int): Unreferenced files old enough to be removed
+        deleted (int): Files actually removed (0 on a dry run)
+        freed_bytes (int): Total size of the removed files
+        failed (int): Files that could not be removed
+        blobs_pruned (int): Unreferenced ResumeBlob rows dropped before the scan
+    """
+
+    def __init__(self):
+        self.scanned = 0
+        self.orphaned = 0
+        self.deleted = 0
+        self.freed_bytes = 0
+        self.failed = 0
+        self.blobs_pruned = 0
+
+
+def iter_local_files(media_root, prefixes=GC_PREFIXES):
+    """
+    Walk the storage areas below media_root with os.scandir.
+
+    Yields:
+        tuple: (name relative to media_root with '/' separators, size, modified datetime)
+    """
+    for prefix in prefixes:
+        pending = [prefix.rstrip('/')]
+        while pending:
+            relative_dir = pending.pop()
+            try:
+                entries = os.scandir(os.path.join(media_root, relative_dir))
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    name = f'{relative_dir}/{entry.name}'
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(name)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        yield name, stat.st_size, datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc)
+
+
+def iter_s3_objects(s3_client, bucket, prefixes=GC_PREFIXES):
+    """
+    List the storage areas in the bucket page by page with list_objects_v2.
+
+    Yields:
+        tuple: (name below 'media/', size, modified datetime)
+    """
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for prefix in prefixes:
+        pages = paginator.paginate(
+            Bucket=bucket, Prefix=f'{S3_MEDIA_PREFIX}{prefix}', PaginationConfig={'PageSize': GC_PAGE_SIZE})
+        for page in pages:
+            for item in page.get('Contents', []):
+                yield item['Key'][len(S3_MEDIA_PREFIX):], item['Size'], item['LastModified']
+
+
+def referenced_names(names):
+    """
+    The subset of the given storage names that rows in the database point at.
+
+    Soft-deleted jobs, applications and users still count: their files go
+    once purge_deleted has removed the rows.
+    """
+    # Imported lazily: jobs.models and portal_auth.models import this app's models
+    from jobs.models import Job, Application
+    from portal_auth.models import User
+
+    names = set(names)
+    referenced = names & DEFAULT_FILES
+    resumes = {name[len(RESUMES_S3_PREFIX):] for name in names if name.startswith(RESUMES_S3_PREFIX)}
+    images = names - {RESUMES_S3_PREFIX + suffix for suffix in resumes}
+    if resumes:
+        for suffix in ResumeBlob.objects.filter(storage_key__in=resumes).values_list('storage_key', flat=True):
+            referenced.add(RESUMES_S3_PREFIX + suffix)
+        # Resumes uploaded before content-addressed storage are stored under their own path
+        for suffix in Application.all_objects.filter(
+                resume_blob__isnull=True, resume_path__in=resumes).values_list('resume_path', flat=True):
+            referenced.add(RESUMES_S3_PREFIX + suffix)
+    if images:
+        referenced.update(Job.all_objects.filter(company_logo__in=images).values_list('company_logo', flat=True))
+        referenced.update(User.objects.filter(profile_picture__in=images).values_list('profile_picture', flat=True))
+    return referenced
+
+
+def prune_unreferenced_blobs(older_than):
+    """
+    Drop ResumeBlob rows no application uses, making their objects collectable.
+
+    Returns:
+        int: Number of rows removed.
+    """
+    # Imported lazily: jobs.models references this app's models
+    from jobs.models import Application
+
+    try:
+        with transaction.atomic():
+            # Locked and re-checked: store_resume_blob claims a blob it reuses by locking the row
+            # and bumping last_used_at, so a claimed blob is either skipped here or waited for
+            unreferenced = list(ResumeBlob.objects.select_for_update(skip_locked=True).filter(
+                ref_count=0, last_used_at__lt=older_than).filter(
+                ~Exists(Application.all_objects.filter(resume_blob=OuterRef('pk')))).values_list('pk', flat=True))
+            # PROTECT on Application.resume_blob stops the delete if an application took the blob meanwhile
+            deleted, _ = ResumeBlob.objects.filter(pk__in=unreferenced).delete()
+    except (ProtectedError, IntegrityError):
+        # IntegrityError: the database's foreign key check caught an application committed meanwhile
+        logger.warning("prune_unreferenced_blobs: A blob was reused while pruning; leaving them for the next run")
+        return 0
+    return deleted
+
+
+def delete_local_files(media_root, entries):
+    """Remove files below media_root; returns the entries that were removed."""
+    removed = []
+    for entry in entries:
+        try:
+            os.remove(os.path.join(media_root, entry[0]))
+        except FileNotFoundError:
+            pass # Already gone, which is all that was asked
+        except OSError as e:
+            logger.error(f"delete_local_files: Could not remove '{entry[0]}': {str(e)}")
+            continue
+        removed.append(entry)
+    return removed
+
+
+def delete_s3_objects(s3_client, bucket, entries):
+    """Remove objects with a single DeleteObjects request; returns the entries that were removed."""
+    if not entries:
+        return []
+    response = s3_client.delete_objects(Bucket=bucket, Delete={
+        'Objects': [{'Key': f'{S3_MEDIA_PREFIX}{name}'} for name, _, _ in entries],
+        'Quiet': True,
+    })
+    # Quiet mode only reports the keys that failed
+    failed = {error['Key'][len(S3_MEDIA_PREFIX):] for error in response.get('Errors', [])}
+    for error in response.get('Errors', []):
+        logger.error(f"delete_s3_objects: Could not remove '{error['Key']}': {error.get('Message', error.get('Code'))}")
+    return [entry for entry in entries if entry[0] not in failed]
+
+
+def _pages(entries, page_size):
+    page = []
+    for entry in entries:
+        page.append(entry)
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def collect_garbage(entries, delete, min_age, dry_run=False, result=None, page_size=None):
+    """
+    Remove the unreferenced files of a storage listing, one page at a time.
+
+    Args:
+        entries (iterable): (name, size, modified) tuples, e.g. from iter_local_files()
+        delete (callable): Removes a list of at most page_size entries, returning those removed
+        min_age (timedelta): Files modified more recently than this are kept
+        dry_run (bool): Only count what would be removed
+        result (StorageGCResult): Totals to add to; a new one by default
+        page_size (int): Names checked and deleted per round (default GC_PAGE_SIZE)
+
+    Returns:
+        StorageGCResult: The updated totals.
+    """
+    result = result or StorageGCResult()
+    cutoff = timezone.now() - min_age
+    for page in _pages(entries, page_size or GC_PAGE_SIZE):
+        result.scanned += len(page)
+        candidates = [entry for entry in page if entry[2] < cutoff]
+        if not candidates:
+            continue
+        referenced = referenced_names(name for name, _, _ in candidates)
+        orphans = [entry for entry in candidates if entry[0] not in referenced]
+        result.orphaned += len(orphans)
+        if dry_run or not orphans:
+            continue
+        removed = delete(orphans)
+        result.deleted += len(removed)
+        result.freed_bytes += sum(size for _, size, _ in removed)
+        result.failed += len(orphans) - len(removed)
+        logger.info(f"collect_garbage: Removed {len(removed)} of {len(orphans)} orphaned files")
+    return result
+
+
+def run_storage_gc(min_age=timedelta(days=1), dry_run=False, local=True, s3=True):
+    """
+    Collect orphaned files in local media storage and, when enabled, the S3 bucket.
+
+    Returns:
+        StorageGCResult: Totals over both storages.
+    """
+    result = StorageGCResult()
+    if not dry_run:
+        result.blobs_pruned = prune_unreferenced_blobs(timezone.now() - min_age)
+
+    if local:
+        media_root = str(settings.MEDIA_ROOT)
+        collect_garbage(iter_local_files(media_root), lambda page: delete_local_files(media_root, page),
+                        min_age, dry_run, result)
+
+    bucket = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', None)
+    if s3 and getattr(settings, 'ENABLE_S3_UPLOAD', False) and bucket:
+        import boto3 # Imported here to avoid dependency if S3 is not used
+
+        s3_client = boto3.client('s3')
+        collect_garbage(iter_s3_objects(s3_client, bucket), lambda page: delete_s3_objects(s3_client, bucket, page),
+                        min_age, dry_run, result)
+
+    logger.info(f"run_storage_gc: {result.scanned} scanned, {result.orphaned} orphaned, {result.deleted} deleted, "
+                f"{result.failed} failed, {result.blobs_pruned} blobs pruned")
+    return result
@@ -0,0 +1,149 @@
+# utils/text_extraction.py
+
+"""
+Plain-text extraction and tokenization for uploaded resumes.
+
+Supported formats:
+- DOCX: read straight from the ZIP container (word/document.xml)
+- PDF: via the optional pypdf library, falling back to decoding the text
+  operators of (Flate-compressed) content streams
+- DOC (OLE2): best-effort recovery of 8-bit and UTF-16 text runs
+
+The extracted text is only used to build a keyword index, so the fallbacks
+aim for recall of words rather than faithful layout.
+"""
+
+import os
+import re
+import zlib
+import zipfile
+import logging
+import unicodedata
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+# Longest text kept per resume; anything beyond is almost certainly noise
+MAX_TEXT_LENGTH = 200_000
+MAX_TOKEN_LENGTH = 50
+# Most bytes inflated from a PDF's compressed streams (all streams together),
+# so a decompression bomb cannot exhaust the index worker's memory
+MAX_DECOMPRESSED_BYTES = 8 * 1024 * 1024
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+# Keeps skills such as 'c++', 'c#', 'node.js' and 'ci/cd' as single tokens
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#./\-]*')
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'the', 'to', 'was', 'were', 'with',
+})
+
+
+def extract_text(path: str):
+    """
+    Extract plain text from a PDF, DOC or DOCX resume.
+
+    Args:
+        path (str): Absolute path of the local file.
+
+    Returns:
+        str: The extracted (unnormalized) text, possibly empty.
+
+    Raises:
+        ValueError: If the file type is not supported.
+        OSError / zipfile.BadZipFile: If the file cannot be read.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.docx':
+        return _extract_docx(path)
+    if ext == '.pdf':
+        return _extract_pdf(path)
+    if ext == '.doc':
+        return _extract_doc(path)
+    raise ValueError(f"Unsupported resume type: {ext}")
+
+
+def normalize_text(text: str):
+    """Normalize unicode, case-fold and collapse whitespace."""
+    text = unicodedata.normalize('NFKC', text).casefold()
+    return ' '.join(text.split())[:MAX_TEXT_LENGTH]
+
+
+def tokenize(text: str):
+    """
+    Split normalized text into the distinct keyword tokens used for search.
+
+    Returns:
+        set: Tokens between 2 and MAX_TOKEN_LENGTH characters, without stop words.
+    """
+    tokens = set()
+    for match in TOKEN_RE.finditer(normalize_text(text)):
+        token = match.group().rstrip('.-/')
+        if 2 <= len(token) <= MAX_TOKEN_LENGTH and token not in STOP_WORDS:
+            tokens.add(token)
+    return tokens
+
+
+def _extract_docx(path):
+    """Collect the text runs of word/document.xml, one line per paragraph."""
+    paragraphs, current = [], []
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+        # iterparse keeps memory flat even for very long documents
+        for _, element in ElementTree.iterparse(document):
+            if element.tag == f'{WORD_NAMESPACE}t' and element.text:
+                current.append(element.text)
+            elif element.tag == f'{WORD_NAMESPACE}p':
+                paragraphs.append(''.join(current))
+                current = []
+                element.clear()
+    return '\n'.join(paragraphs)
+
+
+def _extract_pdf(path):
+    """Use pypdf when installed, else decode content-stream text operators."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        PdfReader = None
+
+    if PdfReader is not None:
+        reader = PdfReader(path)
+        return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    parts = []
+    budget = MAX_DECOMPRESSED_BYTES
+    for stream in re.finditer(rb'stream\r?\n(.*?)\r?\nendstream', data, re.S):
+        content = stream.group(1)
+        try:
+            # Inflates at most `budget` bytes; the rest of an oversized stream is dropped
+            content = zlib.decompressobj().decompress(content, budget)
+            budget -= len(content)
+        except zlib.error:
+            pass # Uncompressed stream
+        # Strings shown by Tj / TJ / ' / " operators
+        for literal in re.finditer(rb'\((.*?)(?<!\\)\)', content):
+            parts.append(_decode_pdf_literal(literal.group(1)))
+        parts.append('\n')
+        if budget <= 0:
+            logger.warning(f"_extract_pdf: Stopped after {MAX_DECOMPRESSED_BYTES} decompressed bytes in {path}")
+            break
+    return ' '.join(parts)
+
+
+def _decode_pdf_literal(raw):
+    """Undo PDF string escapes for the common cases."""
+    raw = re.sub(rb'\\([nrtbf()\\])', lambda m: {
+        b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'', b'f': b'',
+    }.get(m.group(1), m.group(1)), raw)
+    return raw.decode('latin-1')
+
+
+def _extract_doc(path):
+    """Recover readable runs from a Word 97-2003 binary (8-bit and UTF-16LE)."""
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    runs = [m.group().decode('cp1252') for m in re.finditer(rb'[\x20-\x7e\xa0-\xff\r\n\t]{4,}', data)]
+    runs += [m.group().decode('utf-16-le') for m in re.finditer(rb'(?:[\x20-\x7e\r\n\t]\x00){4,}', data)]
+    return '\n'.join(runs)
@@ -0,0 +1,98 @@
+# utils/upload_handlers.py
+
+"""
+Upload handler validating files while the request body is still streaming in.
+
+ValidatingUploadHandler sits first in settings.FILE_UPLOAD_HANDLERS. For the
+upload fields listed in UPLOAD_FIELD_RULES it checks the content signature of
+the first chunk and counts bytes as they arrive. A rejected file is not passed
+on to the memory/temporary-file handlers behind it, so it is never buffered;
+the rest of its data is read from the socket and dropped, and the form field
+receives a RejectedUpload carrying the reason instead.
+"""
+
+import io
+import logging
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.template.defaultfilters import filesizeformat
+
+from .utils import ALLOWED_RESUME_EXTENSIONS, ALLOWED_IMAGE_EXTENSIONS, signature_matches
+
+logger = logging.getLogger(__name__)
+
+# Form field name -> (allowed extensions or None to skip the signature check, size limit setting)
+UPLOAD_FIELD_RULES = {
+    'resume': (ALLOWED_RESUME_EXTENSIONS, 'RESUME_MAX_UPLOAD_SIZE'),
+    'company_logo': (ALLOWED_IMAGE_EXTENSIONS, 'IMAGE_MAX_UPLOAD_SIZE'),
+    'profile_picture': (ALLOWED_IMAGE_EXTENSIONS, 'IMAGE_MAX_UPLOAD_SIZE'),
+    # Text files (CSV / JSON) have no signature to sniff
+    'jobs_file': (None, 'JOB_IMPORT_MAX_UPLOAD_SIZE'),
+    # Chunks of a resumable upload; chunk 0 is sniffed by upload_chunk_view
+    'chunk': (None, 'CHUNKED_UPLOAD_CHUNK_SIZE'),
+}
+
+
+class RejectedUpload(UploadedFile):
+    """
+    Stand-in for an upload the handler refused.
+
+    Attributes:
+        rejection_reason (str): Message explaining why the file was refused
+
+    Reading it raises the ValidationError, so form fields that read the file
+    themselves (ImageField) report the reason instead of a generic error.
+    """
+
+    def __init__(self, name, content_type, size, rejection_reason):
+        super().__init__(io.BytesIO(), name=name, content_type=content_type, size=size)
+        self.rejection_reason = rejection_reason
+
+    def read(self, *args, **kwargs):
+        raise ValidationError(self.rejection_reason, code='upload_rejected')
+
+
+class ValidatingUploadHandler(FileUploadHandler):
+    """
+    Reject uploads with a wrong content signature or above the size limit.
+    """
+
+    def new_file(self, field_name, file_name, content_type, content_length=None, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.rules = UPLOAD_FIELD_RULES.get(field_name)
+        self.received = 0
+        self.rejection_reason = None
+        if self.rules:
+            self.max_size = getattr(settings, self.rules[1])
+            # Clients rarely send a per-file length, but honour it when they do
+            if content_length and content_length > self.max_size:
+                self._reject(f"File size cannot exceed {filesizeformat(self.max_size)}.")
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.rules:
+            return raw_data
+        if self.rejection_reason:
+            return None # Drop the rest of a rejected file
+
+        allowed_extensions = self.rules[0]
+        if start == 0 and allowed_extensions and not signature_matches(raw_data, self.file_name, allowed_extensions):
+            self._reject(f"File content does not match an allowed type ({', '.join(sorted(allowed_extensions))}).")
+            return None
+
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self._reject(f"File size cannot exceed {filesizeformat(self.max_size)}.")
+            return None
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not self.rules or not self.rejection_reason:
+            return None # Let the next handler return the stored file
+        return RejectedUpload(self.file_name, self.content_type, max(file_size, 1), self.rejection_reason)
+
+    def _reject(self, reason):
+        logger.warning(f"Upload of '{self.file_name}' in field '{self.field_name}' rejected: {reason}")
+        self.rejection_reason = reason
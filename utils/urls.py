@@ -7,4 +7,9 @@ app_name = 'utils'
 urlpatterns = [
     # Use re_path for more complex path matching if needed, but path is often sufficient
     path('resume/<path:cs_suffix>/', views.serve_resume_view, name='serve_resume'),
+    # Resumable (chunked) resume uploads
+    path('uploads/', views.upload_init_view, name='upload_init'),
+    path('uploads/<uuid:upload_id>/', views.upload_status_view, name='upload_status'),
+    path('uploads/<uuid:upload_id>/chunk/', views.upload_chunk_view, name='upload_chunk'),
+    path('uploads/<uuid:upload_id>/complete/', views.upload_complete_view, name='upload_complete'),
 ]
@@ -4,10 +4,12 @@
 Utility functions for the Django Job Portal application.
 
 This module provides various utility functions used throughout the application:
-- File handling (uploads, validation)
+- File handling (uploads, extension and content-signature validation)
 - Image processing
 - Amazon S3 integration (direct)
-- Local/S3 file retrieval helper
+- Local/S3 file retrieval helper (through the storage cache)
+- Content-addressed (deduplicated) resume storage
+- Resumable (chunked) upload assembly
 
 Note: For idiomatic Django file handling, especially with cloud storage,
 consider using model FileFields/ImageFields and the django-storages library.
@@ -16,11 +18,17 @@ These functions provide direct translation of the original Flask utilities.
 
 import os
 import uuid
+import hashlib
 import logging
+import tempfile
 from django.conf import settings # Use Django settings
+from django.db import transaction
 from django.core.files.storage import FileSystemStorage # For local saving examples
 from django.core.files.uploadedfile import UploadedFile # Type hint for Django file objects
 from django.utils.text import get_valid_filename # Django's way to sanitize filenames
+from django.utils import timezone
+
+from .storage_cache import get_storage_cache
 
 # --- Assumed settings in settings.py ---
 # MEDIA_ROOT: Base directory for local media files
@@ -35,6 +43,21 @@ ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg'}
 PROFILE_UPLOAD_SUBDIR = 'img/profiles'
 COMPANY_LOGOS_SUBDIR = 'img/company_logos'
 RESUMES_S3_PREFIX = 'resumes/' # Prefix used in S3 object names and local subdirs
+# Name prefix of resumes downloaded to a temporary file when the storage cache cannot hold them
+TEMP_RESUME_PREFIX = 'resume-download-'
+
+# Leading bytes identifying each allowed extension. DOCX is a ZIP container and
+# DOC an OLE2 compound file; a PDF header may follow a little leading junk.
+FILE_SIGNATURES = {
+    'pdf': b'%PDF-',
+    'doc': b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',
+    'docx': b'PK\x03\x04',
+    'png': b'\x89PNG\r\n\x1a\n',
+    'jpg': b'\xff\xd8\xff',
+    'jpeg': b'\xff\xd8\xff',
+}
+PDF_HEADER_WINDOW = 1024 # Readers accept '%PDF-' anywhere in the first 1 KB
+SNIFF_SIZE = 2048 # Bytes read from the start of a file to identify it
 
 # Logger (uses Django's logging setup configured in settings.py)
 logger = logging.getLogger(__name__) # Use __name__ for module-specific logger
@@ -55,6 +78,56 @@ def allowed_file(filename, allowed_extensions):
     return '.' in filename and \
         filename.rsplit('.', 1)[1].lower() in allowed_extensions
 
+
+def signature_matches(head, filename, allowed_extensions):
+    """
+    Check that the leading bytes of a file match its (allowed) extension.
+
+    Args:
+        head (bytes): The first bytes of the file (SNIFF_SIZE is plenty)
+        filename (str): The name of the file, used for its extension
+        allowed_extensions (set): Set of allowed file extensions
+
+    Returns:
+        bool: True if the extension is allowed and the content carries its signature
+    """
+    if not allowed_file(filename, allowed_extensions):
+        return False
+    extension = filename.rsplit('.', 1)[1].lower()
+    signature = FILE_SIGNATURES.get(extension)
+    if signature is None:
+        return False
+    if extension == 'pdf':
+        return signature in head[:PDF_HEADER_WINDOW]
+    return head.startswith(signature)
+
+
+def has_allowed_signature(uploaded_file, allowed_extensions):
+    """
+    Check an uploaded file's name and content signature without reading it all.
+
+    Only the first SNIFF_SIZE bytes are read; the file position is restored.
+    Uploads already rejected by ValidatingUploadHandler fail immediately.
+
+    Args:
+        uploaded_file (UploadedFile): The uploaded file to check
+        allowed_extensions (set): Set of allowed file extensions
+
+    Returns:
+        bool: True if the file is of an allowed type, False otherwise
+    """
+    if not uploaded_file or getattr(uploaded_file, 'rejection_reason', None):
+        return False
+    try:
+        position = uploaded_file.tell()
+        uploaded_file.seek(0)
+        head = uploaded_file.read(SNIFF_SIZE)
+        uploaded_file.seek(position)
+    except (OSError, ValueError) as e:
+        logger.warning(f"has_allowed_signature: Could not read {uploaded_file.name}: {str(e)}")
+        return False
+    return signature_matches(head, uploaded_file.name, allowed_extensions)
+
 # --- S3 Upload Function (Using boto3) ---
 def upload_to_s3(uploaded_file: UploadedFile, user_id: int, s3_bucket_name: str):
     """
@@ -84,7 +157,7 @@ def upload_to_s3(uploaded_file: UploadedFile, user_id: int, s3_bucket_name: str)
         logger.warning("upload_to_s3: Missing uploaded_file or bucket name.")
         return None
 
-    if not allowed_file(uploaded_file.name, ALLOWED_RESUME_EXTENSIONS):
+    if not has_allowed_signature(uploaded_file, ALLOWED_RESUME_EXTENSIONS):
         logger.warning(f"upload_to_s3: Invalid file type attempted: {uploaded_file.name}")
         return None
 
@@ -119,6 +192,110 @@ def upload_to_s3(uploaded_file: UploadedFile, user_id: int, s3_bucket_name: str)
         return None
 
 
+# --- Content-addressed resume storage ---
+RESUME_BLOBS_PREFIX = 'blobs/' # Below RESUMES_S3_PREFIX; objects are named by SHA-256 of their content
+
+
+def hash_uploaded_file(uploaded_file: UploadedFile):
+    """
+    Compute the hex SHA-256 digest of an uploaded file, chunk by chunk.
+
+    Returns:
+        str: The hex digest. The file is left rewound to the start.
+    """
+    digest = hashlib.sha256()
+    for piece in uploaded_file.chunks():
+        digest.update(piece)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def build_resume_path(user_id: int, sha256: str, filename: str, max_length: int = 100):
+    """
+    Build the per-applicant resume name stored in Application.resume_path.
+
+    The digest prefix keeps two different files with the same name apart,
+    while the original filename is preserved for downloads.
+
+    Returns:
+        str: A path like '42/9f86d081884c/resume.pdf' of at most max_length characters.
+    """
+    prefix = f"{user_id}/{sha256[:12]}/"
+    stem, ext = os.path.splitext(get_valid_filename(filename))
+    return prefix + stem[:max(1, max_length - len(prefix) - len(ext))] + ext
+
+
+def store_resume_blob(uploaded_file: UploadedFile, s3_bucket_name: str):
+    """
+    Store a resume in S3 under a content-addressed key, deduplicating uploads.
+
+    The file is hashed chunk by chunk; if a blob with the same digest already
+    exists the upload is skipped entirely and the existing blob is returned.
+    Either way the blob's last_used_at is bumped, which keeps
+    prune_unreferenced_blobs from removing it (ref_count may still be 0)
+    before the caller's Application is committed.
+
+    Args:
+        uploaded_file (UploadedFile): The resume from request.FILES (or a completed chunked upload).
+        s3_bucket_name (str): The name of the target S3 bucket.
+
+    Returns:
+        ResumeBlob: The stored (or already existing) blob, or None on failure.
+        The caller records the reference by linking an Application to it.
+    """
+    # Imported here: utils.models is not needed by the other helpers in this module
+    from .models import ResumeBlob
+
+    if not uploaded_file or not s3_bucket_name:
+        logger.warning("store_resume_blob: Missing uploaded_file or bucket name.")
+        return None
+
+    if not has_allowed_signature(uploaded_file, ALLOWED_RESUME_EXTENSIONS):
+        logger.warning(f"store_resume_blob: Invalid file type attempted: {uploaded_file.name}")
+        return None
+
+    try:
+        sha256 = hash_uploaded_file(uploaded_file)
+        with transaction.atomic():
+            # Row lock: waits for a garbage collection pruning this blob, which then isn't found
+            existing = ResumeBlob.objects.select_for_update().filter(sha256=sha256).first()
+            if existing:
+                existing.last_used_at = timezone.now()
+                existing.save(update_fields=['last_used_at'])
+        if existing:
+            logger.info(f"store_resume_blob: Content {sha256[:12]} already stored as {existing.storage_key}, skipping upload")
+            return existing
+
+        import boto3 # Imported here to avoid dependency if S3 is not used
+
+        ext = os.path.splitext(uploaded_file.name)[1].lower()
+        storage_key = f"{RESUME_BLOBS_PREFIX}{sha256[:2]}/{sha256}{ext}"
+        s3_object_name = f"media/{RESUMES_S3_PREFIX}{storage_key}"
+        boto3.client('s3').upload_fileobj(
+            uploaded_file,
+            s3_bucket_name,
+            s3_object_name,
+            ExtraArgs={'ContentType': uploaded_file.content_type or 'application/octet-stream'}
+        )
+        # A concurrent upload of the same content may have created the row meanwhile
+        blob, created = ResumeBlob.objects.get_or_create(
+            sha256=sha256,
+            defaults={
+                'storage_key': storage_key,
+                'size': uploaded_file.size,
+                'content_type': uploaded_file.content_type or '',
+            }
+        )
+        if not created:
+            ResumeBlob.objects.filter(pk=blob.pk).update(last_used_at=timezone.now())
+        logger.info(f"store_resume_blob: Uploaded {uploaded_file.name} to S3 bucket {s3_bucket_name} as {s3_object_name}")
+        return blob
+
+    except Exception as e:
+        logger.error(f"store_resume_blob: Error storing {uploaded_file.name}: {str(e)}")
+        return None
+
+
 # --- Local File Saving Functions (Using Django's FileSystemStorage) ---
 # Note: These are often unnecessary if using Django's Model ImageField/FileField
 
@@ -135,7 +312,7 @@ def save_company_logo_local(uploaded_file: UploadedFile):
         str: The relative path (from MEDIA_ROOT) of the saved logo,
              or None if saving failed or file type invalid.
     """
-    if not uploaded_file or not allowed_file(uploaded_file.name, ALLOWED_IMAGE_EXTENSIONS):
+    if not has_allowed_signature(uploaded_file, ALLOWED_IMAGE_EXTENSIONS):
         logger.warning(f"Invalid or missing company logo file attempted: {getattr(uploaded_file, 'name', 'N/A')}")
         return None
 
@@ -176,7 +353,7 @@ def save_profile_picture_local(uploaded_file: UploadedFile):
     """
     default_picture_path = os.path.join(PROFILE_UPLOAD_SUBDIR, 'default.jpg') # Relative path
 
-    if not uploaded_file or not allowed_file(uploaded_file.name, ALLOWED_IMAGE_EXTENSIONS):
+    if not has_allowed_signature(uploaded_file, ALLOWED_IMAGE_EXTENSIONS):
         logger.warning(f"Invalid or missing profile picture file attempted: {getattr(uploaded_file, 'name', 'N/A')}")
         return default_picture_path
 
@@ -223,11 +400,14 @@ def save_profile_picture_local(uploaded_file: UploadedFile):
 # --- Function to get resume file (local or S3) ---
 def get_resume_file(resume_path_suffix: str):
     """
-    Ensures a resume file exists locally, downloading from S3 if necessary.
+    Ensures a resume file is available locally, fetching it from S3 if necessary.
 
     Checks if the file corresponding to `resume_path_suffix` exists in the
-    local MEDIA_ROOT. If not found and S3 is enabled, attempts to download
-    it from S3 to the expected local path.
+    local MEDIA_ROOT. If not found and S3 is enabled, returns its copy in the
+    local storage cache (utils.storage_cache), downloading it on a cache miss.
+    When the cache is disabled or the file exceeds its budget, the file is
+    downloaded to a temporary file instead; pass the path to
+    release_resume_file() once done with it.
 
     Args:
         resume_path_suffix (str): The path suffix as stored in the database,
@@ -240,10 +420,8 @@ def get_resume_file(resume_path_suffix: str):
                a boolean indicating if the file is available locally.
 
     Note:
-        This pattern (downloading to serve) can be inefficient for web requests.
-        Consider streaming responses or using signed URLs for direct S3 access
-        in views where possible. This function might be more suitable for
-        background tasks or management commands needing local file access.
+        Cached copies may be evicted at any time once other files are cached;
+        use the returned path right away rather than storing it.
     """
     if not resume_path_suffix:
         logger.warning("get_resume_file called with empty resume_path_suffix.")
@@ -268,7 +446,7 @@ def get_resume_file(resume_path_suffix: str):
         logger.warning(f"get_resume_file: Local file missing and S3 is disabled or not configured. Cannot retrieve '{resume_path_suffix}'.")
         return None, False
 
-    # 3. Attempt to download from S3
+    # 3. Attempt to fetch from S3 through the storage cache
     try:
         # Import here to avoid dependency if S3 is not used
         import boto3
@@ -280,21 +458,29 @@ def get_resume_file(resume_path_suffix: str):
     try:
         # Construct the full S3 object name
         s3_object_name = f"media/{RESUMES_S3_PREFIX}{resume_path_suffix}"
-        logger.info(f"get_resume_file: Attempting to download '{s3_object_name}' from S3 bucket '{s3_bucket_name}' to '{expected_local_path}'")
+        logger.info(f"get_resume_file: Fetching '{s3_object_name}' from S3 bucket '{s3_bucket_name}' through the storage cache")
 
         # Create S3 client
         s3_client = boto3.client('s3')
 
-        # Ensure the local directory exists before downloading
-        local_dir = os.path.dirname(expected_local_path)
-        os.makedirs(local_dir, exist_ok=True)
-        logger.debug(f"get_resume_file: Ensured local directory exists: {local_dir}")
-
-        # Download the file from S3 to the expected local path
         try:
-            s3_client.download_file(s3_bucket_name, s3_object_name, expected_local_path)
-            logger.info(f"get_resume_file: Successfully downloaded '{s3_object_name}' from S3 to '{expected_local_path}'.")
-            return expected_local_path, True
+            cached_path = get_storage_cache().fetch(
+                s3_object_name,
+                lambda path: s3_client.download_file(s3_bucket_name, s3_object_name, path)
+            )
+            if cached_path is None:
+                logger.info(f"get_resume_file: '{s3_object_name}' cannot be cached, downloading to a temporary file.")
+                temp_file = tempfile.NamedTemporaryFile(
+                    prefix=TEMP_RESUME_PREFIX, suffix=os.path.splitext(s3_object_name)[1].lower(), delete=False)
+                temp_file.close()
+                try:
+                    s3_client.download_file(s3_bucket_name, s3_object_name, temp_file.name)
+                except Exception:
+                    release_resume_file(temp_file.name)
+                    raise
+                return temp_file.name, True
+            logger.info(f"get_resume_file: '{s3_object_name}' available at '{cached_path}'.")
+            return cached_path, True
         except ClientError as e:
             if e.response['Error']['Code'] == '404':
                 logger.warning(f"get_resume_file: File not found in S3 bucket '{s3_bucket_name}' with name '{s3_object_name}'.")
@@ -305,3 +491,167 @@ def get_resume_file(resume_path_suffix: str):
     except Exception as e:
         logger.error(f"get_resume_file: Unexpected error retrieving file from S3: {str(e)}")
         return None, False
+
+
+def release_resume_file(path):
+    """Delete a temporary download made by get_resume_file(); other paths are left alone."""
+    if not path or not os.path.basename(path).startswith(TEMP_RESUME_PREFIX):
+        return
+    if os.path.dirname(os.path.abspath(path)) != os.path.abspath(tempfile.gettempdir()):
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"release_resume_file: Could not remove temporary resume {path}: {str(e)}")
+
+
+# --- Resumable (chunked) uploads ---
+def append_upload_chunk(upload, chunk_file: UploadedFile, expected_checksum: str):
+    """
+    Append one chunk to the part file of a ChunkedUpload.
+
+    The chunk is written at the upload's current offset while its SHA-256 is
+    computed, so it is never read into memory as a whole. If the checksum does
+    not match, the part file is truncated back to its previous length.
+
+    Args:
+        upload (ChunkedUpload): The upload being assembled (row should be locked).
+        chunk_file (UploadedFile): The chunk from request.FILES.
+        expected_checksum (str): Hex SHA-256 digest sent by the client.
+
+    Returns:
+        bool: True if the chunk was appended and the upload row updated,
+              False if the checksum did not match.
+    """
+    part_path = upload.part_path
+    os.makedirs(os.path.dirname(part_path), exist_ok=True)
+    digest = hashlib.sha256()
+    written = 0
+
+    # 'r+b' keeps earlier chunks; a fresh upload has no part file yet
+    with open(part_path, 'r+b' if os.path.exists(part_path) else 'wb') as part_file:
+        # Drop any bytes left behind by an interrupted earlier attempt
+        part_file.seek(upload.received_bytes)
+        part_file.truncate()
+        for piece in chunk_file.chunks():
+            digest.update(piece)
+            part_file.write(piece)
+            written += len(piece)
+
+        if digest.hexdigest() != (expected_checksum or '').strip().lower():
+            part_file.truncate(upload.received_bytes)
+            logger.warning(f"append_upload_chunk: Checksum mismatch for chunk {upload.next_chunk} of upload {upload.id}")
+            return False
+
+    upload.received_bytes += written
+    upload.next_chunk += 1
+    upload.save(update_fields=['received_bytes', 'next_chunk', 'updated_at'])
+    logger.debug(f"append_upload_chunk: Upload {upload.id} now at {upload.received_bytes}/{upload.total_size} bytes")
+    return True
+
+
+def file_sha256(path: str, chunk_size: int = 64 * 1024):
+    """Return the hex SHA-256 digest of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for piece in iter(lambda: fh.read(chunk_size), b''):
+            digest.update(piece)
+    return digest.hexdigest()
+
+
+def open_completed_upload(upload):
+    """
+    Wrap the assembled part file of a completed ChunkedUpload as an UploadedFile.
+
+    The returned object can be passed anywhere a file from request.FILES is
+    accepted (e.g. upload_to_s3). The caller is responsible for closing it.
+
+    Returns:
+        UploadedFile: The assembled file, or None if the part file is missing.
+    """
+    try:
+        return UploadedFile(
+            file=open(upload.part_path, 'rb'),
+            name=upload.filename,
+            content_type=upload.content_type or None,
+            size=upload.received_bytes,
+        )
+    except OSError as e:
+        logger.error(f"open_completed_upload: Cannot open part file for upload {upload.id}: {str(e)}")
+        return None
+
+
+def discard_upload(upload):
+    """Mark a ChunkedUpload as consumed and remove its part file."""
+    try:
+        os.remove(upload.part_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"discard_upload: Could not remove part file for upload {upload.id}: {str(e)}")
+    upload.status = 'consumed'
+    upload.save(update_fields=['status', 'updated_at'])
+
+
+def expire_chunked_uploads(batch_size: int = 500):
+    """
+    Delete stale ChunkedUploads and their part files.
+
+    Also removes part files older than the expiry cutoff that no fresh upload
+    owns (e.g. left behind when the user was deleted).
+
+    Returns:
+        tuple: (uploads deleted, part files removed)
+    """
+    from .models import ChunkedUpload
+
+    cutoff = ChunkedUpload.expiry_cutoff()
+    deleted = removed = 0
+    while True:
+        # Locked so a chunk arriving right now (which refreshes updated_at) waits for the delete
+        with transaction.atomic():
+            stale = list(ChunkedUpload.objects.stale().select_for_update(skip_locked=True)[:batch_size])
+            if not stale:
+                break
+            ChunkedUpload.objects.filter(pk__in=[upload.pk for upload in stale]).delete()
+        for upload in stale:
+            try:
+                os.remove(upload.part_path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"expire_chunked_uploads: Could not remove part file for upload {upload.id}: {str(e)}")
+        deleted += len(stale)
+
+    try:
+        entries = [entry for entry in os.scandir(settings.CHUNKED_UPLOAD_DIR)
+                   if entry.name.endswith('.part') and entry.is_file()]
+    except FileNotFoundError:
+        entries = []
+    old = {entry.name[:-len('.part')]: entry.path for entry in entries
+           if entry.stat().st_mtime < cutoff.timestamp()}
+    if old:
+        candidates = [name for name in old if _is_uuid_hex(name)]
+        known = {upload_id.hex for upload_id in ChunkedUpload.objects.filter(
+            id__in=candidates).values_list('id', flat=True)}
+        for name, path in old.items():
+            if name in known:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                logger.warning(f"expire_chunked_uploads: Could not remove orphaned part file {path}: {str(e)}")
+    logger.info(f"expire_chunked_uploads: Deleted {deleted} stale upload(s), removed {removed} part file(s)")
+    return deleted, removed
+
+
+def _is_uuid_hex(name):
+    try:
+        uuid.UUID(hex=name)
+    except ValueError:
+        return False
+    return True
@@ -1,27 +1,194 @@
 # utils/views.py
 from django.shortcuts import get_object_or_404
-from django.http import FileResponse, Http404, HttpResponseForbidden
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseForbidden, HttpResponseNotModified,
+    HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+)
 from django.contrib import messages
 from django.conf import settings
+from django.db import transaction
+from django.utils.text import get_valid_filename
+from django.utils.http import content_disposition_header, parse_etags
+from django.core.exceptions import SuspiciousFileOperation
 import os
-import io
+import re
+import mimetypes
 import logging # Import logging
+from urllib.parse import quote
 import boto3
 from botocore.exceptions import ClientError
 
 # Import models from the 'jobs' app
 from jobs.models import Application
+from .models import ChunkedUpload
+from .storage_cache import get_storage_cache
+from .utils import (
+    ALLOWED_RESUME_EXTENSIONS, SNIFF_SIZE, allowed_file, signature_matches,
+    append_upload_chunk, discard_upload, file_sha256
+)
 # Import decorators from auth app
-from portal_auth.views import login_required
+from portal_auth.views import login_required, role_required
 
 logger = logging.getLogger(__name__) # Get logger for this module
 
+# Bytes read from S3 per chunk when streaming a resume to the client
+S3_STREAM_CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the file."""
+
+
+def _parse_range(range_header, size):
+    """
+    Parse a single-range 'bytes=' Range header.
+
+    Returns:
+        tuple: Inclusive (start, end) offsets, or None if the header is absent,
+               malformed or asks for several ranges (the full body is sent then,
+               which RFC 9110 allows).
+
+    Raises:
+        RangeNotSatisfiable: If the range starts beyond the end of the file.
+    """
+    match = RANGE_RE.match(range_header or '')
+    if not match or (not match.group(1) and not match.group(2)):
+        return None
+    first, last = match.group(1), match.group(2)
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, end
+
+
+def _etag_matches(etag, header_value):
+    """Check an If-None-Match / If-Range style header against an ETag (weak comparison)."""
+    if not header_value:
+        return False
+    tags = parse_etags(header_value)
+    return '*' in tags or etag.removeprefix('W/') in [tag.removeprefix('W/') for tag in tags]
+
+
+def _read_range(file, start, length, chunk_size=S3_STREAM_CHUNK_SIZE):
+    """Yield `length` bytes from `start`, one chunk at a time, closing the file at the end."""
+    try:
+        file.seek(start)
+        while length > 0:
+            data = file.read(min(chunk_size, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+    finally:
+        file.close()
+
+
+def _local_file_response(request, file, filename, etag=None):
+    """
+    Serve an open local file with ETag, If-None-Match, Range and If-Range support.
+
+    Args:
+        file (file): The file opened in binary mode; the response takes ownership.
+        filename (str): Download name for Content-Disposition.
+        etag (str): Validator of the content (quoted); defaults to one built from
+                    the file's mtime and size, which only suits files that stay put.
+
+    Returns:
+        HttpResponse: 304, 206, 416 or the full FileResponse (200).
+    """
+    stat = os.fstat(file.fileno())
+    size = stat.st_size
+    etag = etag or f'"{stat.st_mtime_ns:x}-{size:x}"'
+
+    if _etag_matches(etag, request.headers.get('If-None-Match')):
+        file.close()
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    # If-Range: only honour the Range if the client's copy is still current
+    if not if_range or if_range == etag:
+        try:
+            byte_range = _parse_range(request.headers.get('Range'), size)
+        except RangeNotSatisfiable:
+            file.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None:
+        response = FileResponse(file, as_attachment=True, filename=filename)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_range(file, start, end - start + 1),
+            status=206,
+            content_type=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+    response['ETag'] = etag
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _sendfile_response(path, filename):
+    """
+    Build an empty response telling the web server to send a local file itself.
+
+    Uses X-Accel-Redirect (nginx) or X-Sendfile (Apache) according to
+    settings.RESUME_SENDFILE_BACKEND.
+
+    Returns:
+        HttpResponse: The offload response, or None if no backend is configured
+                      or the file is outside every configured nginx location.
+    """
+    backend = getattr(settings, 'RESUME_SENDFILE_BACKEND', '')
+    if not backend:
+        return None
+
+    real_path = os.path.realpath(path)
+    response = HttpResponse()
+    if backend == 'nginx':
+        for directory, location in getattr(settings, 'RESUME_SENDFILE_LOCATIONS', {}).items():
+            relative_path = os.path.relpath(real_path, os.path.realpath(directory))
+            if relative_path != os.pardir and not relative_path.startswith(os.pardir + os.sep):
+                response['X-Accel-Redirect'] = location.rstrip('/') + '/' + quote(relative_path.replace(os.sep, '/'))
+                break
+        else:
+            logger.warning(f"No RESUME_SENDFILE_LOCATIONS entry covers '{real_path}', streaming it from Django.")
+            return None
+    elif backend == 'apache':
+        response['X-Sendfile'] = real_path
+    else:
+        logger.error(f"Unknown RESUME_SENDFILE_BACKEND '{backend}', streaming from Django.")
+        return None
+
+    # The web server fills in the body and its length; keep type and filename
+    response['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
+
 # --- Views ---
 
 @login_required
 def serve_resume_view(request, cs_suffix):
     """
-    Securely serve resume files, checking local storage first, then S3.
+    Securely serve resume files, checking local storage first, then S3
+    (through the local storage cache).
 
     Args:
         cs_suffix (str): The suffix of the S3 object name or local path
@@ -29,6 +196,10 @@ def serve_resume_view(request, cs_suffix):
 
     Returns:
         FileResponse: The requested resume file streamed from local disk or S3.
+        HttpResponse: Empty, with X-Accel-Redirect / X-Sendfile, for local files
+                      when RESUME_SENDFILE_BACKEND is set.
+        206 / 304 / 416: For Range, If-Range and If-None-Match requests.
+        HttpResponseRedirect: 302 to a presigned S3 URL when RESUME_DOWNLOAD_MODE is 'redirect'.
         HttpResponseForbidden: 403 if unauthorized.
         Http404 Exception: Raised if the file is not found in either location
                            or if S3 is needed but not configured/available.
@@ -42,28 +213,40 @@ def serve_resume_view(request, cs_suffix):
     user = request.user
     logger.info(f"Resume access request for path suffix: '{cs_suffix}' by user {user.id} with role {user.role}")
 
-    # Find the application associated with this path suffix.
+    # Find the applications associated with this path suffix.
     # Assumes resume_path stores path suffix like 'user_id/file.pdf'
-    # Use filter().first() instead of get() to handle multiple applications with the same resume
-    application = Application.objects.select_related('job', 'applicant').filter(resume_path=cs_suffix).first()
-    if not application:
+    # The same resume may back several applications (one per job applied to), so
+    # access is granted if any of them allows it. Only the ids needed for the
+    # permission check are fetched, via the resume_path index.
+    grants = list(
+        Application.objects.filter(resume_path=cs_suffix)
+        .values_list('id', 'applicant_id', 'job__poster_id', 'resume_blob__storage_key', 'resume_blob__sha256')
+    )
+    if not grants:
         raise Http404("Application not found")
-    # Note: get_object_or_404 handles the 'not found' case for the application record
+    # Deduplicated resumes live under a content-addressed key; legacy ones under cs_suffix itself
+    storage_suffix = grants[0][3] or cs_suffix
+    # A deduplicated resume never changes, so its digest is a validator wherever the bytes come from
+    content_etag = f'"{grants[0][4]}"' if grants[0][4] else None
 
     # --- Permission Checks ---
     can_access = False
     if user.is_staff or user.role == 'admin': # Django admin or custom admin
         can_access = True
-        logger.info(f"Admin {user.id} accessing resume for application {application.id} (Path suffix: {cs_suffix})")
-    elif user.role == 'employer' and application.job.poster == user: # Employer who posted the job
-        can_access = True
-        logger.info(f"Employer {user.id} accessing resume for application {application.id} (Path suffix: {cs_suffix})")
-    elif user == application.applicant: # Applicant accessing their own resume
-        can_access = True
-        logger.info(f"Applicant {user.id} accessing their own resume for application {application.id} (Path suffix: {cs_suffix})")
+        logger.info(f"Admin {user.id} accessing resume for application {grants[0][0]} (Path suffix: {cs_suffix})")
+    else:
+        for application_id, applicant_id, poster_id, _, _ in grants:
+            if user.role == 'employer' and poster_id == user.id: # Employer who posted the job
+                can_access = True
+                logger.info(f"Employer {user.id} accessing resume for application {application_id} (Path suffix: {cs_suffix})")
+                break
+            if applicant_id == user.id: # Applicant accessing their own resume
+                can_access = True
+                logger.info(f"Applicant {user.id} accessing their own resume for application {application_id} (Path suffix: {cs_suffix})")
+                break
 
     if not can_access:
-        logger.warning(f"Unauthorized resume access attempt: User {user.id} for path suffix '{cs_suffix}' (App ID: {application.id})")
+        logger.warning(f"Unauthorized resume access attempt: User {user.id} for path suffix '{cs_suffix}' (App IDs: {[grant[0] for grant in grants]})")
         messages.error(request, "You do not have permission to view this resume.")
         return HttpResponseForbidden("Access Denied")
     # --- End Permission Checks ---
@@ -71,7 +254,7 @@ def serve_resume_view(request, cs_suffix):
     # --- 1. Attempt to Serve Locally First ---
     # Construct the expected absolute local path based on the suffix
     # Assumes resumes are stored under MEDIA_ROOT/resumes/user_id/filename.pdf
-    expected_local_path = os.path.join(settings.MEDIA_ROOT, "resumes", cs_suffix)
+    expected_local_path = os.path.join(settings.MEDIA_ROOT, "resumes", storage_suffix)
     logger.debug(f"Checking for local resume file at: {expected_local_path}")
 
     if os.path.exists(expected_local_path):
@@ -79,12 +262,11 @@ def serve_resume_view(request, cs_suffix):
             logger.info(f"Serving resume file '{cs_suffix}' from local storage.")
             # Extract original filename for download prompt
             original_filename = os.path.basename(cs_suffix)
-            response = FileResponse(
-                open(expected_local_path, 'rb'),
-                as_attachment=True,
-                filename=original_filename
-            )
-            return response
+            # Behind nginx/Apache the web server sends the file; the worker is freed at once
+            sendfile_response = _sendfile_response(expected_local_path, original_filename)
+            if sendfile_response is not None:
+                return sendfile_response
+            return _local_file_response(request, open(expected_local_path, 'rb'), original_filename, content_etag)
         except Exception as e:
             logger.error(f"Error serving local file '{expected_local_path}': {str(e)}")
             # If local file exists but cannot be served, it's a server error
@@ -106,39 +288,131 @@ def serve_resume_view(request, cs_suffix):
     # --- Proceed with S3 Fetch ---
     try:
         # Construct the full S3 object name (assuming 'media/resumes/' prefix)
-        s3_object_name = f"media/resumes/{cs_suffix}"
+        s3_object_name = f"media/resumes/{storage_suffix}"
         logger.info(f"Attempting to serve resume '{s3_object_name}' from S3 bucket '{s3_bucket_name}'.")
 
         # Create S3 client
         s3_client = boto3.client('s3')
-        
+
+        if getattr(settings, 'RESUME_DOWNLOAD_MODE', 'proxy') == 'redirect':
+            # Permission is checked above; S3 serves the bytes (and its own 404)
+            presigned_url = s3_client.generate_presigned_url(
+                'get_object',
+                Params={
+                    'Bucket': s3_bucket_name,
+                    'Key': s3_object_name,
+                    # Keep the applicant's filename rather than the storage key
+                    'ResponseContentDisposition': content_disposition_header(True, os.path.basename(cs_suffix)),
+                },
+                ExpiresIn=settings.RESUME_PRESIGNED_URL_EXPIRY
+            )
+            logger.info(f"Redirecting to presigned URL for resume '{s3_object_name}' (expires in {settings.RESUME_PRESIGNED_URL_EXPIRY}s).")
+            response = HttpResponseRedirect(presigned_url)
+            # The URL is a bearer credential; keep it out of shared caches
+            response['Cache-Control'] = 'private, no-store'
+            return response
+
+        # Extract original filename for download prompt
+        original_filename = os.path.basename(cs_suffix)
+        range_header = request.headers.get('Range')
+        if_range = request.headers.get('If-Range')
+
+        if content_etag and _etag_matches(content_etag, request.headers.get('If-None-Match')):
+            response = HttpResponseNotModified()
+            response['ETag'] = content_etag
+            return response
+
+        def fill_from_s3(path):
+            if content_etag:
+                s3_client.download_file(s3_bucket_name, s3_object_name, path)
+                return None
+            # Record S3's ETag with the copy; IfMatch makes sure it describes the bytes downloaded
+            etag = s3_client.head_object(Bucket=s3_bucket_name, Key=s3_object_name)['ETag']
+            s3_client.download_file(s3_bucket_name, s3_object_name, path, ExtraArgs={'IfMatch': etag})
+            return etag
+
+        # Serve from the local storage cache; only a miss downloads from S3.
+        # A Range request never downloads the whole object: on a miss it goes to S3 as is.
+        # Cached copies are streamed from an open file rather than handed to the web
+        # server by path, since the cache may evict the file before the server reads it
+        storage_cache = get_storage_cache()
+        fill = None if range_header else fill_from_s3
         try:
-            # Check if object exists by attempting to get its metadata
-            s3_client.head_object(Bucket=s3_bucket_name, Key=s3_object_name)
+            cached_file = storage_cache.open(s3_object_name, fill)
         except ClientError as e:
-            if e.response['Error']['Code'] == '404':
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
                 logger.warning(f"Resume file not found locally or in S3: {s3_object_name}")
-                raise Http404("Resume file not found.") # Not found in S3 either -> 404
-            else:
-                # Other error occurred
-                raise
+                raise Http404("Resume file not found.")
+            raise
+        if cached_file is not None:
+            logger.info(f"Serving resume '{s3_object_name}' from the storage cache.")
+            etag = content_etag or storage_cache.etag(s3_object_name)
+            return _local_file_response(request, cached_file, original_filename, etag)
 
-        # Download blob content into memory
-        response = s3_client.get_object(Bucket=s3_bucket_name, Key=s3_object_name)
-        file_bytes = response['Body'].read()
-        file_stream = io.BytesIO(file_bytes)
+        # Not cached (cache disabled, file larger than its budget or a Range request
+        # on a miss): stream straight from S3 with a single get_object call
+        get_params = {'Bucket': s3_bucket_name, 'Key': s3_object_name}
+        if content_etag:
+            # Conditions were evaluated against the digest above; If-Range likewise
+            if range_header and (not if_range or if_range == content_etag):
+                get_params['Range'] = range_header
+        else:
+            # Range and ETag conditions go to S3, whose ETag is the validator
+            if range_header and (not if_range or if_range.startswith('"')):
+                get_params['Range'] = range_header
+                if if_range:
+                    # S3 has no If-Range; IfMatch fails the ranged read if the object changed
+                    get_params['IfMatch'] = if_range
+            if request.headers.get('If-None-Match'):
+                get_params['IfNoneMatch'] = request.headers['If-None-Match']
 
-        # Extract original filename for download prompt
-        original_filename = os.path.basename(cs_suffix)
+        # Loops once more when a changed object is fetched again without its Range
+        while True:
+            try:
+                s3_response = s3_client.get_object(**get_params)
+                break
+            except ClientError as e:
+                error_code = e.response['Error']['Code']
+                if error_code in ('404', 'NoSuchKey'):
+                    logger.warning(f"Resume file not found locally or in S3: {s3_object_name}")
+                    raise Http404("Resume file not found.") # Not found in S3 either -> 404
+                if error_code in ('304', 'NotModified'):
+                    response = HttpResponseNotModified()
+                    # The object's current ETag, not the client's If-None-Match (which may be a list or '*')
+                    current_etag = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('etag')
+                    if current_etag:
+                        response['ETag'] = current_etag
+                    return response
+                if error_code == 'InvalidRange':
+                    response = HttpResponse(status=416)
+                    response['Content-Range'] = f"bytes */{e.response.get('Error', {}).get('ActualObjectSize', '*')}"
+                    return response
+                if error_code in ('412', 'PreconditionFailed') and 'IfMatch' in get_params:
+                    # Object changed since the client's partial copy: send it whole
+                    del get_params['Range'], get_params['IfMatch']
+                    continue
+                # Other error occurred
+                raise
 
-        logger.info(f"Resume file {s3_object_name} successfully retrieved from S3 and serving.")
-        # Send the file from the in-memory stream
+        logger.info(f"Resume file {s3_object_name} found in S3, streaming {s3_response.get('ContentLength')} bytes.")
+        # FileResponse reads the StreamingBody block by block and closes it when done
         response = FileResponse(
-            file_stream,
+            s3_response['Body'],
             as_attachment=True,
             filename=original_filename
-            # mimetype can be set explicitly if needed, e.g., 'application/pdf'
         )
+        response.block_size = S3_STREAM_CHUNK_SIZE
+        # Pass S3's metadata through; the body is not seekable so it cannot be measured
+        if s3_response.get('ContentLength') is not None:
+            response['Content-Length'] = s3_response['ContentLength']
+        if s3_response.get('ContentType'):
+            response['Content-Type'] = s3_response['ContentType']
+        if s3_response.get('ContentRange'):
+            response.status_code = 206
+            response['Content-Range'] = s3_response['ContentRange']
+        if content_etag or s3_response.get('ETag'):
+            response['ETag'] = content_etag or s3_response['ETag']
+        response['Accept-Ranges'] = 'bytes'
         return response
 
     except Exception as e:
@@ -147,3 +421,152 @@ def serve_resume_view(request, cs_suffix):
         raise Http404("Error serving resume file from storage.") # Or raise e for 500
 
 
+
+
+# --- Resumable (chunked) resume uploads ---
+# Protocol: POST uploads/ (init) -> POST uploads/<id>/chunk/ (repeat, in order)
+# -> POST uploads/<id>/complete/. GET uploads/<id>/ reports how far an upload
+# got so the client can resume after a dropped connection.
+
+@login_required
+@role_required('job_seeker')
+def upload_init_view(request):
+    """
+    Open a new chunked upload.
+
+    POST fields:
+        filename (str): Original filename (PDF, DOC or DOCX)
+        size (int): Total size of the file in bytes
+        content_type (str): Optional MIME type
+
+    Returns:
+        JsonResponse: Upload state (201), or an error (400).
+    """
+    user = request.user
+    if request.method != 'POST':
+        logger.warning(f"Invalid method {request.method} used for upload_init_view by user {user.id}")
+        raise Http404("Method not allowed")
+
+    try:
+        filename = get_valid_filename(request.POST.get('filename', ''))
+        total_size = int(request.POST.get('size', ''))
+    except (SuspiciousFileOperation, ValueError):
+        return JsonResponse({'error': 'A filename and a numeric size are required.'}, status=400)
+
+    if not allowed_file(filename, ALLOWED_RESUME_EXTENSIONS):
+        logger.warning(f"Chunked upload rejected for user {user.id}: invalid file type '{filename}'")
+        return JsonResponse({'error': 'Invalid file type. PDF, DOC, or DOCX only!'}, status=400)
+    if total_size <= 0 or total_size > settings.RESUME_MAX_UPLOAD_SIZE:
+        logger.warning(f"Chunked upload rejected for user {user.id}: size {total_size} out of range")
+        return JsonResponse({'error': f'File size must be between 1 and {settings.RESUME_MAX_UPLOAD_SIZE} bytes.'}, status=400)
+
+    upload = ChunkedUpload.objects.create(
+        user=user,
+        filename=filename,
+        content_type=request.POST.get('content_type', '')[:100],
+        total_size=total_size,
+    )
+    logger.info(f"Chunked upload {upload.id} opened by user {user.id} for '{filename}' ({total_size} bytes)")
+    return JsonResponse(upload.to_dict(), status=201)
+
+
+@login_required
+@role_required('job_seeker')
+def upload_status_view(request, upload_id):
+    """Report the state of a chunked upload so the client can resume it."""
+    upload = get_object_or_404(ChunkedUpload.objects.fresh(), pk=upload_id, user=request.user)
+    return JsonResponse(upload.to_dict())
+
+
+@login_required
+@role_required('job_seeker')
+def upload_chunk_view(request, upload_id):
+    """
+    Append one chunk to a chunked upload.
+
+    POST fields:
+        index (int): Zero-based chunk index; must be the next expected chunk
+        checksum (str): Hex SHA-256 digest of the chunk
+        chunk (file): The chunk data
+
+    Returns:
+        JsonResponse: Upload state (200); 400 on a bad chunk or checksum
+        mismatch; 409 if the chunk is out of order or the upload is closed.
+        Re-sending an already stored chunk is acknowledged without changes.
+    """
+    user = request.user
+    if request.method != 'POST':
+        logger.warning(f"Invalid method {request.method} used for upload_chunk_view for upload {upload_id}")
+        raise Http404("Method not allowed")
+
+    chunk = request.FILES.get('chunk')
+    try:
+        index = int(request.POST.get('index', ''))
+    except ValueError:
+        index = None
+    if chunk is None or index is None:
+        return JsonResponse({'error': 'A chunk index and chunk data are required.'}, status=400)
+
+    with transaction.atomic():
+        upload = get_object_or_404(ChunkedUpload.objects.fresh().select_for_update(), pk=upload_id, user=user)
+
+        if upload.status != 'uploading':
+            return JsonResponse({'error': 'Upload is no longer accepting chunks.', **upload.to_dict()}, status=409)
+        if index < upload.next_chunk:
+            # Retry of a chunk we already stored (e.g. the response was lost)
+            return JsonResponse(upload.to_dict())
+        if index > upload.next_chunk:
+            return JsonResponse({'error': f'Expected chunk {upload.next_chunk}.', **upload.to_dict()}, status=409)
+        if chunk.size > settings.CHUNKED_UPLOAD_CHUNK_SIZE or upload.received_bytes + chunk.size > upload.total_size:
+            logger.warning(f"Oversized chunk {index} ({chunk.size} bytes) for upload {upload.id} by user {user.id}")
+            return JsonResponse({'error': 'Chunk exceeds the allowed size.', **upload.to_dict()}, status=400)
+        if index == 0:
+            # The first chunk carries the file signature; a mismatch can never complete
+            head = chunk.read(SNIFF_SIZE)
+            chunk.seek(0)
+            if not signature_matches(head, upload.filename, ALLOWED_RESUME_EXTENSIONS):
+                logger.warning(f"Chunked upload {upload.id} by user {user.id} rejected: content does not match '{upload.filename}'")
+                discard_upload(upload)
+                return JsonResponse({'error': 'File content does not match a PDF, DOC, or DOCX document.', **upload.to_dict()}, status=400)
+
+        if not append_upload_chunk(upload, chunk, request.POST.get('checksum', '')):
+            return JsonResponse({'error': 'Checksum mismatch, please resend the chunk.', **upload.to_dict()}, status=400)
+
+    return JsonResponse(upload.to_dict())
+
+
+@login_required
+@role_required('job_seeker')
+def upload_complete_view(request, upload_id):
+    """
+    Finish a chunked upload once all bytes have been received.
+
+    POST fields:
+        checksum (str): Optional hex SHA-256 digest of the whole file
+
+    Returns:
+        JsonResponse: Upload state (200), 400 on a whole-file checksum
+        mismatch, or 409 if bytes are still missing.
+    """
+    user = request.user
+    if request.method != 'POST':
+        logger.warning(f"Invalid method {request.method} used for upload_complete_view for upload {upload_id}")
+        raise Http404("Method not allowed")
+
+    with transaction.atomic():
+        upload = get_object_or_404(ChunkedUpload.objects.fresh().select_for_update(), pk=upload_id, user=user)
+        if upload.status == 'complete':
+            return JsonResponse(upload.to_dict())
+        if upload.status != 'uploading' or upload.received_bytes != upload.total_size:
+            return JsonResponse({'error': 'Upload is incomplete.', **upload.to_dict()}, status=409)
+
+        expected_checksum = request.POST.get('checksum', '').strip().lower()
+        if expected_checksum and file_sha256(upload.part_path) != expected_checksum:
+            logger.warning(f"Whole-file checksum mismatch for upload {upload.id} by user {user.id}")
+            return JsonResponse({'error': 'File checksum mismatch.', **upload.to_dict()}, status=400)
+
+        upload.status = 'complete'
+        upload.save(update_fields=['status', 'updated_at'])
+
+    logger.info(f"Chunked upload {upload.id} completed by user {user.id} ({upload.total_size} bytes)")
+    return JsonResponse(upload.to_dict())
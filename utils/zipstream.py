@@ -0,0 +1,175 @@
+# utils/zipstream.py
+
+"""
+Streaming ZIP archives of resumes.
+
+stream_zip() produces a ZIP archive piece by piece while the entries are being
+read, using zipfile on a non-seekable sink: entries are stored (no
+compression, PDFs and DOCX are already compressed) and sizes/CRCs follow each
+entry in a data descriptor, so nothing has to be rewound. Memory use stays at
+one read chunk regardless of how many or how large the files are.
+
+iter_resume_archive() feeds it with resumes read from local storage or S3,
+opening the next few S3 objects concurrently on a small thread pool so their
+request latency overlaps the transfer of the current file.
+"""
+
+import os
+import time
+import zipfile
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .utils import RESUMES_S3_PREFIX
+
+logger = logging.getLogger(__name__)
+
+ZIP_READ_CHUNK_SIZE = 64 * 1024
+ZIP_PREFETCH_WORKERS = 4
+
+
+class _ZipSink:
+    """Write-only, non-seekable target collecting what zipfile writes until drained."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def stream_zip(entries):
+    """
+    Generate a ZIP archive (stored entries) from (name, chunk iterable) pairs.
+
+    Args:
+        entries (iterable): (arcname, chunks) pairs; chunks yields bytes and is
+                            consumed lazily, one entry at a time.
+
+    Yields:
+        bytes: Consecutive pieces of the archive.
+    """
+    sink = _ZipSink()
+    date_time = time.localtime()[:6]
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        for arcname, chunks in entries:
+            info = zipfile.ZipInfo(arcname, date_time=date_time)
+            info.compress_type = zipfile.ZIP_STORED
+            info.external_attr = 0o644 << 16
+            with archive.open(info, mode='w') as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            yield sink.drain()
+    # Central directory, written when the archive is closed
+    yield sink.drain()
+
+
+def _read_chunks(stream, chunk_size=ZIP_READ_CHUNK_SIZE):
+    """Yield a file-like object's content chunk by chunk, closing it at the end."""
+    try:
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            yield chunk
+    finally:
+        stream.close()
+
+
+def _open_resume(storage_suffix, s3_client, s3_bucket_name):
+    """
+    Open a stored resume for reading: the local copy if there is one, else the S3 body.
+
+    Returns:
+        file-like: An open binary stream, or None if the resume does not exist.
+    """
+    local_path = os.path.join(settings.MEDIA_ROOT, RESUMES_S3_PREFIX, storage_suffix)
+    if os.path.exists(local_path):
+        return open(local_path, 'rb')
+    if s3_client is None:
+        return None
+
+    from botocore.exceptions import ClientError
+    try:
+        return s3_client.get_object(Bucket=s3_bucket_name, Key=f"media/{RESUMES_S3_PREFIX}{storage_suffix}")['Body']
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+            return None
+        raise
+
+
+def iter_resume_archive(resumes, max_workers=ZIP_PREFETCH_WORKERS):
+    """
+    Stream a ZIP archive of resumes.
+
+    Args:
+        resumes (list): (arcname, storage_suffix) pairs, in archive order.
+        max_workers (int): Number of resumes opened ahead of the one being written.
+
+    Yields:
+        bytes: Consecutive pieces of the archive. Resumes that cannot be read
+               are listed in a final MISSING.txt entry instead.
+    """
+    s3_client = s3_bucket_name = None
+    if getattr(settings, 'ENABLE_S3_UPLOAD', False) and getattr(settings, 'AWS_STORAGE_BUCKET_NAME', None):
+        # Import here to avoid dependency if S3 is not used; clients are thread-safe
+        import boto3
+        s3_client = boto3.client('s3')
+        s3_bucket_name = settings.AWS_STORAGE_BUCKET_NAME
+
+    def entries():
+        missing = []
+        pending = deque()
+        remaining = iter(resumes)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+                def prefetch_next():
+                    item = next(remaining, None)
+                    if item is not None:
+                        arcname, storage_suffix = item
+                        pending.append((arcname, pool.submit(_open_resume, storage_suffix, s3_client, s3_bucket_name)))
+
+                for _ in range(max_workers):
+                    prefetch_next()
+                try:
+                    while pending:
+                        arcname, future = pending.popleft()
+                        prefetch_next()
+                        try:
+                            stream = future.result()
+                        except Exception as e:
+                            logger.error(f"iter_resume_archive: Could not open '{arcname}': {str(e)}")
+                            stream = None
+                        if stream is None:
+                            missing.append(arcname)
+                            continue
+                        yield arcname, _read_chunks(stream)
+                finally:
+                    # Download abandoned midway: don't start the queued opens
+                    for _, future in pending:
+                        future.cancel()
+        finally:
+            # The pool has finished; close bodies that were opened ahead but never sent
+            for _, future in pending:
+                if not future.cancelled() and future.exception() is None and future.result() is not None:
+                    future.result().close()
+
+        if missing:
+            logger.warning(f"iter_resume_archive: {len(missing)} resume(s) missing from the archive")
+            listing = 'Resumes that could not be retrieved:\n' + ''.join(f'{name}\n' for name in missing)
+            yield 'MISSING.txt', [listing.encode('utf-8')]
+
+    yield from stream_zip(entries())